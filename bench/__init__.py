@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Benchmarks for the pcalc and spath hot paths.
+
+The cases (`bench.cases`) run on seeded synthetic workloads (`bench.workloads`) of 10^3 to 10^7
+presences or items. `bench.runner` records the wall time and peak memory of each case and size
+and compares them with a stored baseline (`bench/baseline.json`). Run `python -m bench --help`
+from the repository root.
+"""
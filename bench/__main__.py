@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+from bench.cli import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+The benchmark cases.
+
+A case has a `setup` that builds its input for a workload of size n (not timed), a `run` that
+does the work being measured on that input, and an optional `teardown`. The size n is the
+number of presences for the pcalc cases and the number of items for the spath cases.
+"""
+from __future__ import annotations
+
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from pcalc import BasisTopology, PresenceInvariantDiscrete, PresenceMatrix
+from spath.csv_loader import CSVLoader
+from spath.metrics import compute_sample_path_metrics
+from spath.point_process import to_arrival_departure_process
+
+from bench import workloads
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    description: str
+    setup: Callable[[int, int], Any]
+    run: Callable[[Any], Any]
+    teardown: Optional[Callable[[Any], None]] = None
+
+
+# ---------- pcalc ----------
+
+def _setup_presences(n: int, seed: int):
+    return workloads.presences(n, seed), workloads.time_scale(n)
+
+
+def _run_presence_matrix(state):
+    presences, ts = state
+    return PresenceMatrix(presences, time_scale=ts)
+
+
+def _setup_invariant(n: int, seed: int):
+    return PresenceInvariantDiscrete(workloads.presence_matrix(n, seed)), workloads.query_windows(n)
+
+
+def _run_invariant_queries(state):
+    invariant, windows = state
+    return [invariant.get_presence_metrics(start, end) for start, end in windows]
+
+
+def _setup_topology(n: int, seed: int):
+    return BasisTopology(workloads.presences(n, seed))
+
+
+def _run_closure(topology: BasisTopology):
+    return topology.closure()
+
+
+# ---------- spath ----------
+
+def _setup_sample_path(n: int, seed: int):
+    events = to_arrival_departure_process(workloads.items(n, seed))
+    return events, sorted({t for t, _, _ in events})
+
+
+def _run_sample_path_metrics(state):
+    events, sample_times = state
+    return compute_sample_path_metrics(events, sample_times)
+
+
+def _setup_csv(n: int, seed: int) -> Path:
+    tmp = Path(tempfile.mkdtemp(prefix="pcalc-bench-"))
+    return workloads.write_csv(n, tmp / "items.csv", seed)
+
+
+def _run_csv_loader(path: Path):
+    return CSVLoader().load(str(path))
+
+
+def _teardown_csv(path: Path) -> None:
+    shutil.rmtree(path.parent, ignore_errors=True)
+
+
+CASES: Dict[str, Case] = {case.name: case for case in [
+    Case("pcalc.presence_matrix", "PresenceMatrix construction (not materialized)",
+         _setup_presences, _run_presence_matrix),
+    Case("pcalc.invariant_queries", "PresenceInvariantDiscrete.get_presence_metrics over 32 windows",
+         _setup_invariant, _run_invariant_queries),
+    Case("pcalc.closure", "BasisTopology.closure",
+         _setup_topology, _run_closure),
+    Case("spath.sample_path_metrics", "compute_sample_path_metrics at every event time",
+         _setup_sample_path, _run_sample_path_metrics),
+    Case("spath.csv_loader", "CSVLoader.load of an item log",
+         _setup_csv, _run_csv_loader, _teardown_csv),
+]}
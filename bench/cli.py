@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Command line for the benchmarks: `python -m bench` from the repository root.
+
+    python -m bench                          # small scales, compared with bench/baseline.json
+    python -m bench --scales large           # 10^3 .. 10^6
+    python -m bench --scales 1e5,1e7 --cases pcalc.closure
+    python -m bench --save-baseline          # record (or update) the baseline on this machine
+
+The exit status is 1 if any measurement regressed against the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from bench.cases import CASES
+from bench.runner import compare, format_table, load_results, measure, save_results
+from bench.workloads import DEFAULT_SEED
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+SCALES = {
+    "small": [10 ** 3, 10 ** 4],
+    "medium": [10 ** 3, 10 ** 4, 10 ** 5],
+    "large": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+    "full": [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+}
+# Sizes at or above this are run once, however many repeats were asked for
+SINGLE_RUN_SIZE = 10 ** 6
+
+
+def parse_scales(spec: str) -> List[int]:
+    """A preset name from SCALES, or a comma separated list of sizes (e.g. '1e3,50000')."""
+    if spec in SCALES:
+        return list(SCALES[spec])
+    try:
+        sizes = [int(float(s)) for s in spec.split(",") if s.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Scales must be one of {', '.join(SCALES)} or a list of sizes (got {spec!r})")
+    if not sizes or any(n < 1 for n in sizes):
+        raise argparse.ArgumentTypeError(f"Sizes must be positive (got {spec!r})")
+    return sorted(set(sizes))
+
+
+def select_cases(patterns: Optional[List[str]]) -> List[str]:
+    if not patterns:
+        return list(CASES)
+    names = [name for name in CASES if any(fnmatch.fnmatch(name, p) or p in name for p in patterns)]
+    if not names:
+        raise SystemExit(f"No benchmark matches {', '.join(patterns)}. Cases: {', '.join(CASES)}")
+    return names
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="Benchmarks for the pcalc and spath hot paths on synthetic workloads.",
+    )
+    p.add_argument("--scales", type=parse_scales, default=SCALES["small"],
+                   help="Preset (small, medium, large, full) or comma separated sizes. Default: small.")
+    p.add_argument("--cases", nargs="+", default=None,
+                   help="Case names, substrings or glob patterns to run. Default: all.")
+    p.add_argument("--list", action="store_true", help="List the cases and exit.")
+    p.add_argument("--repeats", type=int, default=5,
+                   help=f"Timed runs per case and size (sizes >= {SINGLE_RUN_SIZE:.0e} run once). Default: 5.")
+    p.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the synthetic workloads.")
+    p.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement.")
+    p.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                   help="Baseline results JSON to compare with. Default: bench/baseline.json.")
+    p.add_argument("--save-baseline", action="store_true",
+                   help="Write the measurements into the baseline (keeping its other entries) instead of comparing.")
+    p.add_argument("--output", default=None, help="Also write the measurements to this results JSON.")
+    p.add_argument("--time-tolerance", type=float, default=1.0,
+                   help="Allowed slowdown of the best time as a fraction of the baseline. Default: 1.0 (twice as slow).")
+    p.add_argument("--memory-tolerance", type=float, default=0.2,
+                   help="Allowed growth of the peak memory as a fraction of the baseline. Default: 0.2.")
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.list:
+        for name, case in CASES.items():
+            print(f"{name:<28} {case.description}")
+        return 0
+
+    measurements = []
+    for name in select_cases(args.cases):
+        for n in args.scales:
+            repeats = 1 if n >= SINGLE_RUN_SIZE else args.repeats
+            m = measure(CASES[name], n, repeats=repeats, seed=args.seed, memory=not args.no_memory)
+            print(f"  {m.case} n={m.n}: {m.best_s * 1e3:.1f}ms", file=sys.stderr)
+            measurements.append(m)
+
+    if args.output:
+        save_results(args.output, measurements, seed=args.seed)
+    if args.save_baseline:
+        path = save_results(args.baseline, measurements, seed=args.seed, merge=True)
+        print(format_table(measurements))
+        print(f"\nBaseline written to {path}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(format_table(measurements))
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to record one.")
+        return 0
+    comparisons = compare(measurements, load_results(baseline_path),
+                          time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance)
+    print(format_table(measurements, comparisons))
+    regressed = [c.key for c in comparisons if c.regressed]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) against {baseline_path}: {', '.join(regressed)}")
+        return 1
+    print(f"\nNo regressions against {baseline_path}.")
+    return 0
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Measuring the cases and comparing the measurements with a baseline.
+
+Each case is timed over a few repeats with the garbage collector off (as `timeit` does) and
+the best and median wall times are kept. Peak memory is measured in a separate, untimed run
+under `tracemalloc`, since tracing slows allocation-heavy code down by a large factor. It is
+the peak of the memory allocated by `run` on top of its input, numpy buffers included.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bench.cases import Case
+from bench.workloads import DEFAULT_SEED
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class Measurement:
+    case: str
+    n: int
+    repeats: int
+    best_s: float
+    median_s: float
+    peak_bytes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}/{self.n}"
+
+
+@dataclass
+class Comparison:
+    key: str
+    current: Measurement
+    baseline: Optional[Measurement]
+    time_ratio: float
+    memory_ratio: float
+    regressed: bool
+
+
+def _timed(case: Case, state: Any) -> float:
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t = time.perf_counter()
+        result = case.run(state)
+        elapsed = time.perf_counter() - t
+    finally:
+        if enabled:
+            gc.enable()
+    del result
+    return elapsed
+
+
+def _peak_memory(case: Case, state: Any) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return max(0, peak - before)
+
+
+def measure(case: Case, n: int, repeats: int = 3, seed: int = DEFAULT_SEED, memory: bool = True) -> Measurement:
+    """Time `case` on a workload of size n (best and median of `repeats` runs) and measure its peak memory."""
+    if repeats < 1:
+        raise ValueError(f"repeats must be at least 1 (got {repeats})")
+    state = case.setup(n, seed)
+    try:
+        times = [_timed(case, state) for _ in range(repeats)]
+        peak = _peak_memory(case, state) if memory else 0
+    finally:
+        if case.teardown is not None:
+            case.teardown(state)
+    return Measurement(case=case.name, n=n, repeats=repeats, best_s=min(times),
+                       median_s=statistics.median(times), peak_bytes=peak)
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# ---------- persistence ----------
+
+def save_results(path: str | Path, measurements: Iterable[Measurement], seed: int,
+                 merge: bool = False) -> Path:
+    """
+    Write measurements to a results JSON. With `merge`, measurements already in the file
+    for other cases or sizes are kept, so a partial run only updates what it measured.
+    """
+    path = Path(path)
+    entries: Dict[str, Measurement] = {}
+    if merge and path.exists():
+        entries.update(load_results(path))
+    entries.update({m.key: m for m in measurements})
+    payload = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seed": seed,
+        "environment": environment(),
+        "results": [asdict(entries[k]) for k in sorted(entries, key=lambda k: (entries[k].case, entries[k].n))],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+    return path
+
+
+def load_results(path: str | Path) -> Dict[str, Measurement]:
+    """Measurements of a results JSON written by `save_results`, keyed by case/n."""
+    payload = json.loads(Path(path).read_text())
+    if payload.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version {payload.get('version')!r} in {path}")
+    measurements = [Measurement(**entry) for entry in payload["results"]]
+    return {m.key: m for m in measurements}
+
+
+# ---------- comparison ----------
+
+def compare(measurements: Iterable[Measurement],
+            baseline: Dict[str, Measurement],
+            time_tolerance: float = 1.0,
+            memory_tolerance: float = 0.2) -> List[Comparison]:
+    """
+    Compare measurements with a baseline. A measurement regressed if its best time exceeds the
+    baseline's by more than `time_tolerance` (as a fraction), or its peak memory by more than
+    `memory_tolerance`. Measurements missing from the baseline never regress.
+    """
+    comparisons = []
+    for m in measurements:
+        base = baseline.get(m.key)
+        if base is None:
+            comparisons.append(Comparison(m.key, m, None, np.nan, np.nan, False))
+            continue
+        time_ratio = m.best_s / base.best_s if base.best_s > 0 else np.nan
+        memory_ratio = m.peak_bytes / base.peak_bytes if base.peak_bytes > 0 else np.nan
+        regressed = bool(time_ratio > 1.0 + time_tolerance or memory_ratio > 1.0 + memory_tolerance)
+        comparisons.append(Comparison(m.key, m, base, time_ratio, memory_ratio, regressed))
+    return comparisons
+
+
+def _fmt_bytes(b: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if b < 1024 or unit == "GiB":
+            return f"{b:.0f} {unit}" if unit == "B" else f"{b:.1f} {unit}"
+        b /= 1024.0
+
+
+def _fmt_ratio(r: float) -> str:
+    return "-" if np.isnan(r) else f"{r:.2f}x"
+
+
+def format_table(measurements: List[Measurement], comparisons: Optional[List[Comparison]] = None) -> str:
+    by_key = {c.key: c for c in comparisons or []}
+    header = f"{'case':<28} {'n':>10} {'best':>10} {'median':>10} {'peak mem':>11}"
+    if comparisons is not None:
+        header += f" {'time':>7} {'mem':>7}"
+    lines = [header, "-" * len(header)]
+    for m in measurements:
+        line = (f"{m.case:<28} {m.n:>10} {m.best_s * 1e3:>8.1f}ms {m.median_s * 1e3:>8.1f}ms "
+                f"{_fmt_bytes(m.peak_bytes):>11}")
+        c = by_key.get(m.key)
+        if comparisons is not None:
+            line += f" {_fmt_ratio(c.time_ratio):>7} {_fmt_ratio(c.memory_ratio):>7}"
+            if c.baseline is None:
+                line += "  new"
+            elif c.regressed:
+                line += "  REGRESSED"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Synthetic workloads for the benchmarks, built with `pcalc.generator`.
+
+Every workload is generated from a seed, so a given (size, seed) always produces the same data.
+Arrivals are Poisson at a constant rate of `RATE` per unit of time and durations are
+exponential with mean `MEAN_DURATION`, so the load stays the same at every size and only the
+length of the sample path grows with n.
+
+For pcalc the unit of time is 1.0; for spath it is one hour, starting at `ORIGIN`.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pcalc import PresenceAssertion, PresenceMatrix, Timescale
+from pcalc.generator import PresenceArrays, independent_presences
+
+DEFAULT_SEED = 20250101
+RATE = 10.0
+MEAN_DURATION = 5.0
+OPEN_FRACTION = 0.1
+PRESENCES_PER_ELEMENT = 4
+BOUNDARIES = 16
+CLASSES = ("bug", "story", "task", "spike")
+ORIGIN = pd.Timestamp("2024-01-01")
+
+
+def horizon(n: int) -> float:
+    """Length of the sample path (in units of time) for a workload of size n."""
+    return max(1.0, n / RATE)
+
+
+def presence_arrays(n: int, seed: int = DEFAULT_SEED) -> PresenceArrays:
+    """n presences of n / PRESENCES_PER_ELEMENT elements across BOUNDARIES boundaries."""
+    return independent_presences(n, rate=RATE, mean_duration=MEAN_DURATION, boundaries=BOUNDARIES,
+                                 elements=max(1, n // PRESENCES_PER_ELEMENT), seed=seed)
+
+
+def presences(n: int, seed: int = DEFAULT_SEED) -> List[PresenceAssertion]:
+    return presence_arrays(n, seed).to_presences()
+
+
+def time_scale(n: int) -> Timescale:
+    return Timescale(t0=0.0, t1=horizon(n), bin_width=1.0)
+
+
+def presence_matrix(n: int, seed: int = DEFAULT_SEED) -> PresenceMatrix:
+    return PresenceMatrix(presences(n, seed), time_scale=time_scale(n))
+
+
+def query_windows(n: int, count: int = 32) -> List[Tuple[float, float]]:
+    """`count` windows, each a tenth of the time scale, spread evenly across it."""
+    ts = time_scale(n)
+    width = (ts.t1 - ts.t0) / 10.0
+    starts = np.linspace(ts.t0, ts.t1 - width, count)
+    return [(float(s), float(s + width)) for s in starts]
+
+
+def items(n: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """An item log of n items with id, start_ts, end_ts and class; OPEN_FRACTION of them are open."""
+    arrays = independent_presences(n, rate=RATE, mean_duration=MEAN_DURATION, boundaries=CLASSES, seed=seed)
+    return arrays.with_open(OPEN_FRACTION, seed=seed + 1).to_frame(origin=ORIGIN, unit="h")
+
+
+def write_csv(n: int, path: str | Path, seed: int = DEFAULT_SEED) -> Path:
+    """Write the item log of size n to `path` in the CSV layout read by `CSVLoader`."""
+    path = Path(path)
+    items(n, seed).to_csv(path, index=False, date_format="%Y-%m-%d %H:%M:%S")
+    return path
@@ -130,8 +130,9 @@ have questions or would like to collaborate with me on helping develop it furthe
 
 """
 
-from .entity import Entity, EntityProtocol
+from .entity import Entity, EntityProtocol, EntityRegistry
 from .presence import PresenceAssertion
+from .presence_mass import MassIntegrator, ConstantPresence, RampPresence, DelayedPresence, SignalPresence
 from .time_model import TimeModel
 from .basis_topology import BasisTopology
 from .presence_invariant import PresenceInvariant
@@ -139,14 +140,21 @@ from .presence_matrix import PresenceMatrix
 from .time_scale import Timescale
 from .presence_map import PresenceMap
 from .presence_invariant_discrete import PresenceInvariantDiscrete
+from .bitemporal import BitemporalIndex, PresenceSnapshot
+from .co_presence import co_presence, CoPresenceMatrix
+from .transitions import transition_graph, TransitionGraph
+from .fanout import boundary_invariant_series, BoundaryInvariantTable
+from .generator import PresenceArrays
 
 __all__ = [
     # Domain API
     "entity",
-    Entity, EntityProtocol,
+    Entity, EntityProtocol, EntityRegistry,
 
     "presence",
     PresenceAssertion,
+    "presence_mass",
+    MassIntegrator, ConstantPresence, RampPresence, DelayedPresence, SignalPresence,
 
     # Continuous Time Models
     "time_model",
@@ -165,4 +173,20 @@ __all__ = [
     PresenceMatrix,
     "presence_invariant_discrete",
     PresenceInvariantDiscrete,
+
+    # Bitemporal queries
+    "bitemporal",
+    BitemporalIndex, PresenceSnapshot,
+
+    # Co-presence
+    "co_presence",
+    CoPresenceMatrix,
+    "transitions",
+    TransitionGraph,
+    "fanout",
+    BoundaryInvariantTable,
+
+    # Synthetic workloads
+    "generator",
+    PresenceArrays,
 ]
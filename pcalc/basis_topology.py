@@ -70,8 +70,10 @@ efficiently over arbitrary collections of presences defined over the domain.
 """
 
 from collections import defaultdict
-from typing import Iterable, Tuple
+from typing import Iterable, Optional, Tuple
+import numpy as np
 from sortedcontainers import SortedSet
+from .entity import EntityRegistry
 from .presence import PresenceAssertion, EMPTY_PRESENCE
 
 
@@ -82,28 +84,50 @@ class BasisTopology:
     Presences are treated as basis elements defining basic open sets.
     Internally, presences are grouped into sorted open covers per (element, boundary)
     and exposed through join, closure, and overlap operations.
+
+    Covers are keyed on the integer codes that an `EntityRegistry` assigns to
+    the element and boundary, so building and querying the covers never hashes or
+    compares domain objects.
     """
 
-    def __init__(self, presences: Iterable[PresenceAssertion]) -> None:
+    def __init__(self, presences: Iterable[PresenceAssertion], registry: Optional[EntityRegistry] = None) -> None:
         """
         Initializes the topology from a set of presences.
 
         Internally maintains a SortedSet for each (element, boundary) pair,
         ordered by onset_time for efficient merge and overlap operations.
+
+        Args:
+            presences: The presence assertions that generate the topology.
+            registry: The registry used to encode elements and boundaries. Pass a shared registry
+                to keep codes consistent across topologies, matrices and other indexes. A new registry
+                is created if none is given.
         """
-        self.cover_index: dict[Tuple, SortedSet[PresenceAssertion]] = defaultdict(
+        self.registry: EntityRegistry = registry if registry is not None else EntityRegistry()
+        """The registry that encodes the elements and boundaries of the presences."""
+
+        self.cover_index: dict[Tuple[int, int], SortedSet[PresenceAssertion]] = defaultdict(
             lambda: SortedSet(key=presence_sort_key)
         )
+        """Open covers keyed by (element code, boundary code)."""
 
+        code = self.registry.code
         for p in presences:
-            key = (p.element, p.boundary)
+            key = (code(p.element), code(p.boundary))
             self.cover_index[key].add(p)
 
+    def _key(self, element, boundary) -> Optional[Tuple[int, int]]:
+        # The cover key for an (element, boundary) pair, or None if either was never registered.
+        element_code, boundary_code = self.registry.lookup(element), self.registry.lookup(boundary)
+        if element_code is None or boundary_code is None:
+            return None
+        return element_code, boundary_code
+
     def get_cover(self, element, boundary) -> SortedSet[PresenceAssertion]:
         """
         Returns the open cover for a given (element, boundary) pair.
         """
-        return self.cover_index.get((element, boundary), SortedSet(key=presence_sort_key))
+        return self.cover_index.get(self._key(element, boundary), SortedSet(key=presence_sort_key))
 
     @staticmethod
     def join(p1: PresenceAssertion, p2: PresenceAssertion) -> PresenceAssertion:
@@ -114,18 +138,7 @@ class BasisTopology:
         if (p1.element, p1.boundary) != (p2.element, p2.boundary):
             return EMPTY_PRESENCE
 
-        if p1.reset_time < p2.onset_time != float("-inf") and p1.reset_time != float("inf"):
-            return EMPTY_PRESENCE
-        if p2.reset_time < p1.onset_time != float("-inf") and p2.reset_time != float("inf"):
-            return EMPTY_PRESENCE
-
-        return PresenceAssertion(
-            element=p1.element,
-            boundary=p1.boundary,
-            onset_time=min(p1.onset_time, p2.onset_time),
-            reset_time=max(p1.reset_time, p2.reset_time),
-            observer="join",
-        )
+        return _join_intervals(p1, p2)
 
     def closure(self) -> set[PresenceAssertion]:
         """
@@ -143,8 +156,10 @@ class BasisTopology:
                     merged_cover.append(p)
                     continue
 
+                # Every presence in a cover has the same element and boundary, so
+                # there is no need to compare them again.
                 last = merged_cover[-1]
-                j = self.join(last, p)
+                j = _join_intervals(last, p)
 
                 if j is not EMPTY_PRESENCE:
                     merged_cover[-1] = j
@@ -155,6 +170,45 @@ class BasisTopology:
 
         return closed
 
+    def closure_intervals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The closure of the topology in columnar form.
+
+        Computes the same merged intervals as `closure`, without constructing presence assertions,
+        and returns them as four parallel arrays, ordered by cover and then by onset time:
+
+        - element codes (int32), in the topology's `registry`
+        - boundary codes (int32), in the topology's `registry`
+        - onset times (float64)
+        - reset times (float64)
+
+        This is the input format for the array based analyses over a topology, such as co-presence.
+        """
+        element_codes, boundary_codes, onsets, resets = [], [], [], []
+        for (element_code, boundary_code), cover in self.cover_index.items():
+            current_onset = current_reset = None
+            for p in cover:
+                if current_onset is not None and p.onset_time <= current_reset:
+                    current_reset = max(current_reset, p.reset_time)
+                    continue
+                if current_onset is not None:
+                    onsets.append(current_onset)
+                    resets.append(current_reset)
+                current_onset, current_reset = p.onset_time, p.reset_time
+            if current_onset is not None:
+                onsets.append(current_onset)
+                resets.append(current_reset)
+                count = len(onsets) - len(element_codes)
+                element_codes.extend([element_code] * count)
+                boundary_codes.extend([boundary_code] * count)
+
+        return (
+            np.asarray(element_codes, dtype=np.int32),
+            np.asarray(boundary_codes, dtype=np.int32),
+            np.asarray(onsets, dtype=float),
+            np.asarray(resets, dtype=float),
+        )
+
     def find_overlapping(self, presence: PresenceAssertion) -> list[PresenceAssertion]:
         """
         Finds all presences in the same cover that overlap with the given presence.
@@ -162,8 +216,7 @@ class BasisTopology:
         This is a linear scan from the first potentially overlapping point onward,
         relying on the sorted order of onset_time.
         """
-        key = (presence.element, presence.boundary)
-        cover = self.cover_index.get(key, SortedSet(key=presence_sort_key))
+        cover = self.cover_index.get(self._key(presence.element, presence.boundary), SortedSet(key=presence_sort_key))
         overlapping = []
 
         for p in cover.irange(minimum=None, maximum=None):
@@ -179,6 +232,22 @@ class BasisTopology:
             yield from cover
 
 
+def _join_intervals(p1: PresenceAssertion, p2: PresenceAssertion) -> PresenceAssertion:
+    # The join of two presences known to share an element and boundary.
+    if p1.reset_time < p2.onset_time != float("-inf") and p1.reset_time != float("inf"):
+        return EMPTY_PRESENCE
+    if p2.reset_time < p1.onset_time != float("-inf") and p2.reset_time != float("inf"):
+        return EMPTY_PRESENCE
+
+    return PresenceAssertion(
+        element=p1.element,
+        boundary=p1.boundary,
+        onset_time=min(p1.onset_time, p2.onset_time),
+        reset_time=max(p1.reset_time, p2.reset_time),
+        observer="join",
+    )
+
+
 def presence_sort_key(p: PresenceAssertion) -> float:
     """The default sort key for presences in an open cover is onset_time"""
     return p.onset_time
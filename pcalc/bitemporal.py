@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+## Introduction
+
+Every presence assertion carries two kinds of time:
+
+- *valid time*: the interval $[t_0, t_1)$ over which the element is asserted to be present, and
+- *assertion time*: the time $t_2$ at which the observer made the assertion.
+
+A presence set is therefore *bitemporal*. The question "what did we know at time $t_2$?" asks
+for the assertions made at or before $t_2$ that had not yet been revised by $t_2$. This module
+provides a `BitemporalIndex` that answers such questions, per observer if needed, in
+$O(\\log n + k)$ time for a snapshot of $k$ assertions.
+
+### Revisions
+
+Observers revise assertions as they learn more: a presence that was open ended gets a reset time,
+an onset time gets corrected, etc. The index models a revision as a *new* assertion with a later
+`assert_time` and the same *version key* as the assertion it revises. The earlier assertion is
+then considered superseded from the assert time of the revision onwards.
+
+The version key is supplied by the caller, since only the domain knows which assertions are
+versions of one another. A common choice is `(element, boundary, observer)`; for domains where an
+element can be present in a boundary many times, an explicit identifier in the element or the
+observer is needed. Without a version key, assertions never supersede each other.
+
+### Snapshots
+
+Queries return a `PresenceSnapshot`: a read-only sequence view over the indexed assertions. Snapshots
+do not copy assertions, and can be passed directly to `BasisTopology` and `PresenceMatrix`.
+
+```python
+from pcalc.bitemporal import BitemporalIndex
+
+index = BitemporalIndex(presences, version_key=lambda p: (p.element, p.boundary, p.observer))
+
+known_then = index.as_of(10.0)
+topology = BasisTopology(known_then)
+matrix = PresenceMatrix(known_then, time_scale=ts)
+
+from_sensor = index.by_observer(sensor, as_of=10.0)
+```
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, overload
+
+import numpy as np
+
+from .presence import PresenceAssertion
+
+VersionKey = Callable[[PresenceAssertion], Hashable]
+
+# Interval tree nodes with at most this many intervals are not split further.
+_LEAF_SIZE = 64
+
+
+class PresenceSnapshot(Sequence[PresenceAssertion]):
+    """
+    A read-only view of a subset of the assertions in a `BitemporalIndex`.
+
+    The snapshot holds a reference to the indexed assertions and an array of positions,
+    in the order the assertions were given to the index.
+    """
+
+    def __init__(self, presences: Sequence[PresenceAssertion], positions: np.ndarray):
+        self._presences = presences
+        self.positions: np.ndarray = positions
+        """Positions of the assertions in the snapshot, within the indexed assertions."""
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @overload
+    def __getitem__(self, index: int) -> PresenceAssertion: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PresenceSnapshot: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PresenceSnapshot(self._presences, self.positions[index])
+        return self._presences[int(self.positions[index])]
+
+    def __iter__(self) -> Iterator[PresenceAssertion]:
+        presences = self._presences
+        for i in self.positions.tolist():
+            yield presences[i]
+
+    def __repr__(self) -> str:
+        return f"PresenceSnapshot(size={len(self)})"
+
+
+class _IntervalTree:
+    """
+    A static centered interval tree over half-open intervals [start, end).
+
+    Supports stabbing queries: the positions of all intervals that contain a point,
+    in O(log n + k) time.
+    """
+
+    __slots__ = ("nodes", "root")
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, positions: np.ndarray):
+        # Each node is (center, left, right, by_start, starts_ascending, by_end, ends_descending)
+        self.nodes: List[Tuple] = []
+        non_empty = starts < ends
+        self.root = self._build(starts[non_empty], ends[non_empty], positions[non_empty])
+
+    def _build(self, starts: np.ndarray, ends: np.ndarray, positions: np.ndarray) -> int:
+        if len(positions) == 0:
+            return -1
+        if len(positions) <= _LEAF_SIZE:
+            # Small sets are scanned directly, which is cheaper than splitting them further.
+            self.nodes.append((None, -1, -1, positions, starts, None, ends))
+            return len(self.nodes) - 1
+        # Centering on the (lower) median start guarantees that at least the interval
+        # with that start is stored at this node, so the recursion always makes progress.
+        finite_starts = starts[np.isfinite(starts)]
+        if len(finite_starts) > 0:
+            center = float(np.partition(finite_starts, len(finite_starts) // 2)[len(finite_starts) // 2])
+        else:
+            center = -np.inf
+
+        left = ends <= center
+        right = starts > center
+        here = ~(left | right)
+
+        here_positions, here_starts, here_ends = positions[here], starts[here], ends[here]
+        by_start = np.argsort(here_starts, kind="stable")
+        by_end = np.argsort(-here_ends, kind="stable")
+
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left_node = self._build(starts[left], ends[left], positions[left])
+        right_node = self._build(starts[right], ends[right], positions[right])
+        self.nodes[node] = (
+            center,
+            left_node,
+            right_node,
+            here_positions[by_start],
+            here_starts[by_start],
+            here_positions[by_end],
+            here_ends[by_end],
+        )
+        return node
+
+    def stab(self, t: float) -> np.ndarray:
+        found: List[np.ndarray] = []
+        node = self.root
+        while node != -1:
+            center, left, right, by_start, starts, by_end, ends = self.nodes[node]
+            if center is None:
+                found.append(by_start[(starts <= t) & (ends > t)])
+                break
+            if t < center:
+                # Every interval here ends after center > t, so they contain t iff they start at or before t.
+                found.append(by_start[: np.searchsorted(starts, t, side="right")])
+                node = left
+            else:
+                # Every interval here starts at or before center <= t, so they contain t iff they end after t.
+                found.append(by_end[: np.searchsorted(-ends, -t, side="left")])
+                node = right
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(found)
+
+
+class BitemporalIndex:
+    """
+    An index over the assertion time and observer of a set of presence assertions.
+
+    Each assertion is known from its `assert_time` (or forever, if its assert time is None)
+    until it is superseded by a revision with the same version key and a later assert time.
+    When several assertions share a version key and an assert time, the one given last wins.
+    """
+
+    def __init__(self, presences: Sequence[PresenceAssertion], version_key: Optional[VersionKey] = None):
+        """
+        Builds the index.
+
+        Args:
+            presences: The assertions to index. The index keeps a reference to this sequence
+                and does not copy it, so it should not be modified after the index is built.
+            version_key: A function that maps an assertion to the identity of the fact it asserts.
+                Assertions with equal keys are versions of each other.
+        """
+        self.presences: Sequence[PresenceAssertion] = presences
+        """The indexed assertions."""
+
+        n = len(presences)
+        self.known_from: np.ndarray = np.fromiter(
+            (-np.inf if p.assert_time is None else p.assert_time for p in presences), dtype=float, count=n
+        )
+        """The time from which each assertion is known: its assert time."""
+
+        self.known_until: np.ndarray = np.full(n, np.inf)
+        """The time at which each assertion is superseded, or inf if it never is."""
+
+        if version_key is not None:
+            self._supersede(version_key)
+
+        self._observer_positions: Dict[Any, np.ndarray] = {}
+        observer_positions: Dict[Any, List[int]] = defaultdict(list)
+        for i, p in enumerate(presences):
+            observer_positions[p.observer].append(i)
+        for observer, positions in observer_positions.items():
+            self._observer_positions[observer] = np.asarray(positions, dtype=np.int64)
+
+        self._tree = _IntervalTree(self.known_from, self.known_until, np.arange(n, dtype=np.int64))
+        self._observer_trees: Dict[Any, _IntervalTree] = {}
+
+    def _supersede(self, version_key: VersionKey) -> None:
+        versions: Dict[Hashable, List[int]] = defaultdict(list)
+        for i, p in enumerate(self.presences):
+            versions[version_key(p)].append(i)
+
+        for positions in versions.values():
+            if len(positions) < 2:
+                continue
+            positions = np.asarray(positions, dtype=np.int64)
+            # Stable sort keeps input order among versions asserted at the same time.
+            ordered = positions[np.argsort(self.known_from[positions], kind="stable")]
+            self.known_until[ordered[:-1]] = self.known_from[ordered[1:]]
+
+    def _observer_tree(self, observer: Any) -> Optional[_IntervalTree]:
+        tree = self._observer_trees.get(observer)
+        if tree is None:
+            positions = self._observer_positions.get(observer)
+            if positions is None:
+                return None
+            tree = _IntervalTree(self.known_from[positions], self.known_until[positions], positions)
+            self._observer_trees[observer] = tree
+        return tree
+
+    def _snapshot(self, positions: np.ndarray) -> PresenceSnapshot:
+        return PresenceSnapshot(self.presences, np.sort(positions))
+
+    def as_of(self, t: float, observer: Any = None) -> PresenceSnapshot:
+        """
+        The assertions known at time `t`: asserted at or before `t` and not superseded by `t`.
+
+        Args:
+            t: The assertion time of the snapshot.
+            observer: If given, only the assertions made by this observer.
+        """
+        if observer is None:
+            return self._snapshot(self._tree.stab(t))
+        tree = self._observer_tree(observer)
+        if tree is None:
+            return self._snapshot(np.zeros(0, dtype=np.int64))
+        return self._snapshot(tree.stab(t))
+
+    def by_observer(self, observer: Any, as_of: Optional[float] = None) -> PresenceSnapshot:
+        """
+        The assertions made by an observer.
+
+        Args:
+            observer: The observer.
+            as_of: If given, only the assertions by this observer known at this time. Otherwise
+                every assertion by the observer, including superseded ones.
+        """
+        if as_of is not None:
+            return self.as_of(as_of, observer=observer)
+        positions = self._observer_positions.get(observer)
+        if positions is None:
+            positions = np.zeros(0, dtype=np.int64)
+        return PresenceSnapshot(self.presences, positions)
+
+    def current(self) -> PresenceSnapshot:
+        """The assertions that have not been superseded."""
+        return PresenceSnapshot(self.presences, np.flatnonzero(self.known_until == np.inf))
+
+    @property
+    def observers(self) -> List[Any]:
+        """The distinct observers of the indexed assertions."""
+        return list(self._observer_positions.keys())
+
+    def __len__(self) -> int:
+        return len(self.presences)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+## Introduction
+
+Two elements are *co-present* when they are present at the same time. Co-presence is
+the basis for reasoning about how elements interact within a boundary, and how boundaries
+are related through the elements they share.
+
+Given a `BasisTopology`, this module computes the total co-presence *duration* over the
+closure of the topology in one of three modes:
+
+- `"element"`: for each pair of elements $(e_i, e_j)$, the total time they were simultaneously
+  present in the same boundary, summed over boundaries.
+- `"boundary"`: for each pair of boundaries $(b_i, b_j)$, the total time the same element was
+  simultaneously present in both, summed over elements.
+- `"element_boundary"`: for each element $e$ and boundary $b$, the total time $e$ was present in $b$.
+  This is the incidence matrix from which the pairwise modes can be seen as projections.
+
+Durations are measured over the closure of the topology, so overlapping or touching assertions
+for the same element and boundary are counted once.
+
+### Algorithm
+
+The closure intervals are sorted by group (boundary, for element pairs; element, for boundary pairs)
+and onset time. Within a group, the intervals that start during interval $i$ form a contiguous run
+in this order, which a binary search finds directly. So the pairs are enumerated with a single sweep
+and no per-pair comparisons, in $O(n \\log n + k)$ time for $k$ overlapping pairs. Pairs are
+generated and reduced a chunk of intervals at a time, so peak memory is proportional to the
+overlapping pairs of one chunk plus the number of distinct entity pairs, rather than to $k$.
+
+### Results
+
+The result is a `CoPresenceMatrix`: a sparse matrix in coordinate form whose rows and columns are
+the entity codes of the topology's `EntityRegistry`. Pairwise results are symmetric and only the
+upper triangle (row < column) is stored.
+
+```python
+from pcalc.co_presence import co_presence
+
+m = co_presence(topology, by="element")
+m.top_k(10)                 # [(e1, e2, duration), ...] the ten most co-present element pairs
+m.threshold(5.0).to_dense() # dense matrix of pairs co-present for at least 5 time units
+m.to_scipy()                # scipy.sparse matrix, if scipy is installed
+```
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from .basis_topology import BasisTopology
+from .entity import EntityProtocol, EntityRegistry
+
+CoPresenceMode = Literal["element", "boundary", "element_boundary"]
+
+# Number of intervals whose overlapping pairs are generated and reduced at a time.
+_DEFAULT_CHUNK_SIZE = 65536
+
+
+@dataclass
+class CoPresenceMatrix:
+    """
+    A sparse co-presence matrix in coordinate (COO) form over the codes of an `EntityRegistry`.
+
+    Entries are unique (row, column) pairs sorted by row and then column. If the matrix is `symmetric`,
+    only entries with row < column are stored, and the value of (column, row) is the same.
+    """
+
+    rows: np.ndarray
+    """Row codes (int32)."""
+    cols: np.ndarray
+    """Column codes (int32)."""
+    values: np.ndarray
+    """Co-presence durations (float64)."""
+    registry: EntityRegistry
+    """The registry that decodes row and column codes into entities."""
+    symmetric: bool
+    """True if the matrix represents a symmetric relation and stores only its upper triangle."""
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        n = len(self.registry)
+        return n, n
+
+    @property
+    def nnz(self) -> int:
+        """The number of stored entries."""
+        return len(self.values)
+
+    def __len__(self) -> int:
+        return self.nnz
+
+    def __iter__(self) -> Iterator[Tuple[Optional[EntityProtocol], Optional[EntityProtocol], float]]:
+        entity = self.registry.entity
+        for r, c, v in zip(self.rows.tolist(), self.cols.tolist(), self.values.tolist()):
+            yield entity(r), entity(c), v
+
+    def _select(self, mask_or_index: np.ndarray) -> CoPresenceMatrix:
+        return CoPresenceMatrix(
+            rows=self.rows[mask_or_index],
+            cols=self.cols[mask_or_index],
+            values=self.values[mask_or_index],
+            registry=self.registry,
+            symmetric=self.symmetric,
+        )
+
+    def threshold(self, min_value: float) -> CoPresenceMatrix:
+        """The matrix with only the entries whose value is at least `min_value`."""
+        return self._select(self.values >= min_value)
+
+    def top_k(self, k: int) -> List[Tuple[Optional[EntityProtocol], Optional[EntityProtocol], float]]:
+        """
+        The `k` largest entries as (row entity, column entity, value), in descending order of value.
+        Ties are broken by row and then column code.
+        """
+        if k <= 0 or self.nnz == 0:
+            return []
+        k = min(k, self.nnz)
+        candidates = np.argpartition(-self.values, k - 1)[:k]
+        order = np.lexsort((self.cols[candidates], self.rows[candidates], -self.values[candidates]))
+        return list(self._select(candidates[order]))
+
+    def to_dense(self) -> np.ndarray:
+        """The full matrix as a dense array of shape `shape`. Symmetric matrices are filled in on both sides."""
+        dense = np.zeros(self.shape, dtype=float)
+        dense[self.rows, self.cols] = self.values
+        if self.symmetric:
+            dense[self.cols, self.rows] = self.values
+        return dense
+
+    def to_scipy(self):
+        """
+        The matrix as a `scipy.sparse.coo_matrix`. Symmetric matrices are filled in on both sides.
+
+        Requires scipy, which is not a dependency of this package.
+        """
+        try:
+            from scipy.sparse import coo_matrix
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise ImportError("CoPresenceMatrix.to_scipy requires scipy to be installed.") from e
+
+        rows, cols, values = self.rows, self.cols, self.values
+        if self.symmetric:
+            rows, cols, values = np.concatenate([rows, cols]), np.concatenate([cols, rows]), np.concatenate([values, values])
+        return coo_matrix((values, (rows, cols)), shape=self.shape)
+
+
+def co_presence(
+    topology: BasisTopology,
+    by: CoPresenceMode = "element",
+    window: Optional[Tuple[float, float]] = None,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> CoPresenceMatrix:
+    """
+    Compute co-presence durations over the closure of a topology.
+
+    Args:
+        topology: The topology whose closure is analysed.
+        by: `"element"` for element pairs co-present in a boundary, `"boundary"` for boundary pairs
+            sharing a co-present element, `"element_boundary"` for the element × boundary incidence matrix.
+        window: If given, an interval (t0, t1); only co-presence within [t0, t1) is counted.
+        chunk_size: Number of intervals whose overlapping pairs are generated at a time. Lower it to
+            bound memory use on dense data.
+
+    Returns:
+        A `CoPresenceMatrix` whose codes are those of `topology.registry`.
+    """
+    element_codes, boundary_codes, onsets, resets = topology.closure_intervals()
+
+    if window is not None:
+        t0, t1 = window
+        onsets, resets = np.maximum(onsets, t0), np.minimum(resets, t1)
+        keep = onsets < resets
+        element_codes, boundary_codes = element_codes[keep], boundary_codes[keep]
+        onsets, resets = onsets[keep], resets[keep]
+
+    if by == "element_boundary":
+        rows, cols, values = _reduce(element_codes, boundary_codes, resets - onsets)
+        return CoPresenceMatrix(rows, cols, values, topology.registry, symmetric=False)
+    if by == "element":
+        groups, members = boundary_codes, element_codes
+    elif by == "boundary":
+        groups, members = element_codes, boundary_codes
+    else:
+        raise ValueError(f"Unknown co-presence mode {by!r}. Expected 'element', 'boundary' or 'element_boundary'.")
+
+    rows, cols, values = _sweep(groups, members, onsets, resets, chunk_size)
+    return CoPresenceMatrix(rows, cols, values, topology.registry, symmetric=True)
+
+
+def _sweep(
+    groups: np.ndarray,
+    members: np.ndarray,
+    onsets: np.ndarray,
+    resets: np.ndarray,
+    chunk_size: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Co-presence durations between distinct members that overlap in time within the same group.
+    n = len(onsets)
+    empty = np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=float)
+    if n < 2:
+        return empty
+
+    order = np.lexsort((onsets, groups))
+    groups, members, onsets, resets = groups[order], members[order], onsets[order], resets[order]
+
+    # Replace times by their ranks among all onsets and resets, so that (group, time) packs into one
+    # sortable int64 key. Ranks are exact, and work for infinite times too.
+    times, ranks = np.unique(np.concatenate([onsets, resets]), return_inverse=True)
+    onset_ranks, reset_ranks = ranks[:n].astype(np.int64), ranks[n:].astype(np.int64)
+    stride = np.int64(len(times) + 1)
+    group_base = groups.astype(np.int64) * stride
+    onset_keys = group_base + onset_ranks
+
+    # Intervals i+1 .. end[i]-1 start in the same group before interval i resets, so they overlap it.
+    end = np.searchsorted(onset_keys, group_base + reset_ranks, side="left")
+    counts = end - np.arange(1, n + 1)
+
+    partial: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    for lo in range(0, n, chunk_size):
+        hi = min(lo + chunk_size, n)
+        chunk_counts = counts[lo:hi]
+        total = int(chunk_counts.sum())
+        if total == 0:
+            continue
+        i = np.repeat(np.arange(lo, hi), chunk_counts)
+        # j runs over i+1 .. end[i]-1 for each i
+        run_starts = np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        j = i + 1 + (np.arange(total) - run_starts)
+
+        distinct = members[i] != members[j]
+        i, j = i[distinct], j[distinct]
+        durations = np.minimum(resets[i], resets[j]) - onsets[j]
+        a, b = members[i], members[j]
+        partial.append(_reduce(np.minimum(a, b), np.maximum(a, b), durations))
+
+    if not partial:
+        return empty
+    rows, cols, values = (np.concatenate(parts) for parts in zip(*partial))
+    return _reduce(rows, cols, values)
+
+
+def _reduce(rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Sum values over duplicate (row, col) pairs using a packed int64 key.
+    if len(values) == 0:
+        return rows.astype(np.int32), cols.astype(np.int32), values.astype(float)
+    # Codes are int32 and may include -1 (a missing entity), so offset them to be non-negative.
+    keys = (rows.astype(np.int64) + 1) << 32 | (cols.astype(np.int64) + 1)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=values, minlength=len(unique_keys))
+    return (
+        ((unique_keys >> 32) - 1).astype(np.int32),
+        ((unique_keys & 0xFFFFFFFF) - 1).astype(np.int32),
+        sums,
+    )
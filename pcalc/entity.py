@@ -94,11 +94,20 @@ element or a boundary.
 The remaining classes in the module are various utility classes that are provided
 to simplify integrating a domain model to the presence calculus.
 
+### Entity codes
+
+Analyses over large sets of presence assertions key and group by element and boundary
+constantly. The `EntityRegistry` interns entities by id to dense integer codes, so that
+the topology and matrix code can key on small integers, and group-bys can be done with
+array operations rather than dictionaries of domain objects.
+
 """
 from __future__ import annotations
 
 import uuid
-from typing import Protocol, runtime_checkable, Dict, Any, Optional
+from typing import Protocol, runtime_checkable, Dict, Any, Optional, Iterable, List
+
+import numpy as np
 
 
 @runtime_checkable
@@ -160,6 +169,21 @@ class EntityMixin:
         formatted = ", ".join(f"{k}={v!r}" for k, v in meta.items())
         return f"Element[{self.id}] name = {self.name} {{{formatted}}}"
 
+    def __eq__(self, other: object) -> bool:
+        """
+        Entities are identified by their id. An `EntityView` is equal to the entity it wraps,
+        and an entity is equal to its id string, which can stand in for it (see `EntityRegistry`).
+        """
+        if self is other:
+            return True
+        other_id = other if isinstance(other, str) else getattr(other, "id", None)
+        if other_id is None:
+            return NotImplemented
+        return self.id == other_id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
 
 class EntityView(EntityMixin):
     """
@@ -266,3 +290,102 @@ class Entity(EntityMixin, EntityProtocol):
 
     def __str__(self) -> str:
         return self.summary()
+
+
+class EntityRegistry:
+    """
+    Interns entities by id to dense `int32` codes.
+
+    Codes are assigned in order of first registration starting from 0, so a registry that
+    sees the same entities in the same order always assigns the same codes. The list of
+    registered ids (`ids`) is enough to rebuild an equivalent registry, which keeps codes
+    stable across loads of the same data.
+
+    The code `NONE_CODE` (-1) is reserved for a missing (`None`) entity. An id string is
+    accepted in place of an entity (e.g. plain string elements in a `PresenceAssertion`) and
+    gets the code of the entities with that id, consistent with entity equality:
+    `Entity("cust-001") == "cust-001"`. Other objects without an `id` are rejected.
+
+    ```python
+    registry = EntityRegistry()
+    registry.code(Entity("cust-001"))        # 0
+    registry.code(Entity("cust-002"))        # 1
+    registry.code(Entity("cust-001"))        # 0 - interned by id
+    registry.code("cust-002")                # 1 - an id stands for its entity
+    registry.encode([e1, e2, None])          # array([0, 1, -1], dtype=int32)
+    ```
+    """
+
+    NONE_CODE = -1
+
+    def __init__(self, ids: Optional[Iterable[str]] = None):
+        self._codes: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._entities: List[Optional[EntityProtocol]] = []
+        for entity_id in ids or []:
+            self._intern(entity_id, None)
+
+    def _intern(self, entity_id: str, entity: Optional[EntityProtocol]) -> int:
+        code = self._codes.get(entity_id)
+        if code is None:
+            code = len(self._ids)
+            if code > np.iinfo(np.int32).max:
+                raise OverflowError("EntityRegistry can hold at most 2**31 - 1 entities.")
+            self._codes[entity_id] = code
+            self._ids.append(entity_id)
+            self._entities.append(entity)
+        elif self._entities[code] is None:
+            self._entities[code] = entity
+        return code
+
+    @staticmethod
+    def _id(entity: EntityProtocol | str) -> str:
+        if isinstance(entity, str):
+            return entity
+        entity_id = getattr(entity, "id", None)
+        if entity_id is None:
+            raise TypeError(f"Expected an entity or an entity id, got {type(entity).__name__}")
+        return entity_id
+
+    def code(self, entity: Optional[EntityProtocol | str]) -> int:
+        """Return the code for an entity (or id), registering it if it has not been seen before."""
+        if entity is None:
+            return self.NONE_CODE
+        return self._intern(self._id(entity), entity)
+
+    def lookup(self, entity: Optional[EntityProtocol | str]) -> Optional[int]:
+        """Return the code for an entity (or id) without registering it. Returns None for unknown entities."""
+        if entity is None:
+            return self.NONE_CODE
+        return self._codes.get(self._id(entity))
+
+    def encode(self, entities: Iterable[Optional[EntityProtocol]]) -> np.ndarray:
+        """Return the codes of a sequence of entities as an `int32` array, registering new entities."""
+        return np.fromiter((self.code(e) for e in entities), dtype=np.int32)
+
+    def entity(self, code: int) -> Optional[EntityProtocol]:
+        """
+        Return the entity registered under a code, or None for `NONE_CODE`.
+
+        Registries rebuilt from `ids` only know the ids until an entity is registered again,
+        so this returns None for such codes.
+        """
+        if code == self.NONE_CODE:
+            return None
+        return self._entities[code]
+
+    def decode(self, codes: Iterable[int]) -> List[Optional[EntityProtocol]]:
+        """Return the entities for a sequence of codes."""
+        return [self.entity(int(c)) for c in codes]
+
+    @property
+    def ids(self) -> List[str]:
+        """The registered ids, in code order."""
+        return list(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entity: object) -> bool:
+        entity_id = entity if isinstance(entity, str) else getattr(entity, "id", None)
+        return entity_id in self._codes
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+## Introduction
+
+Flow analyses are usually run one boundary at a time: the invariant of a single queue, team,
+or service. When there are thousands of boundaries, this module runs them all at once.
+
+`boundary_invariant_series` partitions the closure of a presence set by boundary and computes, for
+every boundary, the presence invariant $L = \\Lambda \\cdot w$ over the windows $[t_0, t)$ for
+a common sequence of times $t$ (see `pcalc.presence_invariant.PresenceInvariant.invariant_series`).
+
+The boundaries are processed in a process pool. The partitioned intervals are placed in
+shared memory once, and each worker reads its boundaries from, and writes its results to, shared
+memory directly, so no interval or result arrays are pickled between processes.
+
+The result is a single tidy table with one row per (boundary, time).
+
+```python
+from pcalc.fanout import boundary_invariant_series
+
+table = boundary_invariant_series(presences, t0=0.0, times=np.arange(1.0, 366.0), processes=8)
+df = table.to_dataframe()   # columns: boundary, time, A, N, L, Lambda, w
+```
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from .basis_topology import BasisTopology
+from .entity import EntityRegistry
+from .presence import PresenceAssertion
+from .presence_invariant import presence_summary_series
+
+# Below this many intervals the pool costs more than it saves.
+_MIN_INTERVALS_FOR_POOL = 100_000
+
+
+@dataclass
+class BoundaryInvariantTable:
+    """
+    The presence invariant per boundary and time, as parallel columns.
+
+    Rows are ordered by boundary code and then by time.
+    """
+
+    registry: EntityRegistry
+    """The registry that decodes the boundary codes."""
+    boundary: np.ndarray
+    """Boundary code (int32)."""
+    time: np.ndarray
+    """End of the window [t0, time)."""
+    A: np.ndarray
+    """Total presence mass in the window."""
+    N: np.ndarray
+    """Number of presences overlapping the window (int64)."""
+    L: np.ndarray
+    """Average presence per unit time, A / T."""
+    Lambda: np.ndarray
+    """Incidence rate, N / T."""
+    w: np.ndarray
+    """Average presence mass per presence, A / N."""
+
+    def __len__(self) -> int:
+        return len(self.boundary)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The table as a dictionary of columns."""
+        return dict(boundary=self.boundary, time=self.time, A=self.A, N=self.N, L=self.L, Lambda=self.Lambda, w=self.w)
+
+    def for_boundary(self, boundary) -> Dict[str, np.ndarray]:
+        """The rows of a single boundary, as a dictionary of columns."""
+        code = self.registry.lookup(boundary)
+        if code is None:
+            lo = hi = 0
+        else:
+            lo = np.searchsorted(self.boundary, code, side="left")
+            hi = np.searchsorted(self.boundary, code, side="right")
+        return {name: column[lo:hi] for name, column in self.columns().items()}
+
+    def to_dataframe(self):
+        """
+        The table as a pandas DataFrame, with boundary codes replaced by boundary ids.
+
+        Requires pandas.
+        """
+        import pandas as pd
+
+        ids = np.asarray(self.registry.ids + [None], dtype=object)
+        columns = self.columns()
+        columns["boundary"] = ids[self.boundary]  # NONE_CODE (-1) picks the trailing None
+        return pd.DataFrame(columns)
+
+
+def boundary_invariant_series(
+    presences: Union[BasisTopology, Iterable[PresenceAssertion]],
+    t0: float,
+    times: npt.ArrayLike,
+    processes: Optional[int] = None,
+    registry: Optional[EntityRegistry] = None,
+) -> BoundaryInvariantTable:
+    """
+    Compute the presence invariant series for every boundary of a presence set.
+
+    Args:
+        presences: A topology, or the presence assertions to build one from.
+        t0: The common start of all windows.
+        times: The ends of the windows, one row of the result per boundary and time.
+        processes: Number of worker processes. Defaults to the number of CPUs. With 1, or for small
+            inputs, the computation runs in the calling process.
+        registry: Registry for a topology built from assertions. Ignored if a topology is passed.
+
+    Returns:
+        A `BoundaryInvariantTable`.
+    """
+    topology = presences if isinstance(presences, BasisTopology) else BasisTopology(presences, registry=registry)
+    _, boundary_codes, onsets, resets = topology.closure_intervals()
+    times = np.asarray(times, dtype=float)
+
+    # Partition by boundary: one sort, then each boundary is a contiguous slice.
+    order = np.argsort(boundary_codes, kind="stable")
+    boundary_codes, onsets, resets = boundary_codes[order], onsets[order], resets[order]
+    starts = np.flatnonzero(np.concatenate([[True], boundary_codes[1:] != boundary_codes[:-1]])) if len(order) else \
+        np.zeros(0, dtype=np.int64)
+    offsets = np.append(starts, len(order)).astype(np.int64)
+    boundaries = boundary_codes[starts].astype(np.int32)
+
+    num_boundaries, num_times = len(boundaries), len(times)
+    A = np.zeros((num_boundaries, num_times), dtype=float)
+    N = np.zeros((num_boundaries, num_times), dtype=np.int64)
+
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or num_boundaries <= 1 or len(onsets) < _MIN_INTERVALS_FOR_POOL:
+        _summarize(onsets, resets, offsets, t0, times, A, N, 0, num_boundaries)
+    else:
+        _summarize_in_pool(onsets, resets, offsets, t0, times, A, N, processes)
+
+    T = times - t0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        L = np.where(T > 0, A / T, 0.0)
+        Lambda = np.where(T > 0, N / T, 0.0)
+        w = np.where(N > 0, A / N, 0.0)
+
+    return BoundaryInvariantTable(
+        registry=topology.registry,
+        boundary=np.repeat(boundaries, num_times),
+        time=np.tile(times, num_boundaries),
+        A=A.ravel(),
+        N=N.ravel(),
+        L=L.ravel(),
+        Lambda=Lambda.ravel(),
+        w=w.ravel(),
+    )
+
+
+def _summarize(
+    onsets: np.ndarray,
+    resets: np.ndarray,
+    offsets: np.ndarray,
+    t0: float,
+    times: np.ndarray,
+    A: np.ndarray,
+    N: np.ndarray,
+    first: int,
+    last: int,
+) -> None:
+    # Fill rows [first, last) of A and N from the boundary partitions of onsets and resets.
+    for k in range(first, last):
+        lo, hi = offsets[k], offsets[k + 1]
+        A[k], N[k] = presence_summary_series(onsets[lo:hi], resets[lo:hi], t0, times)
+
+
+def _summarize_in_pool(
+    onsets: np.ndarray,
+    resets: np.ndarray,
+    offsets: np.ndarray,
+    t0: float,
+    times: np.ndarray,
+    A: np.ndarray,
+    N: np.ndarray,
+    processes: int,
+) -> None:
+    blocks: List[shared_memory.SharedMemory] = []
+
+    def share(array: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        return block.name, array.shape, array.dtype.str
+
+    try:
+        specs = dict(
+            onsets=share(onsets), resets=share(resets), offsets=share(offsets), times=share(times), A=share(A), N=share(N)
+        )
+        # Balance the chunks by interval count rather than boundary count.
+        num_boundaries = len(offsets) - 1
+        targets = np.linspace(0, offsets[-1], processes * 4 + 1)[1:-1]
+        cuts = np.unique(np.concatenate([[0], np.searchsorted(offsets, targets), [num_boundaries]]))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(_summarize_shared, specs, t0, int(first), int(last))
+                for first, last in zip(cuts[:-1], cuts[1:])
+                if last > first
+            ]
+            for future in futures:
+                future.result()
+
+        A[...] = np.ndarray(A.shape, dtype=A.dtype, buffer=blocks[4].buf)
+        N[...] = np.ndarray(N.shape, dtype=N.dtype, buffer=blocks[5].buf)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _summarize_shared(specs: Dict[str, Tuple[str, Tuple[int, ...], str]], t0: float, first: int, last: int) -> None:
+    # Worker entry point: attach to the shared arrays and fill rows [first, last) of the results in place.
+    # Workers share the parent's resource tracker, so attaching here does not
+    # register the blocks a second time; the parent unlinks them when done.
+    blocks = {name: shared_memory.SharedMemory(name=spec[0]) for name, spec in specs.items()}
+    try:
+        arrays = {
+            name: np.ndarray(spec[1], dtype=np.dtype(spec[2]), buffer=blocks[name].buf) for name, spec in specs.items()
+        }
+        _summarize(
+            arrays["onsets"], arrays["resets"], arrays["offsets"], t0, arrays["times"], arrays["A"], arrays["N"], first, last
+        )
+        del arrays
+    finally:
+        for block in blocks.values():
+            block.close()
+
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+## Introduction
+
+Synthetic presence data for benchmarks, scaling tests and convergence experiments.
+
+The generators build presences as columns of numpy arrays (`PresenceArrays`): element and
+boundary codes, onset times and reset times, with `+inf` as the reset time of an open-ended
+presence. They are vectorized, so millions of presences take well under a second, and every
+generator takes a `seed` (an int or a `numpy.random.Generator`), so the same call always
+produces the same data.
+
+The building blocks are arrival processes (`poisson_arrivals`, `bursty_arrivals`) and duration
+distributions (`durations`: exponential, lognormal, Pareto or constant). They are combined by
+
+- `mmc_queue`: the customers of an M/M/c queue (FCFS), with a presence for the time each customer
+  spends in the system, or separate presences for waiting and for service.
+- `element_paths`: elements that move through a sequence of boundaries, one presence per visit,
+  with the next boundary chosen uniformly or from a routing matrix.
+- `independent_presences`: presences with independent arrivals and durations.
+
+A `PresenceArrays` can be converted to `PresenceAssertion`s (`to_presences`), or to an item log
+in the format read by `spath` (`to_frame`, `to_csv`, `to_parquet`; these require pandas, and
+Parquet also requires pyarrow or fastparquet).
+
+```python
+from pcalc.generator import mmc_queue, element_paths
+
+queue = mmc_queue(1_000_000, arrival_rate=0.9, service_rate=1.0, seed=42).censor(at=1e6)
+queue.to_csv("queue.csv", origin="2024-01-01", unit="h")
+
+paths = element_paths(10_000, boundaries=["todo", "doing", "review", "done"], mean_stages=3, seed=7)
+presences = paths.to_presences()
+```
+"""
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from .entity import Entity
+from .presence import PresenceAssertion
+
+Seed = Union[None, int, np.random.Generator]
+
+
+def _rng(seed: Seed) -> np.random.Generator:
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+@dataclass
+class PresenceArrays:
+    """
+    Presences as parallel columns. Row i is the presence of element `element[i]` at boundary
+    `boundaries[boundary[i]]` over `[onset[i], reset[i])`.
+    """
+
+    element: np.ndarray
+    """Element code (int64). The element's id is `element_prefix` followed by the code."""
+    boundary: np.ndarray
+    """Boundary code (int32), an index into `boundaries`."""
+    onset: np.ndarray
+    """Onset time (float64)."""
+    reset: np.ndarray
+    """Reset time (float64); `+inf` for an open-ended presence."""
+    boundaries: List[str] = field(default_factory=lambda: ["boundary"])
+    """Boundary ids, by code."""
+    element_prefix: str = "e"
+
+    def __len__(self) -> int:
+        return len(self.onset)
+
+    @property
+    def is_open(self) -> np.ndarray:
+        return np.isinf(self.reset)
+
+    def _take(self, rows: np.ndarray, reset: Optional[np.ndarray] = None) -> PresenceArrays:
+        return PresenceArrays(self.element[rows], self.boundary[rows], self.onset[rows],
+                              self.reset[rows] if reset is None else reset,
+                              list(self.boundaries), self.element_prefix)
+
+    def sorted(self) -> PresenceArrays:
+        """The presences ordered by onset time (stable)."""
+        return self._take(np.argsort(self.onset, kind="stable"))
+
+    def censor(self, at: float) -> PresenceArrays:
+        """
+        The presences as observed at time `at`: those with an onset at or after `at` are dropped
+        and those that reset after `at` become open-ended.
+        """
+        keep = self.onset < at
+        reset = self.reset[keep]
+        return self._take(keep, np.where(reset > at, np.inf, reset))
+
+    def with_open(self, fraction: float, seed: Seed = None) -> PresenceArrays:
+        """The presences with a random `fraction` of them made open-ended."""
+        if not (0.0 <= fraction <= 1.0):
+            raise ValueError(f"fraction must be between 0 and 1 (got {fraction})")
+        opened = _rng(seed).random(len(self)) < fraction
+        return self._take(np.arange(len(self)), np.where(opened, np.inf, self.reset))
+
+    def element_ids(self) -> np.ndarray:
+        """The element id of every row (object array)."""
+        codes, inverse = np.unique(self.element, return_inverse=True)
+        ids = np.array([f"{self.element_prefix}{c}" for c in codes.tolist()], dtype=object)
+        return ids[inverse]
+
+    # ---------- conversions ----------
+
+    def to_presences(self) -> List[PresenceAssertion]:
+        """The presences as `PresenceAssertion`s, with one `Entity` per element and per boundary."""
+        boundaries = [Entity(b) for b in self.boundaries]
+        codes, inverse = np.unique(self.element, return_inverse=True)
+        elements = [Entity(f"{self.element_prefix}{c}") for c in codes.tolist()]
+        return [
+            PresenceAssertion(element=elements[e], boundary=boundaries[b], onset_time=onset, reset_time=reset)
+            for e, b, onset, reset in zip(inverse.tolist(), self.boundary.tolist(),
+                                          self.onset.tolist(), self.reset.tolist())
+        ]
+
+    def to_frame(self, origin="2024-01-01", unit: str = "h"):
+        """
+        The presences as an item log in the format read by `spath`: columns id, start_ts, end_ts
+        (NaT for open-ended presences) and class (the boundary id). Times are offsets in `unit`
+        from the timestamp `origin`.
+
+        Requires pandas.
+        """
+        import pandas as pd
+
+        origin = pd.Timestamp(origin).as_unit("ns").value
+        ns_per_unit = pd.Timedelta(1, unit=unit).value
+
+        def timestamps(offsets: np.ndarray) -> np.ndarray:
+            # Integer nanoseconds are much faster than pd.to_timedelta on floats; +inf becomes NaT.
+            finite = np.isfinite(offsets)
+            ns = np.full(len(offsets), np.iinfo(np.int64).min, dtype=np.int64)
+            ns[finite] = origin + np.rint(offsets[finite] * ns_per_unit).astype(np.int64)
+            return ns.view("datetime64[ns]")
+
+        return pd.DataFrame({
+            "id": self.element_ids(),
+            "start_ts": timestamps(self.onset),
+            "end_ts": timestamps(self.reset),
+            "class": np.asarray(self.boundaries, dtype=object)[self.boundary],
+        })
+
+    def to_csv(self, path, origin="2024-01-01", unit: str = "h", **kwargs):
+        """Write the item log of `to_frame` to a CSV file. Extra arguments go to `DataFrame.to_csv`."""
+        self.to_frame(origin, unit).to_csv(path, index=False, **kwargs)
+        return path
+
+    def to_parquet(self, path, origin="2024-01-01", unit: str = "h", **kwargs):
+        """
+        Write the item log of `to_frame` to a Parquet file. Extra arguments go to `DataFrame.to_parquet`.
+
+        Requires pandas, and pyarrow or fastparquet.
+        """
+        self.to_frame(origin, unit).to_parquet(path, index=False, **kwargs)
+        return path
+
+
+# ---------- arrival processes ----------
+
+def poisson_arrivals(n: int, rate: float = 1.0, start: float = 0.0, seed: Seed = None) -> np.ndarray:
+    """The first n arrival times of a Poisson process with the given rate, after `start`."""
+    if rate <= 0:
+        raise ValueError(f"rate must be positive (got {rate})")
+    return start + np.cumsum(_rng(seed).exponential(1.0 / rate, n))
+
+
+def bursty_arrivals(n: int, rate: float = 1.0, mean_burst: float = 10.0, spread: float = 0.1,
+                    start: float = 0.0, seed: Seed = None) -> np.ndarray:
+    """
+    The first n arrival times (sorted) of a batch Poisson process with long-run rate about `rate`.
+
+    Bursts arrive as a Poisson process at rate `rate / mean_burst` and bring a geometric number of
+    arrivals with mean `mean_burst`. The arrivals of a burst are spread after its start with
+    exponential gaps of mean `spread / rate`, so a small `spread` gives tight bursts.
+    """
+    if rate <= 0 or mean_burst < 1 or spread < 0:
+        raise ValueError("rate must be positive, mean_burst at least 1 and spread non-negative")
+    rng = _rng(seed)
+    sizes = rng.geometric(1.0 / mean_burst, int(n / mean_burst * 1.1) + 16)
+    while sizes.sum() < n:
+        sizes = np.concatenate([sizes, rng.geometric(1.0 / mean_burst, len(sizes) // 2 + 16)])
+    sizes = sizes[:np.searchsorted(np.cumsum(sizes), n) + 1]
+    burst_starts = start + np.cumsum(rng.exponential(mean_burst / rate, len(sizes)))
+    burst = np.repeat(np.arange(len(sizes)), sizes)[:n]
+
+    gaps = rng.exponential(spread / rate, n)
+    first = np.flatnonzero(np.r_[True, burst[1:] != burst[:-1]])
+    gaps[first] = 0.0
+    offsets = np.cumsum(gaps)
+    offsets -= np.repeat(offsets[first], np.diff(np.r_[first, n]))
+    return np.sort(burst_starts[burst] + offsets)
+
+
+# ---------- durations ----------
+
+def durations(n: int, mean: float = 1.0, distribution: str = "exponential",
+              shape: Optional[float] = None, seed: Seed = None) -> np.ndarray:
+    """
+    n positive durations with the given mean.
+
+    Args:
+        distribution: "exponential", "lognormal" (`shape` is sigma, default 1.0), "pareto"
+            (`shape` is the tail index alpha > 1, default 1.5; heavy-tailed with infinite variance
+            for alpha <= 2) or "constant".
+    """
+    if mean <= 0:
+        raise ValueError(f"mean must be positive (got {mean})")
+    rng = _rng(seed)
+    if distribution == "exponential":
+        return rng.exponential(mean, n)
+    if distribution == "lognormal":
+        sigma = 1.0 if shape is None else shape
+        return rng.lognormal(np.log(mean) - sigma ** 2 / 2.0, sigma, n)
+    if distribution == "pareto":
+        alpha = 1.5 if shape is None else shape
+        if alpha <= 1.0:
+            raise ValueError(f"The Pareto tail index must exceed 1 for a finite mean (got {alpha})")
+        return (rng.pareto(alpha, n) + 1.0) * mean * (alpha - 1.0) / alpha
+    if distribution == "constant":
+        return np.full(n, float(mean))
+    raise ValueError(f"Unknown duration distribution {distribution!r}")
+
+
+# ---------- generators ----------
+
+def queue_departures(arrivals: npt.ArrayLike, service: npt.ArrayLike, servers: int = 1) -> np.ndarray:
+    """
+    Departure times of a FCFS queue with `servers` servers, for sorted arrival times and the
+    service times of the arrivals.
+
+    A single server uses the Lindley recursion in closed form, $D_i = S_i + \\max_{j \\le i}(A_j - S_{j-1})$
+    with $S_i$ the cumulative service time, which vectorizes. Several servers need a heap of
+    server free times and run at about a million customers per second.
+    """
+    arrivals = np.asarray(arrivals, dtype=float)
+    service = np.asarray(service, dtype=float)
+    if servers < 1:
+        raise ValueError(f"servers must be at least 1 (got {servers})")
+    if servers == 1:
+        work = np.cumsum(service)
+        return work + np.maximum.accumulate(arrivals - (work - service))
+
+    free = [-np.inf] * servers
+    departures = []
+    for a, s in zip(arrivals.tolist(), service.tolist()):
+        d = max(a, free[0]) + s
+        heapq.heapreplace(free, d)
+        departures.append(d)
+    return np.asarray(departures)
+
+
+def mmc_queue(n: int, arrival_rate: float = 0.9, service_rate: float = 1.0, servers: int = 1,
+              split_waiting: bool = False, bursty: bool = False, seed: Seed = None) -> PresenceArrays:
+    """
+    The first n customers of an M/M/c queue (FCFS), starting empty at time 0.
+
+    Args:
+        n: Number of customers; customer i is element i.
+        arrival_rate: Arrival rate. The queue is stable if it is below `servers * service_rate`.
+        service_rate: Service rate of each server.
+        servers: Number of servers c.
+        split_waiting: If False, one presence per customer at boundary "queue" for its time in the
+            system. If True, a presence at "waiting" for its wait (if it waited) and one at
+            "service" for its service.
+        bursty: Use `bursty_arrivals` (with the same long-run rate) instead of Poisson arrivals.
+    """
+    rng = _rng(seed)
+    arrivals = (bursty_arrivals(n, arrival_rate, seed=rng) if bursty
+                else poisson_arrivals(n, arrival_rate, seed=rng))
+    service = rng.exponential(1.0 / service_rate, n)
+    departures = queue_departures(arrivals, service, servers)
+    element = np.arange(n, dtype=np.int64)
+    if not split_waiting:
+        return PresenceArrays(element, np.zeros(n, dtype=np.int32), arrivals, departures, ["queue"], "c")
+
+    started = departures - service
+    waited = started > arrivals
+    return PresenceArrays(
+        element=np.concatenate([element[waited], element]),
+        boundary=np.concatenate([np.zeros(waited.sum(), dtype=np.int32), np.ones(n, dtype=np.int32)]),
+        onset=np.concatenate([arrivals[waited], started]),
+        reset=np.concatenate([started[waited], departures]),
+        boundaries=["waiting", "service"],
+        element_prefix="c",
+    ).sorted()
+
+
+def independent_presences(n: int, rate: float = 1.0, mean_duration: float = 1.0,
+                          distribution: str = "exponential", shape: Optional[float] = None,
+                          boundaries: Union[int, Sequence[str]] = 1, elements: Optional[int] = None,
+                          bursty: bool = False, seed: Seed = None) -> PresenceArrays:
+    """
+    n presences with independent arrivals (Poisson, or bursty) and durations (see `durations`),
+    each at a uniformly chosen boundary. Every presence has its own element unless `elements`
+    is given, in which case elements are drawn uniformly from that many.
+    """
+    rng = _rng(seed)
+    names = _boundary_names(boundaries)
+    onset = bursty_arrivals(n, rate, seed=rng) if bursty else poisson_arrivals(n, rate, seed=rng)
+    duration = durations(n, mean_duration, distribution, shape, seed=rng)
+    element = (np.arange(n, dtype=np.int64) if elements is None
+               else rng.integers(0, elements, n).astype(np.int64))
+    boundary = rng.integers(0, len(names), n).astype(np.int32)
+    return PresenceArrays(element, boundary, onset, onset + duration, names)
+
+
+def element_paths(n: int, boundaries: Union[int, Sequence[str]] = 4, mean_stages: float = 3.0,
+                  arrival_rate: float = 1.0, mean_duration: float = 1.0,
+                  distribution: str = "exponential", shape: Optional[float] = None,
+                  routing: Optional[npt.ArrayLike] = None, seed: Seed = None) -> PresenceArrays:
+    """
+    Paths of n elements through a set of boundaries.
+
+    Elements arrive as a Poisson process and visit a geometric number of boundaries (at least one,
+    `mean_stages` on average) one after another, with a presence for each visit: the next visit
+    starts when the previous one resets. The first boundary is chosen uniformly; the next one
+    uniformly too, or, with a `routing` matrix, with probability `routing[previous, next]`.
+    Rows are grouped by element, in visit order.
+
+    Args:
+        boundaries: Number of boundaries, or their ids.
+        routing: Row-stochastic matrix of transition probabilities between boundaries.
+    """
+    rng = _rng(seed)
+    names = _boundary_names(boundaries)
+    if mean_stages < 1:
+        raise ValueError(f"mean_stages must be at least 1 (got {mean_stages})")
+    stages = rng.geometric(1.0 / mean_stages, n)
+    rows = int(stages.sum())
+    element = np.repeat(np.arange(n, dtype=np.int64), stages)
+    first = np.r_[0, np.cumsum(stages)[:-1]]
+    depth = np.arange(rows) - np.repeat(first, stages)
+
+    boundary = rng.integers(0, len(names), rows).astype(np.int32)
+    if routing is not None:
+        cumulative = np.cumsum(_routing_matrix(routing, len(names)), axis=1)
+        # Each visit depends on the previous one, so walk the paths one depth at a time.
+        for d in range(1, int(stages.max())):
+            at = np.flatnonzero(depth == d)
+            u = rng.random(len(at))[:, None]
+            boundary[at] = np.minimum((u >= cumulative[boundary[at - 1]]).sum(axis=1), len(names) - 1)
+
+    duration = durations(rows, mean_duration, distribution, shape, seed=rng)
+    elapsed = np.cumsum(duration)
+    before = elapsed - duration
+    onset = np.repeat(poisson_arrivals(n, arrival_rate, seed=rng), stages) + before - np.repeat(before[first], stages)
+    return PresenceArrays(element, boundary, onset, onset + duration, names)
+
+
+def _boundary_names(boundaries: Union[int, Sequence[str]]) -> List[str]:
+    if isinstance(boundaries, (int, np.integer)):
+        if boundaries < 1:
+            raise ValueError(f"There must be at least one boundary (got {boundaries})")
+        return [f"b{i}" for i in range(boundaries)]
+    names = [str(b) for b in boundaries]
+    if not names:
+        raise ValueError("There must be at least one boundary")
+    return names
+
+
+def _routing_matrix(routing: npt.ArrayLike, size: int) -> np.ndarray:
+    routing = np.asarray(routing, dtype=float)
+    if routing.shape != (size, size):
+        raise ValueError(f"routing must be a {size}x{size} matrix (got shape {routing.shape})")
+    if np.any(routing < 0) or not np.allclose(routing.sum(axis=1), 1.0):
+        raise ValueError("routing must be row-stochastic: non-negative rows that sum to 1")
+    return routing
@@ -4,13 +4,12 @@
 
 from typing import Any, Optional, Dict
 
-import numpy as np
-import pandas as pd
-import polars as pl
-import matplotlib.pyplot as plt
-from IPython.display import display, Markdown
+# polars and IPython are only needed by the notebook helpers below, and are slow to import,
+# so they are imported where they are used rather than when this module is loaded.
 
 def pd_display(df, **kwargs):
+    from IPython.display import display, Markdown
+
     text = df.to_string(**kwargs)
     display(Markdown(f'```\n{text}\n```'))
 
@@ -25,6 +24,8 @@ def estimate_limits(df, tail_frac=0.2):
 
 # Convert Python types to Polars types
 def map_polars_schema(annotations):
+    import polars as pl
+
     type_map = {
         float: pl.Float64,
         str: pl.Utf8,
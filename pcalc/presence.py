@@ -434,17 +434,25 @@ class PresenceAssertion:
         """
         Returns the mass of the presence.
 
-
-        
+        If the assertion carries a presence function, this is its integral over
+        $[t_0, t_1)$ (see `pcalc.presence_mass`). Otherwise the presence has constant
+        unit density and the mass is its duration.
         """
+        if self.presence is not None:
+            return self.presence(self.onset_time, self.reset_time)
         onset = max(0.0, self.onset_time)
         return max(0.0, self.reset_time - onset)
 
     def mass_contribution(self, t0: float, t1: float) -> float:
+        """
+        Returns the mass of the presence that falls within the window $[t_0, t_1)$.
+        """
         if t0 >= t1 or not self.overlaps(t0, t1):
             return 0.0
         start = max(self.onset_time, t0)
         end = min(self.reset_time, t1)
+        if self.presence is not None:
+            return self.presence(start, end)
         return max(0.0, end - start)
 
     def __str__(self) -> str:
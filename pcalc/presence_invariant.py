@@ -3,6 +3,10 @@
 # SPDX-License-Identifier: MIT
 
 from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
 from .basis_topology import BasisTopology
 from .presence import PresenceAssertion
 
@@ -73,3 +77,64 @@ class PresenceInvariant:
         Λ = N / T if T > 0 else 0.0
         w = A / N if N > 0 else 0.0
         return L, Λ, w
+
+    def invariant_series(self, t0: float, times: npt.ArrayLike) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The invariant over each of the windows [t0, t) for t in `times`, computed in one vectorized pass.
+
+        Equivalent to `[self.invariant(t0, t) for t in times]`, but costs O((n + m) log n) for n closed
+        presences and m times, rather than O(n m).
+
+        Returns:
+            Three arrays (L, Λ, w), one value per time.
+        """
+        _, _, onsets, resets = self.topology.closure_intervals()
+        times = np.asarray(times, dtype=float)
+        A, N = presence_summary_series(onsets, resets, t0, times)
+        T = times - t0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            L = np.where(T > 0, A / T, 0.0)
+            Λ = np.where(T > 0, N / T, 0.0)
+            w = np.where(N > 0, A / N, 0.0)
+        return L, Λ, w
+
+
+def presence_summary_series(
+    onsets: npt.ArrayLike,
+    resets: npt.ArrayLike,
+    t0: float,
+    times: npt.ArrayLike,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The total presence mass A and the number of presences N in each window [t0, t) for t in `times`,
+    for binary presences over the intervals [onsets[i], resets[i]).
+
+    After clipping the intervals to start no earlier than t0, the mass in [t0, t) is
+
+    $$
+    A(t) = \\sum_{s_i < t} (t - s_i) - \\sum_{e_i < t} (t - e_i)
+    $$
+
+    and N(t) is the number of intervals with $s_i < t$. Both sums are evaluated for all t at once with
+    prefix sums over the sorted onsets and resets and a binary search per time.
+    """
+    onsets = np.asarray(onsets, dtype=float)
+    resets = np.asarray(resets, dtype=float)
+    times = np.asarray(times, dtype=float)
+
+    starts = np.maximum(onsets, t0)
+    live = resets > starts
+    starts, ends = np.sort(starts[live]), np.sort(resets[live])
+
+    # Prefix sums with a leading zero, over finite values only; infinite resets are never < t.
+    start_sums = np.concatenate([[0.0], np.cumsum(starts)])
+    finite_ends = ends[np.isfinite(ends)]
+    end_sums = np.concatenate([[0.0], np.cumsum(finite_ends)])
+
+    started = np.searchsorted(starts, times, side="left")
+    ended = np.searchsorted(finite_ends, times, side="left")
+
+    A = (started * times - start_sums[started]) - (ended * times - end_sums[ended])
+    N = started.astype(np.int64)
+    return np.where(times > t0, A, 0.0), np.where(times > t0, N, 0)
+
@@ -366,6 +366,10 @@ class PresenceInvariantDiscrete:
             `avg_residence_time_per_presence`, and `flow_rate`.
 
             ... and much of this work lives in `PresenceMap.presence_value_in`
+
+            If the matrix is weighted (`PresenceMatrix(..., weighted=True)`), \$ A \$ is the total
+            *mass* of the presences over the interval, and \$ L \$ and \$ w \$ are measured in
+            mass rather than time.
         """
         start, end = self._resolve_range(start_time, end_time)
         start_bin, end_bin = self.ts.bin_slice(start, end)
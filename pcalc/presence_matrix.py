@@ -9,6 +9,7 @@ from typing import List, Optional
 import numpy as np
 from numpy import typing as npt
 
+from .entity import EntityRegistry
 from .presence import PresenceAssertion
 from .presence_map import PresenceMap
 from .time_scale import Timescale
@@ -80,9 +81,36 @@ class PresenceMatrix:
     - Use `matrix[i, j]`, `matrix[i, j:k]`, or `matrix[:, j]` for lightweight slicing without allocating the full matrix
     - Stepped slicing (e.g., `matrix[::2]`) is not currently supported
 
+    Weighted matrices
+    -----------------
+    With `weighted=True`, each cell is the integrated *mass* of the presence function over
+    that bin rather than the fraction of the bin that is covered. This is the matrix for presences
+    that carry a `PresenceProtocol` (see `pcalc.presence_mass`): per-bin masses are computed once per
+    row when the matrix is constructed, using the vectorized antiderivative for known shapes and
+    one mass query per bin otherwise.
+
+    For binary presences, a weighted cell equals the unweighted cell times the bin width, so
+    `PresenceInvariantDiscrete` computes the same $L$, $\\Lambda$, $w$ either way. For weighted
+    presences it measures presence in units of mass instead of time.
+
+    ```python
+    from pcalc.presence_mass import RampPresence
+
+    p = RampPresence(0.0, 4.0).assertion(e, b)
+    matrix = PresenceMatrix([p], time_scale=Timescale(0.0, 4.0, 1.0), weighted=True)
+    matrix[0]  # array([0.125, 0.375, 0.625, 0.875])
+    ```
+
 """
 
-    def __init__(self, presences: List[PresenceAssertion], time_scale: Timescale, materialize=False):
+    def __init__(
+        self,
+        presences: List[PresenceAssertion],
+        time_scale: Timescale,
+        materialize=False,
+        weighted=False,
+        registry: Optional[EntityRegistry] = None,
+    ):
         """
         Construct a presence matrix from a list of Presences and time window configuration.
 
@@ -91,6 +119,10 @@ class PresenceMatrix:
             time_scale: The discrete `Timescale` that the matrix will be normalized to.
             materialize: If True, immediately constructs the full backing matrix.
                      Otherwise, matrix values will be computed on demand using the sparse presence map.
+            weighted: If True, each cell holds the mass of the presence in the bin instead of the
+                     fraction of the bin it covers.
+            registry: The `EntityRegistry` used to encode the elements and boundaries of the rows.
+                     A new registry is created if none is given.
         """
 
         self.presence_matrix: Optional[npt.NDArray[np.float64]] = None
@@ -107,6 +139,27 @@ class PresenceMatrix:
         The time scale of the presence matrix.
         """
 
+        self.weighted = weighted
+        """
+        True if the cells of the matrix hold per-bin masses rather than coverage fractions.
+        """
+
+        self.registry: EntityRegistry = registry if registry is not None else EntityRegistry()
+        """
+        The registry that encodes the elements and boundaries of the rows.
+        """
+
+        self.element_codes: npt.NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+        """
+        The registry code of the element of each row. Use this to group rows by element
+        with array operations, e.g. `np.bincount(matrix.element_codes, weights=row_totals)`.
+        """
+
+        self.boundary_codes: npt.NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+        """
+        The registry code of the boundary of each row.
+        """
+
         self.presence_map: List[PresenceMap] = []
         self.shape = None
         self.init_presence_map(presences)
@@ -122,10 +175,13 @@ class PresenceMatrix:
         ts = self.time_scale  # Timescale object: includes t0, t1, bin_width
 
         for row, presence in enumerate(presences):
-            presence_map = PresenceMap(presence, ts)
+            presence_map = PresenceMap(presence, ts, weighted=self.weighted)
             if presence_map.is_mapped:
                 self.presence_map.append(presence_map)
 
+        self.element_codes = self.registry.encode(pm.presence.element for pm in self.presence_map)
+        self.boundary_codes = self.registry.encode(pm.presence.boundary for pm in self.presence_map)
+
         num_bins = ts.num_bins
         num_rows = len(self.presence_map)
         self.shape = (num_rows, num_bins)
@@ -158,6 +214,9 @@ class PresenceMatrix:
                 continue
             start = pm.start_bin
             end = pm.end_bin
+            if pm.is_weighted:
+                matrix[row, start:end] = pm.masses
+                continue
             matrix[row, start] = pm.start_value
             if end - 1 > start:
                 matrix[row, end - 1] = pm.end_value
@@ -183,6 +242,12 @@ class PresenceMatrix:
         if not pm.is_mapped:
             return output
 
+        if pm.is_weighted:
+            lo, hi = max(start, pm.start_bin), min(stop, pm.end_bin)
+            if lo < hi:
+                output[lo - start: hi - start] = pm.masses[lo - pm.start_bin: hi - pm.start_bin]
+            return output
+
         # Slice and overlap window
         for col in range(start, stop):
             if col < pm.start_bin or col >= pm.end_bin:
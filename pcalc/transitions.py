@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+## Introduction
+
+When an element's presences move from boundary to boundary—an item moving through the states
+of a process, a packet moving across the hops of a network—the sequence of boundaries it visits
+is its *trajectory*. Aggregating the trajectories of all elements gives a weighted, directed
+graph over boundaries: the *boundary transition graph*.
+
+An edge $b_i \\to b_j$ records that some element's presence in $b_j$ was the next presence
+(by onset time) after its presence in $b_i$. Each edge carries flow metrics:
+
+- `count`: the number of transitions along the edge.
+- *dwell*: the duration of the presence in the source boundary that ended with the transition.
+- *delay*: the time from the reset of the presence in the source boundary to the onset of the
+  presence in the target boundary. Delays are negative when the two presences overlap.
+
+Nodes carry the number of visits to each boundary, the total dwell time in it, and the number of
+trajectories that start (`entries`) and end (`exits`) in it.
+
+### Algorithm
+
+The assertions are encoded with an `EntityRegistry` and sorted once by (element, onset time,
+reset time) with `np.lexsort`. Consecutive rows with the same element are then exactly the
+transitions, and all edge metrics are computed with array reductions over the (source, target) keys.
+There are no per-element loops and no joins.
+
+```python
+from pcalc.transitions import transition_graph
+
+graph = transition_graph(presences)
+for source, target, metrics in graph.edges():
+    print(source.name, "->", target.name, metrics["count"], metrics["delay_mean"])
+```
+
+Presences with infinite onset or reset times produce infinite dwell and delay values on
+the edges they participate in.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .entity import EntityProtocol, EntityRegistry
+from .presence import PresenceAssertion
+
+
+@dataclass
+class TransitionGraph:
+    """
+    A weighted directed graph of boundary transitions in columnar form.
+
+    Edge arrays are parallel and sorted by (source, target) code. Node arrays are parallel and
+    sorted by boundary code. All codes are codes in `registry`.
+    """
+
+    registry: EntityRegistry
+    """The registry that decodes element and boundary codes."""
+
+    sources: np.ndarray
+    """Source boundary code of each edge (int32)."""
+    targets: np.ndarray
+    """Target boundary code of each edge (int32)."""
+    counts: np.ndarray
+    """Number of transitions along each edge (int64)."""
+    dwell_total: np.ndarray
+    """Total dwell time in the source boundary over the transitions along each edge."""
+    dwell_mean: np.ndarray
+    """Mean dwell time in the source boundary before a transition along each edge."""
+    delay_mean: np.ndarray
+    """Mean delay between leaving the source and entering the target boundary."""
+    delay_min: np.ndarray
+    """Minimum delay along each edge."""
+    delay_max: np.ndarray
+    """Maximum delay along each edge."""
+
+    boundaries: np.ndarray
+    """Code of each boundary that was visited (int32)."""
+    visits: np.ndarray
+    """Number of presences in each boundary (int64)."""
+    boundary_dwell_total: np.ndarray
+    """Total dwell time in each boundary."""
+    entries: np.ndarray
+    """Number of element trajectories that start in each boundary (int64)."""
+    exits: np.ndarray
+    """Number of element trajectories that end in each boundary (int64)."""
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.sources)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.boundaries)
+
+    def _edge_metrics(self, i: int) -> Dict[str, Any]:
+        return dict(
+            count=int(self.counts[i]),
+            dwell_total=float(self.dwell_total[i]),
+            dwell_mean=float(self.dwell_mean[i]),
+            delay_mean=float(self.delay_mean[i]),
+            delay_min=float(self.delay_min[i]),
+            delay_max=float(self.delay_max[i]),
+        )
+
+    def edges(self) -> Iterator[Tuple[Optional[EntityProtocol], Optional[EntityProtocol], Dict[str, Any]]]:
+        """Iterate over edges as (source boundary, target boundary, metrics)."""
+        entity = self.registry.entity
+        for i in range(self.num_edges):
+            yield entity(int(self.sources[i])), entity(int(self.targets[i])), self._edge_metrics(i)
+
+    def edge(self, source: EntityProtocol, target: EntityProtocol) -> Optional[Dict[str, Any]]:
+        """The metrics of the edge from `source` to `target`, or None if there were no such transitions."""
+        source_code, target_code = self.registry.lookup(source), self.registry.lookup(target)
+        if source_code is None or target_code is None:
+            return None
+        # Edges are sorted by (source, target), so a binary search on the packed key finds the edge.
+        keys = _pack(self.sources, self.targets)
+        key = _pack(np.asarray([source_code]), np.asarray([target_code]))[0]
+        i = int(np.searchsorted(keys, key))
+        if i < self.num_edges and keys[i] == key:
+            return self._edge_metrics(i)
+        return None
+
+    def adjacency(self, weight: str = "counts") -> np.ndarray:
+        """
+        The dense weighted adjacency matrix over all codes in the registry.
+
+        Args:
+            weight: The name of the edge array to use as the weight, e.g. `"counts"` or `"delay_mean"`.
+        """
+        n = len(self.registry)
+        matrix = np.zeros((n, n), dtype=float)
+        matrix[self.sources, self.targets] = getattr(self, weight)
+        return matrix
+
+
+def transition_graph(
+    presences: Iterable[PresenceAssertion],
+    registry: Optional[EntityRegistry] = None,
+) -> TransitionGraph:
+    """
+    Build the boundary transition graph of a set of presence assertions.
+
+    Each element's presences are ordered by onset time (and reset time, to break ties), and each
+    consecutive pair of presences is a transition from the boundary of the first to the boundary of the second.
+
+    Args:
+        presences: The presence assertions.
+        registry: The registry used to encode elements and boundaries. A new registry is created if
+            none is given.
+    """
+    registry = registry if registry is not None else EntityRegistry()
+    presences = list(presences)
+    n = len(presences)
+    elements = registry.encode(p.element for p in presences)
+    boundaries = registry.encode(p.boundary for p in presences)
+    onsets = np.fromiter((p.onset_time for p in presences), dtype=float, count=n)
+    resets = np.fromiter((p.reset_time for p in presences), dtype=float, count=n)
+
+    order = np.lexsort((resets, onsets, elements))
+    elements, boundaries, onsets, resets = elements[order], boundaries[order], onsets[order], resets[order]
+    dwell = resets - onsets
+
+    # Consecutive rows of the same element are transitions; the other boundaries are trajectory starts and ends.
+    same_element = elements[1:] == elements[:-1]
+    is_first = np.ones(n, dtype=bool)
+    is_first[1:] = ~same_element
+    is_last = np.ones(n, dtype=bool)
+    is_last[:-1] = ~same_element
+
+    source_rows = np.flatnonzero(same_element)
+    target_rows = source_rows + 1
+    sources, targets = boundaries[source_rows], boundaries[target_rows]
+    delays = onsets[target_rows] - resets[source_rows]
+    edge_dwell = dwell[source_rows]
+
+    edge_keys = _pack(sources, targets)
+    edge_order = np.argsort(edge_keys, kind="stable")
+    edge_starts = _group_starts(edge_keys[edge_order])
+    counts = np.diff(np.append(edge_starts, len(source_rows))).astype(np.int64)
+    dwell_total = _reduce(np.add, edge_dwell[edge_order], edge_starts)
+    delays_sorted = delays[edge_order]
+
+    node_order = np.argsort(boundaries, kind="stable")
+    node_starts = _group_starts(boundaries[node_order])
+    node_counts = np.diff(np.append(node_starts, n)).astype(np.int64)
+
+    return TransitionGraph(
+        registry=registry,
+        sources=sources[edge_order][edge_starts].astype(np.int32),
+        targets=targets[edge_order][edge_starts].astype(np.int32),
+        counts=counts,
+        dwell_total=dwell_total,
+        dwell_mean=dwell_total / np.maximum(counts, 1),
+        delay_mean=_reduce(np.add, delays_sorted, edge_starts) / np.maximum(counts, 1),
+        delay_min=_reduce(np.minimum, delays_sorted, edge_starts),
+        delay_max=_reduce(np.maximum, delays_sorted, edge_starts),
+        boundaries=boundaries[node_order][node_starts].astype(np.int32),
+        visits=node_counts,
+        boundary_dwell_total=_reduce(np.add, dwell[node_order], node_starts),
+        entries=_count_in_groups(is_first[node_order], node_starts),
+        exits=_count_in_groups(is_last[node_order], node_starts),
+    )
+
+
+def _pack(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    # Pack two int32 code arrays (which may contain -1) into one sortable int64 key.
+    return (high.astype(np.int64) + 1) << 32 | (low.astype(np.int64) + 1)
+
+
+def _group_starts(sorted_keys: np.ndarray) -> np.ndarray:
+    # The start offset of each run of equal keys in a sorted key array.
+    if len(sorted_keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+
+
+def _reduce(ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    if len(starts) == 0:
+        return np.zeros(0, dtype=float)
+    return ufunc.reduceat(values.astype(float), starts)
+
+
+def _count_in_groups(flags: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(flags.astype(np.int64), starts)
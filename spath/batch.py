@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Batch runner: many CSVs and parameter sets from one manifest.
+
+`sample_path_analysis.py` analyzes one CSV with one parameter set per process. For reviews across
+many teams, this script runs every scenario in a JSON manifest instead:
+
+    {
+      "output_dir": "charts",
+      "args": ["--metrics-only"],
+      "scenarios": [
+        {"input": "team-a.csv", "scenario": "all"},
+        {"input": "team-a.csv", "scenario": "completed", "args": ["--completed"]},
+        {"input": "team-b.csv", "scenario": "bugs", "args": ["--classes", "bug", "--lambda-pctl", "99"]}
+      ]
+    }
+
+Each scenario is parsed with the same command line options as `sample_path_analysis.py`: its
+input, then the manifest-wide `args`, then its own `args`. Relative inputs are resolved against
+the directory of the manifest. A bare list of scenarios is also accepted.
+
+Scenarios are grouped by input file and CSV parsing options. Each group is a single task:
+
+    - the CSV is loaded at most once (not at all if every scenario is in the metrics cache),
+    - scenarios with the same data and metric options share one set of metrics, so scenarios that
+      differ only in chart settings only repeat the rendering, and
+    - the scenarios are then written one after the other.
+
+Groups run in a pool of `--jobs` worker processes. Progress and timings are printed per scenario,
+and `--report PATH` also writes them as a CSV. A failing scenario is reported and the batch moves on;
+the exit status is 1 if any scenario failed.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import cli
+from file_utils import ensure_output_dirs, write_cli_args_to_file
+from spath.instrument import TimingRegistry
+
+
+
+@dataclass
+class ScenarioSpec:
+    input: str
+    scenario: str = "latest"
+    args: List[str] = field(default_factory=list)
+
+    def argv(self, common_args: List[str], output_dir: Optional[str]) -> List[str]:
+        argv = [self.input]
+        if output_dir is not None:
+            argv += ["--output-dir", output_dir]
+        return argv + list(common_args) + list(self.args) + ["--scenario", self.scenario]
+
+
+@dataclass
+class ScenarioReport:
+    input: str
+    scenario: str
+    ok: bool
+    seconds: float
+    outputs: int = 0
+    shared: bool = False
+    error: str = ""
+
+
+def load_manifest(path: str) -> List[Tuple[ScenarioSpec, List[str]]]:
+    """
+    Read a batch manifest. Returns (scenario, argv) pairs, where argv is the scenario's full command line.
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"scenarios": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("scenarios"), list):
+        raise ValueError(f"{path}: expected a list of scenarios or an object with a 'scenarios' list")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    common_args = [str(a) for a in manifest.get("args", [])]
+    output_dir = manifest.get("output_dir")
+    if output_dir is not None:
+        output_dir = os.path.join(base_dir, os.path.expanduser(output_dir))
+
+    entries = []
+    for i, item in enumerate(manifest["scenarios"]):
+        if not isinstance(item, dict) or "input" not in item:
+            raise ValueError(f"{path}: scenario {i} has no 'input'")
+        spec = ScenarioSpec(
+            input=os.path.join(base_dir, os.path.expanduser(item["input"])),
+            scenario=str(item.get("scenario", "latest")),
+            args=[str(a) for a in item.get("args", [])],
+        )
+        entries.append((spec, spec.argv(common_args, output_dir)))
+    return entries
+
+
+def group_by_input(entries: List[Tuple[ScenarioSpec, List[str]]]) -> Dict[Tuple, List[Tuple[ScenarioSpec, List[str]]]]:
+    """Group scenarios that read the same input with the same CSV parsing options, in manifest order."""
+    parser = cli.build_parser()
+    groups: Dict[Tuple, List[Tuple[ScenarioSpec, List[str]]]] = {}
+    for spec, argv in entries:
+        try:
+            args, _ = parser.parse_known_args(argv)
+            key = (os.path.abspath(args.csv),) + tuple(getattr(args, name) for name in cli.LOAD_OPTIONS)
+        except SystemExit:
+            # Invalid options: keep the scenario so that run_group reports it as failed
+            key = (os.path.abspath(spec.input),)
+        groups.setdefault(key, []).append((spec, argv))
+    return groups
+
+
+def run_group(scenarios: List[Tuple[ScenarioSpec, List[str]]]) -> List[ScenarioReport]:
+    """Run the scenarios of one input group, loading the input at most once."""
+    import sample_path_analysis as spa
+
+    loaded: Dict[str, Any] = {}
+    analyses: Dict[str, Any] = {}
+    reports: List[ScenarioReport] = []
+
+    def load_once(args):
+        # The scenarios of a group share their CSV parsing options, so the first load serves them all
+        if "df" not in loaded:
+            t = time.perf_counter()
+            loaded["df"] = spa.load_input(args.csv, args)
+            print(f"[INFO] Loaded {args.csv} ({len(loaded['df'])} rows) in {time.perf_counter() - t:.2f}s",
+                  flush=True)
+        return loaded["df"]
+
+    for spec, argv in scenarios:
+        name = f"{os.path.basename(spec.input)}:{spec.scenario}"
+        start = time.perf_counter()
+        try:
+            parser, args = cli.parse_args(argv)
+            out_dir = ensure_output_dirs(args.csv, output_dir=args.output_dir, scenario_dir=args.scenario,
+                                         clean=args.clean)
+            write_cli_args_to_file(parser, args, out_dir)
+
+            # Stage timings per scenario; a shared load shows up in the scenario that ran it
+            timings = TimingRegistry(memory=args.timings_memory)
+            with timings.activate():
+                key = json.dumps({**spa.cache_params(args), "checkpoint": args.checkpoint},
+                                 sort_keys=True, default=str)
+                analysis = analyses.get(key)
+                shared = analysis is not None
+                if analysis is None:
+                    analysis = analyses[key] = spa.get_analysis(args.csv, args, load=lambda: load_once(args))
+
+                paths = spa.write_outputs(analysis, args, out_dir)
+            timings.write(out_dir)
+            report = ScenarioReport(spec.input, spec.scenario, ok=True, seconds=time.perf_counter() - start,
+                                    outputs=len(paths), shared=shared)
+            print(f"[INFO] {name}: {len(paths)} outputs in {report.seconds:.2f}s"
+                  f"{' (shared metrics)' if shared else ''}", flush=True)
+        except (Exception, SystemExit) as e:
+            report = ScenarioReport(spec.input, spec.scenario, ok=False, seconds=time.perf_counter() - start,
+                                    error=f"{type(e).__name__}: {e}")
+            print(f"[ERROR] {name}: {report.error}", file=sys.stderr, flush=True)
+        reports.append(report)
+    return reports
+
+
+def run_batch(entries: List[Tuple[ScenarioSpec, List[str]]], jobs: int = 1) -> List[ScenarioReport]:
+    """Run the scenarios of a manifest, one input group per task, in `jobs` worker processes."""
+    groups = list(group_by_input(entries).values())
+    total = len(entries)
+    print(f"[INFO] {total} scenarios over {len(groups)} inputs", flush=True)
+
+    reports: List[ScenarioReport] = []
+    if jobs <= 1 or len(groups) <= 1:
+        for scenarios in groups:
+            reports += run_group(scenarios)
+            print(f"[INFO] Progress: {len(reports)}/{total} scenarios", flush=True)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_group, scenarios) for scenarios in groups]
+            for future in as_completed(futures):
+                reports += future.result()
+                print(f"[INFO] Progress: {len(reports)}/{total} scenarios", flush=True)
+    return reports
+
+
+def write_report(reports: List[ScenarioReport], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ScenarioReport.__dataclass_fields__))
+        writer.writeheader()
+        for report in reports:
+            writer.writerow(asdict(report))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run sample path analyses for every scenario in a manifest")
+    parser.add_argument("manifest", type=str, help="Path to a JSON manifest of (input, scenario, args) entries")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes; each processes all the scenarios of one input (default 1)")
+    parser.add_argument("--report", type=str, default=None,
+                        help="Also write per-scenario status and timings to this CSV file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        entries = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    reports = run_batch(entries, jobs=args.jobs)
+    if args.report:
+        write_report(reports, args.report)
+
+    failed = [r for r in reports if not r.ok]
+    print(f"[INFO] {len(reports) - len(failed)}/{len(reports)} scenarios succeeded "
+          f"in {time.perf_counter() - start:.2f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Disk cache of loaded data and computed metrics.
+
+Re-running an analysis with only chart settings changed (e.g. `--lambda-pctl`) repeats the CSV load,
+the filters and the full metric sweep. This cache stores their outputs — the filtered DataFrame,
+the filter result, the finite-window flow metrics and the element-wise empirical metrics — so
+that such runs skip straight to rendering. The DataFrame keeps its index, so a cached run sees
+the same row labels as a cold one.
+
+Entries are content addressed: the key is a hash of a fingerprint of the input file (size,
+modification time, and a hash of its first and last MiB), of the parameters that affect
+loading, filtering and metrics, and of the source of the modules that compute them. Any change
+to these gives a new key, so entries never need to be invalidated. Keys start with a hash of the
+input path and the parameters (without the file fingerprint), so when an input that grows every
+day is stored again, the entries of its earlier versions are removed. The cache also keeps at
+most `max_entries` entries, evicting the least recently used. Each entry is a single compressed `.npz` file of plain arrays plus JSON
+metadata, read back without pickle.
+
+Cached metrics do not carry their source events or sample path state, which rendering does not use.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from spath.filter import FilterResult
+from spath.metrics import ElementWiseEmpiricalMetrics, FlowMetricsResult
+
+CACHE_VERSION = 2
+
+_SAMPLE_BYTES = 1 << 20
+DEFAULT_MAX_ENTRIES = 32
+# The modules whose code decides the cached outputs: a change to any of them changes every key
+_CODE_MODULES = ("csv_loader.py", "filter.py", "metrics.py", "point_process.py", "cache.py")
+_SERIES = ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures")
+
+
+@dataclass
+class CachedAnalysis:
+    """The outputs of loading, filtering and metric computation for one input and parameter set."""
+    df: pd.DataFrame
+    filter_result: FilterResult
+    metrics: FlowMetricsResult
+    empirical_metrics: ElementWiseEmpiricalMetrics
+
+
+def input_fingerprint(path: str | Path, sample_bytes: int = _SAMPLE_BYTES) -> str:
+    """A fingerprint of a file from its size, modification time, and a hash of its first and last bytes."""
+    path = Path(path)
+    st = path.stat()
+    h = hashlib.sha256(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    with path.open("rb") as f:
+        h.update(f.read(sample_bytes))
+        if st.st_size > sample_bytes:
+            f.seek(max(sample_bytes, st.st_size - sample_bytes))
+            h.update(f.read(sample_bytes))
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """A hash of the source of the modules that load, filter and compute the cached outputs."""
+    h = hashlib.sha256()
+    for name in _CODE_MODULES:
+        h.update(name.encode())
+        h.update((Path(__file__).parent / name).read_bytes())
+    return h.hexdigest()
+
+
+def cache_key(path: str | Path, params: Dict[str, Any]) -> str:
+    """The cache key for an input file, the parameters its outputs depend on, and the code that computes them."""
+    source = json.dumps({"version": CACHE_VERSION, "code": code_fingerprint(),
+                         "path": os.path.abspath(path), "params": params}, sort_keys=True, default=str)
+    content = json.dumps({"source": source, "input": input_fingerprint(path)})
+    # "<source>-<content>": entries for other versions of the same input share the prefix
+    return f"{hashlib.sha256(source.encode()).hexdigest()[:16]}-{hashlib.sha256(content.encode()).hexdigest()}"
+
+
+# ---------- encoding ----------
+
+def _encode_column(name: str, s: pd.Series, arrays: Dict[str, np.ndarray],
+                   prefix: Optional[str] = None) -> Dict[str, Any]:
+    prefix = prefix or f"df.{name}"
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        arrays[prefix] = s.cat.codes.to_numpy()
+        arrays[prefix + ".categories"] = np.asarray(s.cat.categories.astype(str), dtype=str)
+        return {"name": name, "kind": "category", "prefix": prefix}
+    if isinstance(s.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(s.dtype):
+        arrays[prefix] = pd.DatetimeIndex(s).asi8
+        tz = getattr(s.dtype, "tz", None)
+        return {"name": name, "kind": "datetime", "tz": None if tz is None else str(tz), "prefix": prefix}
+    if pd.api.types.is_timedelta64_dtype(s.dtype):
+        arrays[prefix] = pd.TimedeltaIndex(s).asi8
+        return {"name": name, "kind": "timedelta", "prefix": prefix}
+    if pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_bool_dtype(s.dtype):
+        arrays[prefix] = s.to_numpy()
+        return {"name": name, "kind": "numeric", "prefix": prefix}
+    arrays[prefix] = np.asarray(s.astype(str), dtype=str)
+    arrays[prefix + ".na"] = s.isna().to_numpy()
+    return {"name": name, "kind": "string", "prefix": prefix}
+
+
+def _decode_column(spec: Dict[str, Any], arrays) -> pd.Series:
+    prefix = spec["prefix"]
+    kind = spec["kind"]
+    if kind == "category":
+        values = pd.Categorical.from_codes(arrays[prefix], categories=arrays[prefix + ".categories"])
+    elif kind == "datetime":
+        values = pd.to_datetime(arrays[prefix], utc=spec["tz"] is not None)
+        if spec["tz"] is not None:
+            values = values.tz_convert(spec["tz"])
+    elif kind == "timedelta":
+        values = pd.to_timedelta(arrays[prefix])
+    elif kind == "numeric":
+        values = arrays[prefix]
+    else:
+        values = arrays[prefix].astype(object)
+        values[arrays[prefix + ".na"]] = None
+    return pd.Series(values, name=spec["name"])
+
+
+def _encode_index(index: pd.Index, arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    name = None if index.name is None else str(index.name)
+    if isinstance(index, pd.RangeIndex):
+        return {"name": name, "kind": "range", "start": index.start, "stop": index.stop, "step": index.step}
+    return dict(_encode_column("index", pd.Series(index), arrays, prefix="index"), name=name)
+
+
+def _decode_index(spec: Dict[str, Any], arrays) -> pd.Index:
+    if spec["kind"] == "range":
+        return pd.RangeIndex(spec["start"], spec["stop"], spec["step"], name=spec["name"])
+    return pd.Index(_decode_column(spec, arrays), name=spec["name"])
+
+
+def _ts(t) -> Optional[int]:
+    return None if pd.isna(t) else int(pd.Timestamp(t).value)
+
+
+def _from_ts(v: Optional[int], tz: Optional[str]):
+    if v is None:
+        return pd.NaT
+    t = pd.Timestamp(v, tz="UTC")
+    return t.tz_convert(tz) if tz is not None else t.tz_localize(None)
+
+
+class MetricsCache:
+    """
+    A directory of cached analyses, one `.npz` file per key, holding at most `max_entries` of them
+    (None for no bound).
+    """
+
+    def __init__(self, cache_dir: str | Path, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def store(self, key: str, entry: CachedAnalysis) -> Path:
+        arrays: Dict[str, np.ndarray] = {}
+        columns = [_encode_column(str(name), entry.df[name], arrays) for name in entry.df.columns]
+
+        m = entry.metrics
+        times = pd.DatetimeIndex(m.times)
+        arrays["metrics.times"] = times.asi8
+        for name in _SERIES:
+            arrays[f"metrics.{name}"] = np.asarray(getattr(m, name), dtype=float)
+        if m.R is not None:
+            arrays["metrics.R"] = np.asarray(m.R, dtype=float)
+        arrays["empirical.W_star"] = np.asarray(entry.empirical_metrics.W_star, dtype=float)
+        arrays["empirical.lam_star"] = np.asarray(entry.empirical_metrics.lam_star, dtype=float)
+
+        fr = entry.filter_result
+        meta = {
+            "version": CACHE_VERSION,
+            "columns": columns,
+            "index": _encode_index(entry.df.index, arrays),
+            "metrics": {
+                "mode": m.mode, "freq": m.freq, "t0": _ts(m.t0), "tn": _ts(m.tn),
+                "tz": None if times.tz is None else str(times.tz),
+            },
+            "filter": {
+                "applied": fr.applied,
+                "dropped_per_filter": fr.dropped_per_filter,
+                "thresholds": {k: float(v) for k, v in fr.thresholds.items()},
+                "label": fr.label,
+            },
+        }
+        arrays["meta"] = np.asarray(json.dumps(meta))
+
+        # Write to a temporary file and rename, so concurrent runs never see a partial entry.
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._prune(key)
+        return path
+
+    def _prune(self, key: str) -> None:
+        # Drop the entries this one supersedes (same source, other input fingerprint), then the
+        # least recently used ones beyond max_entries. Entries removed by a concurrent run are skipped.
+        source, sep, _ = key.partition("-")
+        entries = [p for p in self.cache_dir.glob("*.npz") if p.stem != key]
+        if sep:
+            for p in [p for p in entries if p.stem.startswith(source + "-")]:
+                p.unlink(missing_ok=True)
+                entries.remove(p)
+        if self.max_entries is not None and len(entries) + 1 > self.max_entries:
+            def last_used(p: Path) -> float:
+                try:
+                    return p.stat().st_mtime
+                except FileNotFoundError:
+                    return 0.0
+            for p in sorted(entries, key=last_used)[:len(entries) + 1 - self.max_entries]:
+                p.unlink(missing_ok=True)
+
+    def load(self, key: str) -> Optional[CachedAnalysis]:
+        """The cached analysis for `key`, or None if there is none (or it cannot be read)."""
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+            with np.load(path, allow_pickle=False) as arrays:
+                meta = json.loads(str(arrays["meta"]))
+                if meta.get("version") != CACHE_VERSION:
+                    return None
+                df = pd.DataFrame({spec["name"]: _decode_column(spec, arrays) for spec in meta["columns"]})
+                df.index = _decode_index(meta["index"], arrays)
+
+                mm = meta["metrics"]
+                tz = mm["tz"]
+                times = pd.to_datetime(arrays["metrics.times"], utc=tz is not None)
+                if tz is not None:
+                    times = times.tz_convert(tz)
+                series = {name: arrays[f"metrics.{name}"] for name in _SERIES}
+                metrics = FlowMetricsResult(
+                    events=[],
+                    times=times,
+                    mode=mm["mode"],
+                    freq=mm["freq"],
+                    t0=_from_ts(mm["t0"], tz),
+                    tn=_from_ts(mm["tn"], tz),
+                    R=arrays["metrics.R"] if "metrics.R" in arrays.files else None,
+                    **series,
+                )
+                empirical = ElementWiseEmpiricalMetrics(
+                    times=times,
+                    W_star=arrays["empirical.W_star"],
+                    lam_star=arrays["empirical.lam_star"],
+                )
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+
+        f = meta["filter"]
+        filter_result = FilterResult(
+            df=df,
+            applied=f["applied"],
+            dropped_per_filter=f["dropped_per_filter"],
+            thresholds=f["thresholds"],
+            label=f["label"],
+        )
+        return CachedAnalysis(df=df, filter_result=filter_result, metrics=metrics, empirical_metrics=empirical)
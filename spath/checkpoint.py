@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Checkpoints for append-only inputs.
+
+Item logs are often exported daily, and each export only adds to the previous one: new items
+arrive and open items end. Rather than recomputing the whole sample path from t0 for every
+export, a run can save a checkpoint of its finite-window flow metrics: the series so far, the
+sweep state at the end of the series, the keys of the items that were still open, and the number
+and a digest of the items already seen. The next run derives only the new events from its export and extends the
+series from the saved state. An export that adds or drops items starting before the end of the
+saved series (a backfill) is not append-only, and its metrics are recomputed from scratch.
+
+Checkpoints are JSON files. The source events of the metrics are not saved, so a result loaded
+from a checkpoint has an empty `events` list.
+
+A checkpoint can also carry a quantile sketch of the completed durations (see `spath.sketch`).
+`compute_flow_metrics_incrementally` keeps it up to date with the items that completed since the
+checkpoint, so duration percentiles (e.g. for the outlier filters) can be read from it without
+the full history of durations.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from spath.metrics import FlowMetricsResult, SamplePathState, compute_finite_window_flow_metrics
+from spath.point_process import (
+    items_seen,
+    items_seen_digest,
+    open_items,
+    to_arrival_departure_process,
+    to_incremental_arrival_departure_process,
+)
+from spath.sketch import QuantileSketch
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class Checkpoint:
+    metrics: FlowMetricsResult
+    open_keys: List[Tuple[str, pd.Timestamp]]
+    params: Dict[str, Any] = field(default_factory=dict)
+    duration_sketch: Optional[QuantileSketch] = None
+    seen_items: Optional[int] = None
+    seen_digest: Optional[str] = None
+
+
+def _ts_to_json(t) -> Optional[str]:
+    return None if pd.isna(t) else pd.Timestamp(t).isoformat()
+
+
+def _ts_from_json(s: Optional[str]):
+    return pd.NaT if s is None else pd.Timestamp(s)
+
+
+def _array_to_json(a: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(v) else float(v) for v in np.asarray(a, dtype=float)]
+
+
+def _array_from_json(values: List[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def save_checkpoint(path: str | Path,
+                    metrics: FlowMetricsResult,
+                    open_keys: List[Tuple[str, pd.Timestamp]],
+                    params: Optional[Dict[str, Any]] = None,
+                    duration_sketch: Optional[QuantileSketch] = None,
+                    seen_items: Optional[int] = None,
+                    seen_digest: Optional[str] = None) -> Path:
+    """
+    Write `metrics` (which must carry a sweep state) and the open item keys to a JSON checkpoint.
+
+    `params` records the settings the metrics were computed with; `load_checkpoint` returns
+    them so that callers can refuse to resume under different settings. `duration_sketch`,
+    if given, is saved with them. `seen_items` and `seen_digest` are the number and the digest of
+    the items of the export that start at or before the watermark of the metrics (see `items_seen`
+    and `items_seen_digest`); `compute_flow_metrics_incrementally` only resumes from checkpoints
+    that record them.
+    """
+    if metrics.state is None:
+        raise ValueError("Only cumulative flow metrics with a sample path state can be checkpointed")
+    state = metrics.state
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "params": params or {},
+        "mode": metrics.mode,
+        "freq": metrics.freq,
+        "t0": _ts_to_json(metrics.t0),
+        "tn": _ts_to_json(metrics.tn),
+        "series": {
+            "times": [_ts_to_json(t) for t in metrics.times],
+            **{name: _array_to_json(getattr(metrics, name))
+               for name in ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures")},
+        },
+        "state": {
+            "t0": _ts_to_json(state.t0),
+            "last_time": _ts_to_json(state.last_time),
+            "N": state.N,
+            "A": state.A,
+            "arrivals": state.arrivals,
+            "departures": state.departures,
+            "watermark": _ts_to_json(state.watermark),
+            "pending": [[_ts_to_json(t), int(dN), int(a)] for (t, dN, a) in state.pending],
+        },
+        "open_items": [[item_id, _ts_to_json(start)] for item_id, start in open_keys],
+        "seen_items": seen_items,
+        "seen_digest": seen_digest,
+    }
+    if duration_sketch is not None:
+        payload["duration_sketch"] = duration_sketch.to_dict()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+    return path
+
+
+def load_checkpoint(path: str | Path) -> Checkpoint:
+    """Read a checkpoint written by `save_checkpoint`."""
+    payload = json.loads(Path(path).read_text())
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {payload.get('version')!r} in {path}")
+
+    s = payload["state"]
+    state = SamplePathState(
+        t0=_ts_from_json(s["t0"]),
+        last_time=_ts_from_json(s["last_time"]),
+        N=s["N"],
+        A=s["A"],
+        arrivals=s["arrivals"],
+        departures=s["departures"],
+        watermark=_ts_from_json(s["watermark"]),
+        pending=[(_ts_from_json(t), dN, a) for t, dN, a in s["pending"]],
+    )
+    series = payload["series"]
+    metrics = FlowMetricsResult(
+        events=[],
+        times=[_ts_from_json(t) for t in series["times"]],
+        L=_array_from_json(series["L"]),
+        Lambda=_array_from_json(series["Lambda"]),
+        w=_array_from_json(series["w"]),
+        N=_array_from_json(series["N"]),
+        A=_array_from_json(series["A"]),
+        Arrivals=_array_from_json(series["Arrivals"]),
+        Departures=_array_from_json(series["Departures"]),
+        mode=payload["mode"],
+        freq=payload["freq"],
+        t0=_ts_from_json(payload["t0"]),
+        tn=_ts_from_json(payload["tn"]),
+        state=state,
+    )
+    open_keys = [(item_id, _ts_from_json(start)) for item_id, start in payload["open_items"]]
+    sketch = payload.get("duration_sketch")
+    return Checkpoint(metrics=metrics, open_keys=open_keys, params=payload["params"],
+                      duration_sketch=None if sketch is None else QuantileSketch.from_dict(sketch),
+                      seen_items=payload.get("seen_items"), seen_digest=payload.get("seen_digest"))
+
+
+def _completed_durations(df: pd.DataFrame, since=None) -> np.ndarray:
+    # Durations in hours of the items in df that completed (after `since`, if given)
+    done = df["end_ts"].notna()
+    if since is not None and not pd.isna(since):
+        done &= df["end_ts"] > since
+    return ((df.loc[done, "end_ts"] - df.loc[done, "start_ts"]).dt.total_seconds() / 3600.0).to_numpy()
+
+
+def compute_flow_metrics_incrementally(
+    df: pd.DataFrame,
+    checkpoint_path: str | Path,
+    params: Optional[Dict[str, Any]] = None,
+    freq: Optional[str] = None,
+    sketch_k: int = 200,
+) -> Tuple[FlowMetricsResult, bool]:
+    """
+    Finite-window flow metrics for `df`, resumed from the checkpoint at `checkpoint_path` if possible.
+
+    The metrics are resumed when the checkpoint exists, was saved with the same `params` and `freq`,
+    and `df` only adds to the export it was saved from: it has the same items starting up to the end
+    of the saved series (checked by their number, then by a digest), and the items open then have not
+    ended before it. Otherwise they
+    are recomputed from all of `df`.
+    Either way, a new checkpoint is saved at `checkpoint_path`, together with a quantile sketch of
+    the completed durations (of size `sketch_k`) that is updated with the items completed since
+    the checkpoint.
+
+    Returns
+    -------
+    (metrics, resumed)
+    """
+    params = dict(params or {}, freq=freq)
+    metrics: Optional[FlowMetricsResult] = None
+    keys: List[Tuple[str, pd.Timestamp]] = []
+    sketch: Optional[QuantileSketch] = None
+
+    checkpoint_path = Path(checkpoint_path)
+    if checkpoint_path.exists():
+        try:
+            checkpoint = load_checkpoint(checkpoint_path)
+            recorded = checkpoint.seen_items is not None and checkpoint.seen_digest is not None
+            if checkpoint.params == json.loads(json.dumps(params)) and recorded:
+                since = checkpoint.metrics.state.watermark
+                events, keys = to_incremental_arrival_departure_process(
+                    df, since, checkpoint.open_keys, seen=checkpoint.seen_items, seen_digest=checkpoint.seen_digest
+                )
+                metrics = checkpoint.metrics.extend(events)
+                if checkpoint.duration_sketch is not None:
+                    sketch = checkpoint.duration_sketch.update(_completed_durations(df, since))
+        except (ValueError, KeyError):
+            metrics = None
+            sketch = None
+
+    resumed = metrics is not None
+    if metrics is None:
+        metrics = compute_finite_window_flow_metrics(to_arrival_departure_process(df), freq=freq)
+        keys = open_items(df)
+    if sketch is None:
+        sketch = QuantileSketch.from_values(_completed_durations(df), k=sketch_k)
+
+    if metrics.state is not None:
+        watermark = metrics.state.watermark
+        save_checkpoint(checkpoint_path, metrics, keys, params, duration_sketch=sketch,
+                        seen_items=items_seen(df, watermark), seen_digest=items_seen_digest(df, watermark))
+    return metrics, resumed
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Per-class flow metrics from a single load.
+
+The `--classes` filter narrows an analysis to one subset of classes per run, so comparing
+classes used to take one full CLI run per class. This module groups the (already loaded and
+filtered) DataFrame by its class column once, builds the arrival/departure process for each
+class, and runs `compute_finite_window_flow_metrics` for every class, optionally in a process pool.
+
+By default all classes share the observation window of the whole data set, so their metrics
+are directly comparable and can be drawn on common axes.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from spath.filter import class_keys
+from spath.metrics import (
+    FlowMetricsResult,
+    ElementWiseEmpiricalMetrics,
+    compute_finite_window_flow_metrics,
+    compute_elementwise_empirical_metrics,
+)
+from spath.point_process import to_arrival_departure_process
+
+
+@dataclass
+class ClassMetrics:
+    """Flow metrics for the items of one class."""
+    name: str
+    df: pd.DataFrame
+    metrics: FlowMetricsResult
+    empirical_metrics: ElementWiseEmpiricalMetrics
+
+    @property
+    def count(self) -> int:
+        return len(self.df)
+
+
+def _class_metrics(
+    name: str,
+    df: pd.DataFrame,
+    freq: Optional[str],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+) -> ClassMetrics:
+    events = to_arrival_departure_process(df)
+    metrics = compute_finite_window_flow_metrics(events, freq=freq, start=start, end=end)
+    empirical = compute_elementwise_empirical_metrics(df, metrics.times)
+    return ClassMetrics(name=name, df=df, metrics=metrics, empirical_metrics=empirical)
+
+
+def compute_class_metrics(
+    df: pd.DataFrame,
+    class_column: str = "class",
+    freq: Optional[str] = None,
+    common_window: bool = True,
+    jobs: int = 1,
+) -> Dict[str, ClassMetrics]:
+    """
+    Compute finite-window flow metrics for every class in `df`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Loaded and filtered items with start_ts, end_ts and a class column.
+    class_column : str
+        The column holding the class tag.
+    freq : str | None
+        Passed to `compute_finite_window_flow_metrics`: None for event mode, or a calendar frequency.
+    common_window : bool
+        If True, every class is observed over the window of the whole data set
+        [first start, last start or end]. Otherwise each class uses its own window.
+    jobs : int
+        Number of worker processes. 1 computes the classes sequentially in this process.
+
+    Returns
+    -------
+    Dict[str, ClassMetrics]
+        Results keyed by class name, ordered by class name. Classes with no items are omitted.
+    """
+    if class_column not in df.columns:
+        raise ValueError(f"Per-class metrics require a '{class_column}' column")
+
+    start = end = None
+    if common_window and len(df) > 0:
+        start = df["start_ts"].min()
+        end = pd.concat([df["start_ts"], df["end_ts"]]).max()
+
+    # One pass over the data: every class becomes one group. Classes are matched as the class
+    # filter matches them (case-insensitively), so "Bug" and "bug" are one class, "bug".
+    groups = [
+        (str(name), group)
+        for name, group in df.groupby(class_keys(df[class_column]), sort=True)
+        if len(group) > 0
+    ]
+
+    if jobs <= 1 or len(groups) <= 1:
+        results: List[ClassMetrics] = [_class_metrics(name, group, freq, start, end) for name, group in groups]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_class_metrics, name, group, freq, start, end) for name, group in groups]
+            results = [f.result() for f in futures]
+
+    return {r.name: r for r in results}
+
+
+def class_metrics_table(results: Dict[str, ClassMetrics]) -> pd.DataFrame:
+    """
+    Tidy table of per-class metrics: one row per (class, observation time) with columns
+    class, time, L, Lambda, w, N, A, Arrivals, Departures, W_star, lam_star.
+    """
+    frames = []
+    for name, r in results.items():
+        frame = r.metrics.to_dataframe()
+        frame.insert(0, "class", name)
+        frame["W_star"] = r.empirical_metrics.W_star
+        frame["lam_star"] = r.empirical_metrics.lam_star
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(
+            columns=["class", "time", "L", "Lambda", "w", "N", "A", "Arrivals", "Departures", "W_star", "lam_star"]
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def class_summary_table(results: Dict[str, ClassMetrics]) -> pd.DataFrame:
+    """One row per class with the item count and the metrics at the end of the window."""
+    rows = []
+    for name, r in results.items():
+        m = r.metrics
+        last = len(m.times) - 1
+        rows.append({
+            "class": name,
+            "items": r.count,
+            "t0": m.t0,
+            "tn": m.tn,
+            "L": m.L[last] if last >= 0 else float("nan"),
+            "Lambda": m.Lambda[last] if last >= 0 else float("nan"),
+            "w": m.w[last] if last >= 0 else float("nan"),
+            "Arrivals": m.Arrivals[last] if last >= 0 else float("nan"),
+            "Departures": m.Departures[last] if last >= 0 else float("nan"),
+        })
+    return pd.DataFrame(rows, columns=["class", "items", "t0", "tn", "L", "Lambda", "w", "Arrivals", "Departures"])
+
+
+def write_class_tables(results: Dict[str, ClassMetrics], out_dir: str) -> List[str]:
+    """Write the per-class metric and summary tables as CSV files under <out_dir>/classes."""
+    if not results:
+        return []
+    class_dir = os.path.join(out_dir, 'classes')
+    os.makedirs(class_dir, exist_ok=True)
+
+    table_path = os.path.join(class_dir, 'class_metrics.csv')
+    class_metrics_table(results).to_csv(table_path, index=False)
+
+    summary_path = os.path.join(class_dir, 'class_summary.csv')
+    class_summary_table(results).to_csv(summary_path, index=False)
+    return [table_path, summary_path]
@@ -3,6 +3,9 @@ import argparse
 import sys
 from pathlib import Path
 
+# The options that change how the CSV is parsed, and so the loaded timestamps
+LOAD_OPTIONS = ("date_format", "delimiter", "dayfirst")
+
 def validate_args(args):
     error = False
 
@@ -13,7 +16,7 @@ def validate_args(args):
         sys.exit(1)
 
 
-def parse_args():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Sample Path Analysis with Little's Law")
     # -- CSV Parsing --- #
     parser.add_argument("csv", type=str,
@@ -32,6 +35,11 @@ def parse_args():
 
     parser.add_argument("--classes", type=str, default=None,
                         help="Comma-separated list of class tags to include (requires a 'class' column)")
+    parser.add_argument("--by-class", action="store_true", default=False,
+                        help="Also compute flow metrics for each class separately and write per-class tables and "
+                             "faceted charts under the classes subdirectory (requires a 'class' column)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes used to compute per-class metrics with --by-class (default 1)")
 
     # - Outlier trimming --#
     parser.add_argument("--outlier-hours", type=float, default=None,
@@ -51,6 +59,17 @@ def parse_args():
     parser.add_argument("--lambda-warmup", type=float, default=0.0,
                         help="Ignore the first H hours when computing Λ(T) percentiles")
 
+    parser.add_argument("--max-plot-points", type=int, default=4000,
+                        help="Downsample plotted series longer than this many points, keeping their shape "
+                             "(LTTB for lines, per-pixel min/max for step plots and scatters). 0 plots every point")
+
+    parser.add_argument("--metrics-only", action="store_true", default=False,
+                        help="Write the metric series as CSV files instead of rendering charts")
+
+    # -- Trailing window metrics --#
+    parser.add_argument("--window-days", type=float, default=None,
+                        help="Also chart L, Λ and w over a trailing window of this many days at every observation time")
+
     # -- Parameters for tuning sample path convergence charts ---#
     parser.add_argument("--epsilon", type=float, default=0.05,
                         help="Relative error threshold for convergence (default 0.05)")
@@ -66,11 +85,27 @@ def parse_args():
     
     parser.add_argument("--save-input", action='store_true', default=True,
                         help="Copy the input csv to the output path (saved under input subdirectory)")
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="Path of a JSON checkpoint of the flow metrics. If it exists and the CSV only adds to the "
+                             "export it was saved from, only the new events are processed; the checkpoint is then updated")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Directory for cached loads and metrics, keyed by the input file and the data and metric "
+                             "parameters. Defaults to .spath-cache under output-dir")
+    parser.add_argument("--no-cache", action="store_true", default=False,
+                        help="Always load the CSV and compute metrics, without reading or writing the cache")
     parser.add_argument("--clean", action="store_true", default=False,
                         help="removing existing charts in output directory")
+    parser.add_argument("--timings-memory", action="store_true", default=False,
+                        help="Also record the peak memory of each stage in timings.json/timings.txt (uses tracemalloc, "
+                             "which slows allocation-heavy stages down)")
+
+    return parser
 
 
-    args = parser.parse_args()
+def parse_args(argv=None):
+    """Parse `argv` (default: the process arguments). Returns (parser, args)."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
     validate_args(args)
     return parser, args
 
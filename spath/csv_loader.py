@@ -190,8 +190,8 @@ class CSVLoader:
 
         return df
 
-    def load(self, path: str) -> pd.DataFrame:
-        # --- choose delimiter ---
+    def resolve_delimiter(self, path: str) -> str:
+        """The delimiter to read `path` with: the configured one, else the detected one, else ','."""
         sep = self.delimiter
         if sep == r"\t":  # normalize common CLI input
             sep = "\t"
@@ -209,9 +209,16 @@ class CSVLoader:
         if sep is None:
             # final fallback if nothing detected
             sep = ","
-        # --- read CSV ---
-        df = pd.read_csv(path, sep=sep)
+        return sep
+
+    def load(self, path: str) -> pd.DataFrame:
+        return self.prepare(pd.read_csv(path, sep=self.resolve_delimiter(path)))
 
+    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the DataFrame contract to raw rows (string columns as read from a CSV or NDJSON source):
+        column checks, timestamp parsing, timezone normalization, durations and the data-quality policies.
+        """
         # --- column presence checks ---
         df.columns = df.columns.str.strip()
         self.require_columns(df, self.required_columns)
@@ -12,6 +12,8 @@ from argparse import Namespace
 import numpy as np
 import pandas as pd
 
+from spath.sketch import QuantileSketch
+
 
 # ---------- Spec / Result ----------
 
@@ -26,6 +28,13 @@ class FilterSpec:
     outlier_iqr_two_sided: bool = False
     raise_on_empty_classes: bool = True
     copy_result: bool = False
+    # When set, the percentile and IQR thresholds come from this sketch of completed durations
+    # (kept up to date by the caller, e.g. per chunk) instead of from the durations in df.
+    # The sketch must cover the items the outlier filters see, so it cannot be combined with the
+    # filters that narrow them first (classes, incomplete_only, outlier_hours): build it over the
+    # filtered items instead. After outlier_pctl, the IQR quartiles are read from the sketch at
+    # the ranks they have among the durations that filter keeps.
+    duration_sketch: Optional[QuantileSketch] = None
 
 @dataclass
 class FilterResult:
@@ -46,7 +55,8 @@ def _require_cols(df: pd.DataFrame, cols: List[str]) -> None:
     if missing:
         raise ValueError(f"Missing required column(s): {missing}")
 
-def _parse_classes(s: Optional[str]) -> list[str] | None:
+def parse_classes(s: Optional[str]) -> list[str] | None:
+    """Lowercased, de-duplicated class names from a comma-separated string; None if there are none."""
     if not s:
         return None
     parts = [p.strip() for p in s.split(",")]
@@ -65,106 +75,160 @@ def _completed_base_label(spec: FilterSpec) -> str:
         return "open elements"
     return ""
 
-def _comp_mask(df: pd.DataFrame, cur_mask: pd.Series) -> pd.Series:
-    return cur_mask & df["end_ts"].notna()
+def _completed(df: pd.DataFrame) -> np.ndarray:
+    return df["end_ts"].notna().to_numpy()
+
+def _comp_mask(df: pd.DataFrame, cur_mask: np.ndarray) -> np.ndarray:
+    return cur_mask & _completed(df)
+
+def _class_predicate(col: pd.Series, wanted: List[str]) -> np.ndarray:
+    # Match the distinct class levels once and select rows by integer code, rather than
+    # lowercasing every row. CSVLoader already casts 'class' to category.
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes, levels = col.cat.codes.to_numpy(), col.cat.categories
+    else:
+        codes, levels = pd.factorize(col)
+    hits = np.flatnonzero(pd.Index(levels.astype(str)).str.lower().isin(wanted))
+    pred = np.isin(codes, hits)
+    if "nan" in wanted:
+        pred |= codes == -1  # missing classes read as "nan", as with astype(str)
+    return pred
+
+def class_keys(col: pd.Series) -> pd.Series:
+    """The class of each row as the class filter matches it: lowercased, and "nan" where missing."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes, levels = col.cat.codes.to_numpy(), col.cat.categories
+    else:
+        codes, levels = pd.factorize(col)
+    # Lowercase the distinct levels only; the appended "nan" is what code -1 (missing) selects
+    keys = np.append(pd.Index(levels.astype(str)).str.lower().to_numpy(dtype=object), "nan")
+    return pd.Series(keys[codes], index=col.index, name=col.name)
+
+def _outlier_hours_predicate(df: pd.DataFrame, hrs: float) -> np.ndarray:
+    return ~_completed(df) | (df["duration_hr"].to_numpy(dtype=float) <= hrs)
+
+def _narrow(mask: np.ndarray, pred: np.ndarray, key: str, dropped: Dict[str, int]) -> np.ndarray:
+    # AND a predicate into the mask and record the rows it drops
+    new_mask = mask & pred
+    dropped[key] = int(np.count_nonzero(mask)) - int(np.count_nonzero(new_mask))
+    return new_mask
 
 
 # ---------- Individual filter functions (mask-first) ----------
+#
+# Each filter takes the current boolean mask array and returns it narrowed.
+# run_filters threads a single numpy boolean array through all of them.
+
+def completed_duration_sketch(df: pd.DataFrame, sketch: Optional[QuantileSketch] = None,
+                              k: int = 200) -> QuantileSketch:
+    """Update `sketch` (or a new one) with the durations of the completed items in `df`."""
+    _require_cols(df, ["end_ts", "duration_hr"])
+    sketch = sketch if sketch is not None else QuantileSketch(k=k)
+    return sketch.update(df["duration_hr"].to_numpy(dtype=float)[_completed(df)])
+
+def _duration_percentiles(
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec, ps: List[float], min_count: int, kept_pctl: float = 100.0
+) -> Optional[np.ndarray]:
+    # Percentiles of the completed durations under the current mask, or of the spec's sketch.
+    # When the mask only keeps the durations up to the sketch's `kept_pctl` percentile, the
+    # percentiles of those are the sketch's at ranks scaled by kept_pctl / 100.
+    if spec.duration_sketch is not None:
+        if spec.duration_sketch.count * kept_pctl / 100.0 < min_count:
+            return None
+        return spec.duration_sketch.percentiles(np.asarray(ps, dtype=float) * kept_pctl / 100.0)
+    vals = df["duration_hr"].to_numpy(dtype=float)[np.asarray(_comp_mask(df, mask), dtype=bool)]
+    vals = vals[~np.isnan(vals)]
+    if vals.size < min_count:
+        return None
+    return np.percentile(vals, ps)
 
 def _f_completed_only(
-    df: pd.DataFrame, mask: pd.Series, spec: FilterSpec,
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec,
     applied: List[str], dropped: Dict[str, int]
-) -> pd.Series:
+) -> np.ndarray:
     if not spec.completed_only:
         return mask
     _require_cols(df, ["end_ts"])
-    new_mask = mask & df["end_ts"].notna()
-    dropped["completed_only"] = int((mask & ~new_mask).sum())
     applied.append("completed_only")
-    return new_mask
+    return _narrow(mask, _completed(df), "completed_only", dropped)
 
 def _f_incomplete_only(
-    df: pd.DataFrame, mask: pd.Series, spec: FilterSpec,
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec,
     applied: List[str], dropped: Dict[str, int]
-) -> pd.Series:
+) -> np.ndarray:
     if not spec.incomplete_only:
         return mask
     _require_cols(df, ["end_ts"])
-    new_mask = mask & df["end_ts"].isna()
-    dropped["incomplete_only"] = int((mask & ~new_mask).sum())
     applied.append("incomplete_only")
-    return new_mask
+    return _narrow(mask, ~_completed(df), "incomplete_only", dropped)
 
 def _f_classes(
-    df: pd.DataFrame, mask: pd.Series, spec: FilterSpec,
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec,
     applied: List[str], dropped: Dict[str, int]
-) -> Tuple[pd.Series, Optional[str]]:
-    norm = _parse_classes(spec.classes)
+) -> Tuple[np.ndarray, Optional[str]]:
+    norm = parse_classes(spec.classes)
     if not norm:
         return mask, None
     _require_cols(df, ["class"])
-    wanted = set(norm)
-    new_mask = mask & df["class"].astype(str).str.lower().isin(wanted)
-    if spec.raise_on_empty_classes and int(new_mask.sum()) == 0:
+    new_mask = mask & _class_predicate(df["class"], norm)
+    if spec.raise_on_empty_classes and not np.any(new_mask):
         raise ValueError(f"No rows match the requested classes: {norm}")
-    dropped["classes"] = int((mask & ~new_mask).sum())
+    dropped["classes"] = int(np.count_nonzero(mask)) - int(np.count_nonzero(new_mask))
     applied.append(f"Classes={','.join(norm)}")
     label_add = f", Classes: {','.join(norm)}"
     return new_mask, label_add
 
 def _f_outlier_hours(
-    df: pd.DataFrame, mask: pd.Series, spec: FilterSpec,
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec,
     applied: List[str], dropped: Dict[str, int], outlier_tags: List[str]
-) -> pd.Series:
+) -> np.ndarray:
     if spec.outlier_hours is None:
         return mask
     _require_cols(df, ["end_ts", "duration_hr"])
     hrs = float(spec.outlier_hours)
-    new_mask = mask & (df["end_ts"].isna() | (df["duration_hr"] <= hrs))
-    dropped_count = int((mask & ~new_mask).sum())
-    dropped["outlier_hours"] = dropped_count
+    new_mask = _narrow(mask, _outlier_hours_predicate(df, hrs), "outlier_hours", dropped)
     applied.append(f"outlier_hours<={hrs:g}h")
-    if dropped_count > 0:
+    if dropped["outlier_hours"] > 0:
         outlier_tags.append(f">{hrs:g}h")
     return new_mask
 
 def _f_outlier_pctl(
-    df: pd.DataFrame, mask: pd.Series, spec: FilterSpec,
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec,
     applied: List[str], dropped: Dict[str, int], thresholds: Dict[str, float],
     outlier_tags: List[str]
-) -> pd.Series:
+) -> np.ndarray:
     if spec.outlier_pctl is None:
         return mask
     _require_cols(df, ["end_ts", "duration_hr"])
     p = float(spec.outlier_pctl)
     if not (0.0 < p < 100.0):
         raise ValueError(f"--outlier-pctl must be between 0 and 100 (got {spec.outlier_pctl})")
-    comp = _comp_mask(df, mask)
-    if not comp.any():
+    pctl = _duration_percentiles(df, mask, spec, [p], min_count=1)
+    if pctl is None:
         return mask
-    thresh = float(np.nanpercentile(df.loc[comp, "duration_hr"].to_numpy(), p))
+    thresh = float(pctl[0])
     thresholds[f"pctl{p:g}_hr"] = thresh
-    new_mask = mask & (df["end_ts"].isna() | (df["duration_hr"] <= thresh))
-    dropped_count = int((mask & ~new_mask).sum())
-    dropped["outlier_pctl"] = dropped_count
+    new_mask = _narrow(mask, _outlier_hours_predicate(df, thresh), "outlier_pctl", dropped)
     applied.append(f"outlier_pctl<={p:g} (th={thresh:.2f}h)")
-    if dropped_count > 0:
+    if dropped["outlier_pctl"] > 0:
         outlier_tags.append(f">p{p:g} (>{thresh:.2f}h)")
     return new_mask
 
 def _f_outlier_iqr(
-    df: pd.DataFrame, mask: pd.Series, spec: FilterSpec,
+    df: pd.DataFrame, mask: np.ndarray, spec: FilterSpec,
     applied: List[str], dropped: Dict[str, int], thresholds: Dict[str, float],
     outlier_tags: List[str]
-) -> pd.Series:
+) -> np.ndarray:
     if spec.outlier_iqr is None:
         return mask
     _require_cols(df, ["end_ts", "duration_hr"])
     k = float(spec.outlier_iqr)
-    comp_vals = df.loc[_comp_mask(df, mask), "duration_hr"].dropna().to_numpy()
-    if comp_vals.size < 4:
+    # The percentile filter, if it ran, only kept the durations up to its percentile
+    kept_pctl = float(spec.outlier_pctl) if "outlier_pctl" in dropped else 100.0
+    quartiles = _duration_percentiles(df, mask, spec, [25, 75], min_count=4, kept_pctl=kept_pctl)
+    if quartiles is None:
         return mask
-    q1, q3 = np.nanpercentile(comp_vals, [25, 75])
+    q1, q3 = quartiles
     iqr = q3 - q1
     high_fence = q3 + k * iqr
     low_fence = q1 - k * iqr
@@ -174,18 +238,16 @@ def _f_outlier_iqr(
     if spec.outlier_iqr_two_sided:
         thresholds["iqr_low_hr"] = float(low_fence)
 
-    keep = df["end_ts"].isna() | (df["duration_hr"] <= high_fence)
+    keep = _outlier_hours_predicate(df, high_fence)
     if spec.outlier_iqr_two_sided:
-        keep &= df["end_ts"].isna() | (df["duration_hr"] >= low_fence)
+        keep &= ~_completed(df) | (df["duration_hr"].to_numpy(dtype=float) >= low_fence)
 
-    new_mask = mask & keep
-    dropped_count = int((mask & ~new_mask).sum())
-    dropped["outlier_iqr"] = dropped_count
+    new_mask = _narrow(mask, keep, "outlier_iqr", dropped)
     if spec.outlier_iqr_two_sided:
         applied.append(f"outlier_iqr k={k:g} two-sided")
     else:
         applied.append(f"outlier_iqr k={k:g}")
-    if dropped_count > 0:
+    if dropped["outlier_iqr"] > 0:
         outlier_tags.append(f">Q3+{k:g}·IQR (>{high_fence:.2f}h)")
         if spec.outlier_iqr_two_sided:
             outlier_tags.append(f"<Q1−{k:g}·IQR (<{low_fence:.2f}h)")
@@ -199,8 +261,17 @@ def run_filters(df: pd.DataFrame, spec: FilterSpec) -> FilterResult:
 
     if spec.completed_only and spec.incomplete_only:
         raise ValueError("--completed and --incomplete are mutually exclusive")
-
-    mask = pd.Series(True, index=df.index)
+    if spec.duration_sketch is not None:
+        narrowing = [name for name, on in (("classes", parse_classes(spec.classes)),
+                                           ("incomplete_only", spec.incomplete_only),
+                                           ("outlier_hours", spec.outlier_hours is not None)) if on]
+        if narrowing:
+            raise ValueError(f"duration_sketch cannot be combined with {', '.join(narrowing)}: "
+                             f"build the sketch over the items those filters keep")
+
+    # All filters narrow one boolean array, reading the columns they need as numpy arrays;
+    # no per-filter Series are built or aligned.
+    mask = np.ones(len(df), dtype=bool)
     applied: List[str] = []
     dropped: Dict[str, int] = {}
     thresholds: Dict[str, float] = {}
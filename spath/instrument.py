@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Stage timings for the analysis pipeline.
+
+`timed` marks a stage of a run, as a context manager or as a decorator:
+
+    with timed("filter"):
+        result = apply_filters(df, args)
+
+    @timed                       # the stage is named after the function
+    def plot_stability_charts(...): ...
+
+Stages are recorded by the active `TimingRegistry`, and cost next to nothing when no registry
+is active. Stages entered inside other stages are recorded under them (e.g.
+"charts/plot_convergence_charts/end_effects"), and a stage entered several times (a chart helper
+called once per panel) is recorded once with its number of calls and total time.
+
+With `memory=True` the registry also records the peak memory of each stage with `tracemalloc`:
+the peak of the memory allocated during the stage on top of what was allocated when it started.
+Tracing slows allocation-heavy stages down considerably, so timings taken with memory tracking
+overstate the time of those stages.
+
+The sample path analysis activates a registry for each run and writes its report to
+`timings.json` and `timings.txt` in the scenario output directory.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_active: ContextVar[Optional["TimingRegistry"]] = ContextVar("spath_timing_registry", default=None)
+
+
+@dataclass
+class StageTiming:
+    path: str
+    calls: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    peak_bytes: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def depth(self) -> int:
+        return self.path.count("/")
+
+
+class _Frame:
+    __slots__ = ("path", "start", "base_bytes", "peak_bytes")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.start = 0.0
+        self.base_bytes = 0
+        self.peak_bytes = 0
+
+
+class TimingRegistry:
+    """Wall time (and optionally peak memory) per stage of one run."""
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.stages: Dict[str, StageTiming] = {}
+        self.wall_s = 0.0
+        self._stack: List[_Frame] = []
+        self._started: Optional[float] = None
+
+    @contextmanager
+    def activate(self) -> Iterator[TimingRegistry]:
+        """Make this the registry that `timed` records into, for the duration of the block."""
+        token = _active.set(self)
+        own_tracing = self.memory and not tracemalloc.is_tracing()
+        if own_tracing:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.wall_s += time.perf_counter() - self._started
+            self._started = None
+            if own_tracing:
+                tracemalloc.stop()
+            _active.reset(token)
+
+    # ---------- recording ----------
+
+    def _fold_peak(self) -> None:
+        # tracemalloc keeps a single peak, so it is folded into every open stage and then reset
+        # at each stage boundary; each stage thus sees the peaks of its whole extent.
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame.peak_bytes = max(frame.peak_bytes, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        parent = self._stack[-1].path + "/" if self._stack else ""
+        frame = _Frame(parent + name)
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            self._fold_peak()
+            frame.base_bytes = frame.peak_bytes = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+        frame.start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame.start
+            if tracing:
+                self._fold_peak()
+            self._stack.pop()
+            timing = self.stages.get(frame.path)
+            if timing is None:
+                timing = self.stages[frame.path] = StageTiming(frame.path)
+            timing.calls += 1
+            timing.total_s += elapsed
+            timing.max_s = max(timing.max_s, elapsed)
+            if tracing:
+                timing.peak_bytes = max(timing.peak_bytes or 0, frame.peak_bytes - frame.base_bytes)
+
+    # ---------- reporting ----------
+
+    def self_time(self, timing: StageTiming) -> float:
+        """Time of a stage not spent in the stages recorded under it."""
+        prefix = timing.path + "/"
+        children = sum(t.total_s for p, t in self.stages.items()
+                       if p.startswith(prefix) and "/" not in p[len(prefix):])
+        return max(0.0, timing.total_s - children)
+
+    def _ordered(self) -> List[StageTiming]:
+        # Parents before their children, siblings in the order they were first entered
+        # (a stage is recorded when it exits, so after the stages nested in it).
+        first_seen = {path: i for i, path in enumerate(self.stages)}
+        for path in list(first_seen):
+            parts = path.split("/")
+            for k in range(1, len(parts)):
+                ancestor = "/".join(parts[:k])
+                first_seen[ancestor] = min(first_seen.get(ancestor, first_seen[path]), first_seen[path])
+
+        def key(path: str):
+            parts = path.split("/")
+            return [first_seen["/".join(parts[:k + 1])] for k in range(len(parts))]
+
+        return [self.stages[p] for p in sorted(self.stages, key=key)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = self.wall_s + (time.perf_counter() - self._started if self._started is not None else 0.0)
+        return {
+            "wall_s": wall,
+            "memory": self.memory,
+            "stages": [
+                {**asdict(t), "name": t.name, "depth": t.depth, "self_s": self.self_time(t),
+                 "share": t.total_s / wall if wall > 0 else None}
+                for t in self._ordered()
+            ],
+        }
+
+    def format_table(self) -> str:
+        report = self.to_dict()
+        header = f"{'stage':<56} {'calls':>6} {'total':>9} {'self':>9} {'share':>7}"
+        if self.memory:
+            header += f" {'peak mem':>10}"
+        lines = [header, "-" * len(header)]
+        for s in report["stages"]:
+            label = "  " * s["depth"] + s["name"]
+            share = f"{s['share'] * 100:6.1f}%" if s["share"] is not None else "      -"
+            line = f"{label:<56} {s['calls']:>6} {s['total_s']:>8.3f}s {s['self_s']:>8.3f}s {share:>7}"
+            if self.memory:
+                peak = s["peak_bytes"]
+                line += f" {'-' if peak is None else f'{peak / 2 ** 20:.1f} MiB':>10}"
+            lines.append(line)
+        lines.append("-" * len(header))
+        lines.append(f"{'wall time':<56} {'':>6} {report['wall_s']:>8.3f}s")
+        return "\n".join(lines)
+
+    def write(self, out_dir: str, name: str = "timings") -> List[str]:
+        """Write the report to `<name>.json` and `<name>.txt` in `out_dir`; returns the paths."""
+        json_path = os.path.join(out_dir, f"{name}.json")
+        txt_path = os.path.join(out_dir, f"{name}.txt")
+        with open(json_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(txt_path, "w") as f:
+            f.write(self.format_table() + "\n")
+        return [json_path, txt_path]
+
+
+def current_registry() -> Optional[TimingRegistry]:
+    return _active.get()
+
+
+class _Timed:
+    __slots__ = ("name", "_cm")
+
+    def __init__(self, name: Optional[str]):
+        self.name = name
+        self._cm = None
+
+    def __enter__(self) -> _Timed:
+        registry = _active.get()
+        if registry is not None:
+            self._cm = registry.stage(self.name or "stage")
+            self._cm.__enter__()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        cm, self._cm = self._cm, None
+        return bool(cm.__exit__(*exc)) if cm is not None else False
+
+    def __call__(self, func: Callable) -> Callable:
+        return _decorate(func, self.name or func.__name__)
+
+
+def timed(name: Optional[str] | Callable = None):
+    """
+    Record a stage in the active registry: `with timed("name"):`, `@timed("name")` or `@timed`
+    (named after the function). Does nothing when no registry is active.
+    """
+    if callable(name):
+        return _decorate(name, name.__name__)
+    return _Timed(name)
+
+
+def _decorate(func: Callable, name: str) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        registry = _active.get()
+        if registry is None:
+            return func(*args, **kwargs)
+        with registry.stage(name):
+            return func(*args, **kwargs)
+
+    return wrapper
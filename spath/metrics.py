@@ -1,10 +1,21 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Optional, Literal
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import List, Sequence, Tuple, Optional, Literal
 import numpy as np
 import pandas as pd
 from pandas._libs.tslibs.nattype import NaTType
 
+
+def elapsed_hours(times: Sequence[pd.Timestamp], t0: Optional[pd.Timestamp] = None) -> np.ndarray:
+    """Hours from t0 (default: the first time) to each of `times`, as a float64 array."""
+    times_ns = pd.DatetimeIndex(times).asi8
+    if len(times_ns) == 0:
+        return np.zeros(0, dtype=float)
+    t0_ns = times_ns[0] if t0 is None or pd.isna(t0) else pd.Timestamp(t0).value
+    return (times_ns - t0_ns) / 3.6e12
+
+
 # ---------- Core sample path flow metrics construction ----------
 
 @dataclass
@@ -17,8 +28,9 @@ class FlowMetricsResult:
     events : list[(Timestamp, int, int)]
         The (prepped) source events used for computation. If a driver zeroed-out
         arrivals prior to t0, those prepped events are stored here.
-    times : list[pd.Timestamp]
-        Observation times in ascending order (report points).
+    times : pd.DatetimeIndex
+        Observation times in ascending order (report points), stored as datetime64[ns] (with the
+        time zone of the input, if any). Lists of timestamps passed in are converted.
     L : np.ndarray                # processes
     Lambda : np.ndarray           # processes/hour
     w : np.ndarray                # hours (finite-window average residence contribution per arrival)
@@ -34,14 +46,34 @@ class FlowMetricsResult:
         Start of the finite reporting window (first observation time).
     tn : pd.Timestamp
         End of the finite reporting window (last observation time).
+    window : pd.Timedelta | None
+        None for cumulative metrics anchored at t0. For sliding-window metrics, the length Δ of
+        the trailing window (T - Δ, T] over which A, Arrivals and Departures are measured.
+    R : np.ndarray | None
+        Total age R(T) in hours of the items active at each T, measured from max(start, t0).
+        It needs the items rather than the events, so it is attached by `with_total_active_age`.
+    state : SamplePathState | None
+        Sweep state at tn for cumulative metrics, used by `extend`.
+
+    Properties
+    ----------
+    elapsed_hours : np.ndarray
+        Hours from t0 to each observation time (float64), computed once and cached.
 
     Methods
     -------
     to_dataframe() -> pd.DataFrame
-        Tabular view with columns: time, L, Lambda, w, N, A, Arrivals, Departures.
+        Tabular view with columns: time, L, Lambda, w, N, A, Arrivals, Departures (and R, if attached).
+    with_total_active_age(df) -> FlowMetricsResult
+        The result with R(T) computed from the items in `df`.
+    to_bucket_dataframe() -> pd.DataFrame
+        Per-bucket view between consecutive observation times (e.g. per calendar day), with the
+        differenced Arrivals, Departures and area A, the average N over the bucket, and N at its end.
+    extend(events) -> FlowMetricsResult
+        The result for the events so far plus later `events`, computed from the sweep state.
     """
     events: List[Tuple[pd.Timestamp, int, int]]
-    times: List[pd.Timestamp]
+    times: pd.DatetimeIndex
     L: np.ndarray
     Lambda: np.ndarray
     w: np.ndarray
@@ -53,21 +85,106 @@ class FlowMetricsResult:
     freq: Optional[str]
     t0: pd.Timestamp | NaTType = pd.NaT
     tn: pd.Timestamp | NaTType = pd.NaT
+    window: Optional[pd.Timedelta] = None
+    R: Optional[np.ndarray] = field(default=None, repr=False)
+    state: Optional[SamplePathState] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if not isinstance(self.times, pd.DatetimeIndex):
+            self.times = pd.DatetimeIndex(self.times)
+
+    @cached_property
+    def elapsed_hours(self) -> np.ndarray:
+        return elapsed_hours(self.times, self.t0)
 
     def to_dataframe(self) -> pd.DataFrame:
+        columns = {
+            "time": self.times,
+            "L": self.L,
+            "Lambda": self.Lambda,
+            "w": self.w,
+            "N": self.N,
+            "A": self.A,
+            "Arrivals": self.Arrivals,
+            "Departures": self.Departures,
+        }
+        if self.R is not None:
+            columns["R"] = self.R
+        return pd.DataFrame(columns)
+
+    def to_bucket_dataframe(self) -> pd.DataFrame:
+        if self.window is not None:
+            raise ValueError("Sliding-window metrics are not cumulative and cannot be differenced into buckets")
+        A = np.diff(self.A)
+        dt_h = np.diff(self.elapsed_hours)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            L = np.where(dt_h > 0, A / dt_h, np.nan)
         return pd.DataFrame(
             {
-                "time": self.times,
-                "L": self.L,
-                "Lambda": self.Lambda,
-                "w": self.w,
-                "N": self.N,
-                "A": self.A,
-                "Arrivals": self.Arrivals,
-                "Departures": self.Departures,
+                "start": self.times[:-1],
+                "end": self.times[1:],
+                "Arrivals": np.diff(self.Arrivals),
+                "Departures": np.diff(self.Departures),
+                "A": A,
+                "L": L,
+                "N": self.N[1:],
             }
         )
 
+    def with_total_active_age(self, df: pd.DataFrame) -> FlowMetricsResult:
+        """The result with R(T) computed from the items (start_ts, end_ts) in `df` at `times`."""
+        return replace(self, R=compute_total_active_age_series(df, self.times, t0=self.t0))
+
+    def extend(self, events: List[Tuple[pd.Timestamp, int, int]]) -> FlowMetricsResult:
+        """
+        Extend the series with events that occur after all the events already processed.
+
+        Only the new events (and any events after tn that were held back, e.g. past the last
+        calendar boundary) are swept, so the cost is proportional to the new events. The result is
+        the same as recomputing the metrics from all events with the same schedule: new event
+        times in event mode, new calendar boundaries up to the last event in calendar mode.
+
+        Raises ValueError if the result has no sweep state (e.g. sliding-window results), or if
+        an event is not strictly later than both tn and the latest event already processed.
+        """
+        state = self.state
+        if state is None:
+            raise ValueError("This result has no sample path state to extend")
+        events = sorted(events, key=lambda e: e[0])
+        processed_until = state.last_time if pd.isna(state.watermark) else max(state.last_time, state.watermark)
+        if events and events[0][0] <= processed_until:
+            raise ValueError(
+                f"Cannot extend with an event at {events[0][0]}: "
+                f"events up to {processed_until} have already been processed"
+            )
+        pending = state.pending + events
+        if not pending:
+            return self
+
+        if self.mode == "event":
+            obs = list(dict.fromkeys(pd.Timestamp(t) for (t, _, _) in pending if t > state.last_time))
+        else:
+            off = pd.tseries.frequencies.to_offset(self.freq)
+            obs = list(pd.date_range(start=state.last_time + off, end=pending[-1][0], freq=self.freq))
+
+        outputs, new_state, _ = _sweep_sample_path(pending, obs, self.t0, state)
+        L, Lam, w, N, A, Arr, Dep = outputs
+        return replace(
+            self,
+            events=self.events + events,
+            times=self.times.append(pd.DatetimeIndex(obs)) if obs else self.times,
+            L=np.concatenate([self.L, L]),
+            Lambda=np.concatenate([self.Lambda, Lam]),
+            w=np.concatenate([self.w, w]),
+            N=np.concatenate([self.N, N]),
+            A=np.concatenate([self.A, A]),
+            Arrivals=np.concatenate([self.Arrivals, Arr]),
+            Departures=np.concatenate([self.Departures, Dep]),
+            tn=obs[-1] if obs else self.tn,
+            R=None,  # needs the items; re-attach with with_total_active_age
+            state=new_state,
+        )
+
 #--- Core Metrics Calculations
 def compute_sample_path_metrics(
     events: List[Tuple[pd.Timestamp, int, int]],
@@ -123,12 +240,54 @@ def compute_sample_path_metrics(
     T = sorted(sample_times)
     t0 = T[0]
 
-    # Running state
-    N = 0
-    A = 0.0
-    cum_arr = 0
-    cum_dep = 0
-    prev = t0
+    outputs, _, _ = _sweep_sample_path(events, T, t0, SamplePathState(t0=t0, last_time=t0))
+    return (T, *outputs)
+
+
+@dataclass
+class SamplePathState:
+    """
+    The running state of the sample path sweep after the last observation time of a result.
+    It is all that is needed to resume the sweep over later events (see `FlowMetricsResult.extend`).
+
+    Fields
+    ------
+    t0 : pd.Timestamp
+        Start of the reporting window.
+    last_time : pd.Timestamp
+        Time up to which the area has been integrated: the last observation time.
+    N, A, arrivals, departures : float
+        N(t), A(T) and the cumulative arrivals and departures at last_time.
+    watermark : pd.Timestamp | NaT
+        Latest event time received so far. Later events must be strictly after it.
+    pending : list[(Timestamp, int, int)]
+        Events received but after last_time, so not yet reflected in the series
+        (e.g. events after the last calendar boundary).
+    """
+    t0: pd.Timestamp
+    last_time: pd.Timestamp
+    N: float = 0.0
+    A: float = 0.0
+    arrivals: float = 0.0
+    departures: float = 0.0
+    watermark: pd.Timestamp | NaTType = pd.NaT
+    pending: List[Tuple[pd.Timestamp, int, int]] = field(default_factory=list)
+
+
+def _sweep_sample_path(
+    events: List[Tuple[pd.Timestamp, int, int]],
+    T: List[pd.Timestamp],
+    t0: pd.Timestamp,
+    state: SamplePathState,
+) -> Tuple[Tuple[np.ndarray, ...], SamplePathState, int]:
+    # Sweep sorted events over sorted observation times T, starting from `state`.
+    # Returns the (L, Lambda, w, N, A, Arrivals, Departures) arrays at T, the state after the
+    # last time in T, and the number of events consumed.
+    N = state.N
+    A = state.A
+    cum_arr = state.arrivals
+    cum_dep = state.departures
+    prev = state.last_time
 
     out_L, out_Lam, out_w, out_N, out_A, out_Arr, out_Dep = ([] for _ in range(7))
     i = 0  # event index
@@ -172,16 +331,88 @@ def compute_sample_path_metrics(
         out_Arr.append(cum_arr)
         out_Dep.append(cum_dep)
 
-    return (
-        T,
-        np.array(out_L, dtype=float),
-        np.array(out_Lam, dtype=float),
-        np.array(out_w, dtype=float),
-        np.array(out_N, dtype=float),
-        np.array(out_A, dtype=float),
-        np.array(out_Arr, dtype=float),
-        np.array(out_Dep, dtype=float),
+    outputs = tuple(np.array(out, dtype=float) for out in (out_L, out_Lam, out_w, out_N, out_A, out_Arr, out_Dep))
+    watermark = state.watermark
+    if events and (pd.isna(watermark) or events[-1][0] > watermark):
+        watermark = events[-1][0]
+    end_state = SamplePathState(
+        t0=t0,
+        last_time=prev,
+        N=float(N),
+        A=float(A),
+        arrivals=float(cum_arr),
+        departures=float(cum_dep),
+        watermark=watermark,
+        pending=list(events[i:]),
     )
+    return outputs, end_state, i
+
+
+def _event_prefix_arrays(
+    events: List[Tuple[pd.Timestamp, int, int]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # One pass over sorted events: event times (int64 ns) and N, area since the first event,
+    # cumulative arrivals and cumulative departures right after each event.
+    ev_ns = pd.DatetimeIndex([e[0] for e in events]).asi8
+    dN = np.fromiter((e[1] for e in events), dtype=float, count=len(events))
+    arr = np.fromiter((e[2] for e in events), dtype=float, count=len(events))
+    dep = np.maximum(arr - dN, 0.0)
+    N_after = np.cumsum(dN)
+    dt_h = np.diff(ev_ns) / 3.6e12
+    A_at = np.concatenate([[0.0], np.cumsum(N_after[:-1] * dt_h)])
+    return ev_ns, N_after, A_at, np.cumsum(arr), np.cumsum(dep)
+
+
+def _state_at(
+    prefix: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    t_ns: np.ndarray,
+    inclusive: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # (N, area since the first event, cumulative arrivals, cumulative departures) at times t,
+    # counting events at t where inclusive is True and only events before t elsewhere.
+    ev_ns, N_after, A_at, cum_arr, cum_dep = prefix
+    idx = np.where(
+        inclusive,
+        np.searchsorted(ev_ns, t_ns, side="right"),
+        np.searchsorted(ev_ns, t_ns, side="left"),
+    ) - 1
+    before = idx < 0
+    k = np.maximum(idx, 0)
+    N_t = np.where(before, 0.0, N_after[k])
+    A_t = np.where(before, 0.0, A_at[k] + N_after[k] * (t_ns - ev_ns[k]) / 3.6e12)
+    return N_t, A_t, np.where(before, 0.0, cum_arr[k]), np.where(before, 0.0, cum_dep[k])
+
+
+def _calendar_sample_path(
+    events: List[Tuple[pd.Timestamp, int, int]],
+    T: pd.DatetimeIndex,
+) -> Tuple[Tuple[np.ndarray, ...], SamplePathState]:
+    # Vectorized equivalent of _sweep_sample_path from a zero state at t0 = T[0]: the cumulative
+    # series are the event prefix arrays looked up at every boundary with searchsorted. Area is
+    # only accumulated from t0 on; counts include any events before t0, as in the sweep.
+    T_ns = T.asi8
+    prefix = _event_prefix_arrays(events)
+    N, A_abs, Arr, Dep = _state_at(prefix, T_ns, np.ones(len(T_ns), dtype=bool))
+    A = A_abs - A_abs[0]
+    elapsed_h = (T_ns - T_ns[0]) / 3.6e12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        L = np.where(elapsed_h > 0, A / elapsed_h, np.nan)
+        Lam = np.where(elapsed_h > 0, Arr / elapsed_h, np.nan)
+        w = np.where(Arr > 0, A / Arr, np.nan)
+
+    consumed = int(np.searchsorted(prefix[0], T_ns[-1], side="right"))
+    state = SamplePathState(
+        t0=T[0],
+        last_time=T[-1],
+        N=float(N[-1]),
+        A=float(A[-1]),
+        arrivals=float(Arr[-1]),
+        departures=float(Dep[-1]),
+        watermark=events[-1][0],
+        pending=list(events[consumed:]),
+    )
+    return (L, Lam, w, N, A, Arr, Dep), state
+
 
 def compute_finite_window_flow_metrics(
     events: List[Tuple[pd.Timestamp, int, int]],
@@ -201,7 +432,9 @@ def compute_finite_window_flow_metrics(
     • freq is None  → event mode. Observations at t0, each event time in (t0, tn], and tn.
     • freq provided → calendar mode. Observations at calendar boundaries derived from `freq`
       (e.g., "D", "W-MON", "MS", "QS-JAN", "YS-JAN" or human aliases with anchors).
-      Per-bucket values can be obtained by differencing cumulative arrays at consecutive boundaries.
+      Boundaries are generated as int64 arrays and all of them are evaluated at once with
+      `searchsorted` over the event prefix arrays, so fine grids over long spans stay cheap.
+      Per-bucket values are returned by `to_bucket_dataframe()`.
 
     Window endpoints:
       t0 := first observation time; tn := last observation time.
@@ -240,38 +473,16 @@ def compute_finite_window_flow_metrics(
     ev_times = [t for (t, _, _) in events_sorted]
 
     # Build observation schedule
-    if freq is None:
-        mode: Literal["event"] = "event"
-        window_start = start if start is not None else ev_times[0]
-        window_end = end if end is not None else ev_times[-1]
-
-        obs: List[pd.Timestamp] = [pd.Timestamp(window_start)]
-        for t in ev_times:
-            if t > window_start and t <= window_end:
-                obs.append(pd.Timestamp(t))
-        if pd.Timestamp(window_end) != obs[-1]:
-            obs.append(pd.Timestamp(window_end))
-        obs = sorted(dict.fromkeys(obs))
-        resolved_freq = None
-    else:
-        mode: Literal["calendar"] = "calendar"
-        resolved_freq = _resolve_freq(
-            freq,
-            week_anchor=week_anchor,
-            quarter_anchor=quarter_anchor,
-            year_anchor=year_anchor,
-        )
-        first_ev = ev_times[0]
-        last_ev = ev_times[-1]
-        start_aligned = (start if start is not None else first_ev).floor(resolved_freq)
-        end_aligned = (end if end is not None else last_ev).floor(resolved_freq)
-        boundaries = pd.date_range(start=start_aligned, end=end_aligned, freq=resolved_freq)
-        if include_next_boundary:
-            off = pd.tseries.frequencies.to_offset(resolved_freq)
-            if len(boundaries) == 0:
-                boundaries = pd.DatetimeIndex([start_aligned])
-            boundaries = boundaries.append(pd.DatetimeIndex([boundaries[-1] + off]))
-        obs = list(boundaries)
+    obs, mode, resolved_freq = _observation_times(
+        ev_times,
+        freq=freq,
+        start=start,
+        end=end,
+        include_next_boundary=include_next_boundary,
+        week_anchor=week_anchor,
+        quarter_anchor=quarter_anchor,
+        year_anchor=year_anchor,
+    )
 
     if len(obs) == 0:
         return FlowMetricsResult(
@@ -298,8 +509,16 @@ def compute_finite_window_flow_metrics(
     for (t, dN, a) in events_sorted:
         events_prepped.append((t, dN, 0 if t < t0 else a))
 
-    # Compute metrics
-    T, L, Lam, w, N, A, Arr, Dep = compute_sample_path_metrics(events_prepped, obs)
+    # Compute metrics, keeping the sweep state so that the result can be extended later
+    if mode == "calendar":
+        # Calendar grids can have millions of boundaries: evaluate them all at once on int64 arrays
+        T = obs
+        (L, Lam, w, N, A, Arr, Dep), state = _calendar_sample_path(events_prepped, T)
+    else:
+        T = sorted(obs)
+        (L, Lam, w, N, A, Arr, Dep), state, _ = _sweep_sample_path(
+            events_prepped, T, t0, SamplePathState(t0=t0, last_time=t0)
+        )
 
     return FlowMetricsResult(
         events=events_prepped,
@@ -315,9 +534,223 @@ def compute_finite_window_flow_metrics(
         freq=resolved_freq,
         t0=t0,
         tn=tn,
+        state=state,
     )
 
 
+def compute_sliding_window_flow_metrics(
+    events: List[Tuple[pd.Timestamp, int, int]],
+    window: pd.Timedelta | str,
+    *,
+    freq: Optional[str] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    include_next_boundary: bool = False,
+    week_anchor: str = "SUN",
+    quarter_anchor: str = "JAN",
+    year_anchor: str = "JAN",
+) -> FlowMetricsResult:
+    """
+    Flow metrics over a trailing window of fixed length Δ, evaluated at every observation time T.
+
+    The observation schedule is the same as for `compute_finite_window_flow_metrics`. Instead of
+    the cumulative window (t0, T], each observation covers (s, T] with s = max(T - Δ, t0):
+
+    • A(T)          area under N(t) over (s, T]
+    • Arrivals(T)   arrivals in (s, T];  Departures(T) departures in (s, T]
+    • N(T)          number in system right after events ≤ T (as in cumulative mode)
+    • L = A / (T - s)
+    • Λ = (N(s) + Arrivals) / (T - s)
+    • w = A / (N(s) + Arrivals)
+
+    Windows that reach back to t0 include the events at t0, so once Δ covers the whole span the
+    results coincide with the cumulative metrics.
+
+    Items active at the window start contribute area to the window, so they are counted with the
+    window's arrivals in Λ and w; otherwise w would charge their area to the arrivals in the window.
+    L = Λ·w holds exactly for every window.
+
+    All windows are computed in O(n + m log n) for n events and m observation times: the sample path
+    is swept once into cumulative area and count arrays at event times, and each window is the
+    difference of those arrays evaluated at its two ends.
+    """
+    window = pd.Timedelta(window)
+    if window <= pd.Timedelta(0):
+        raise ValueError(f"Sliding window must be positive, got {window}")
+
+    resolved_mode: Literal["event", "calendar"] = "event" if freq is None else "calendar"
+    if not events:
+        return FlowMetricsResult(
+            events=[],
+            times=[],
+            L=np.array([]),
+            Lambda=np.array([]),
+            w=np.array([]),
+            N=np.array([]),
+            A=np.array([]),
+            Arrivals=np.array([]),
+            Departures=np.array([]),
+            mode=resolved_mode,
+            freq=freq,
+            t0=pd.NaT,
+            tn=pd.NaT,
+            window=window,
+        )
+
+    events_sorted = sorted(events, key=lambda e: e[0])
+    ev_times = [t for (t, _, _) in events_sorted]
+    obs, mode, resolved_freq = _observation_times(
+        ev_times,
+        freq=freq,
+        start=start,
+        end=end,
+        include_next_boundary=include_next_boundary,
+        week_anchor=week_anchor,
+        quarter_anchor=quarter_anchor,
+        year_anchor=year_anchor,
+    )
+    if len(obs) == 0:
+        return FlowMetricsResult(
+            events=[],
+            times=[],
+            L=np.array([]),
+            Lambda=np.array([]),
+            w=np.array([]),
+            N=np.array([]),
+            A=np.array([]),
+            Arrivals=np.array([]),
+            Departures=np.array([]),
+            mode=mode,
+            freq=resolved_freq,
+            t0=pd.NaT,
+            tn=pd.NaT,
+            window=window,
+        )
+
+    t0 = obs[0]
+    tn = obs[-1]
+
+    # One sweep over the events: N, area and cumulative counts right after each event.
+    prefix = _event_prefix_arrays(events_sorted)
+
+    T_ns = obs.asi8
+    S_ns = np.maximum(T_ns - window.value, T_ns[0])
+    # Windows clamped at t0 include the events at t0, as the cumulative window does.
+    N_T, A_T, Arr_T, Dep_T = _state_at(prefix, T_ns, np.ones(len(T_ns), dtype=bool))
+    N_S, A_S, Arr_S, Dep_S = _state_at(prefix, S_ns, S_ns > T_ns[0])
+
+    A = A_T - A_S
+    Arrivals = Arr_T - Arr_S
+    Departures = Dep_T - Dep_S
+    elapsed_h = (T_ns - S_ns) / 3.6e12
+    present = N_S + Arrivals
+    with np.errstate(divide="ignore", invalid="ignore"):
+        L = np.where(elapsed_h > 0, A / elapsed_h, np.nan)
+        Lam = np.where(elapsed_h > 0, present / elapsed_h, np.nan)
+        w = np.where(present > 0, A / present, np.nan)
+
+    return FlowMetricsResult(
+        events=events_sorted,
+        times=obs,
+        L=L,
+        Lambda=Lam,
+        w=w,
+        N=N_T,
+        A=A,
+        Arrivals=Arrivals,
+        Departures=Departures,
+        mode=mode,
+        freq=resolved_freq,
+        t0=t0,
+        tn=tn,
+        window=window,
+    )
+
+
+def _observation_times(
+    ev_times: List[pd.Timestamp],
+    *,
+    freq: Optional[str],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    include_next_boundary: bool,
+    week_anchor: str,
+    quarter_anchor: str,
+    year_anchor: str,
+) -> Tuple[pd.DatetimeIndex, Literal["event", "calendar"], Optional[str]]:
+    """
+    Observation schedule shared by the finite-window drivers: event boundaries when freq is None,
+    calendar boundaries otherwise. `ev_times` must be sorted. Returns (obs, mode, resolved_freq).
+    """
+    if freq is None:
+        mode: Literal["event"] = "event"
+        window_start = start if start is not None else ev_times[0]
+        window_end = end if end is not None else ev_times[-1]
+
+        obs: List[pd.Timestamp] = [pd.Timestamp(window_start)]
+        for t in ev_times:
+            if t > window_start and t <= window_end:
+                obs.append(pd.Timestamp(t))
+        if pd.Timestamp(window_end) != obs[-1]:
+            obs.append(pd.Timestamp(window_end))
+        obs = sorted(dict.fromkeys(obs))
+        resolved_freq = None
+    else:
+        mode: Literal["calendar"] = "calendar"
+        resolved_freq = _resolve_freq(
+            freq,
+            week_anchor=week_anchor,
+            quarter_anchor=quarter_anchor,
+            year_anchor=year_anchor,
+        )
+        first_ev = ev_times[0]
+        last_ev = ev_times[-1]
+        start_aligned = (start if start is not None else first_ev).floor(resolved_freq)
+        end_aligned = (end if end is not None else last_ev).floor(resolved_freq)
+        off = pd.tseries.frequencies.to_offset(resolved_freq)
+        tz = start_aligned.tz
+        if isinstance(off, pd.offsets.Tick) and (tz is None or str(tz) == "UTC"):
+            # Fixed steps in absolute time: the grid is an int64 range, no Timestamp per boundary
+            # (count in integer arithmetic: np.arange sizes its output in float64, inexact at ns epochs)
+            count = max((end_aligned.value - start_aligned.value) // off.nanos + 1, 0)
+            boundaries_ns = start_aligned.value + off.nanos * np.arange(count, dtype=np.int64)
+        else:
+            boundaries_ns = pd.date_range(start=start_aligned, end=end_aligned, freq=resolved_freq).asi8
+        if include_next_boundary:
+            if len(boundaries_ns) == 0:
+                boundaries_ns = np.array([start_aligned.value], dtype=np.int64)
+            last = _ns_to_index(boundaries_ns[-1:], tz)[0]
+            boundaries_ns = np.append(boundaries_ns, (last + off).value)
+        return _ns_to_index(boundaries_ns, tz), mode, resolved_freq
+
+    return pd.DatetimeIndex(obs), mode, resolved_freq
+
+
+def calendar_boundaries(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    freq: str,
+    *,
+    week_anchor: str = "SUN",
+    quarter_anchor: str = "JAN",
+    year_anchor: str = "JAN",
+) -> pd.DatetimeIndex:
+    """
+    The calendar boundaries of `freq` (a bucket name such as "week", or a pandas frequency) from
+    `start` to `end`, both floored to the frequency: the observation times of the calendar mode.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    obs, _, _ = _observation_times([start, end], freq=freq, start=start, end=end, include_next_boundary=False,
+                                   week_anchor=week_anchor, quarter_anchor=quarter_anchor, year_anchor=year_anchor)
+    return obs
+
+
+def _ns_to_index(values_ns: np.ndarray, tz) -> pd.DatetimeIndex:
+    # int64 ns since the epoch (UTC) to a DatetimeIndex in time zone `tz` (naive if None)
+    index = pd.DatetimeIndex(np.asarray(values_ns, dtype=np.int64).view("datetime64[ns]"))
+    return index if tz is None else index.tz_localize("UTC").tz_convert(tz)
+
+
 # --- helper to map human bucket names to pandas freq strings ---
 def _resolve_freq(
     bucket: str,
@@ -354,6 +787,54 @@ def _resolve_freq(
         f"or one of {{day, week, month, quarter, year}}."
     )
 
+def compute_total_active_age_series(
+    df: pd.DataFrame,
+    times: List[pd.Timestamp],
+    t0: Optional[pd.Timestamp] = None,
+) -> np.ndarray:
+    """
+    Return R(T) aligned to `times`: total age (HOURS) of ACTIVE elements at T.
+
+    active(T): start <= T and (end > T or end is NaT)
+    window clip: ages measured from s' = max(start, t0), so R(t0) = 0. t0 defaults to times[0].
+
+    With S(T) the sum of the clipped starts of the items started by T, and S_e(T) that of the
+    items ended by T, R(T) = N_active(T)·(T - t0) - (S(T) - S_e(T)). Both counts and both sums are
+    prefix sums over the sorted starts and ends, looked up for all T at once with `searchsorted`.
+    The sums are taken relative to t0 in float64 HOURS (not ns) to avoid int64 overflows.
+    """
+    n = len(times)
+    if n == 0:
+        return np.zeros(0, dtype=float)
+
+    obs_ns = pd.DatetimeIndex(times).asi8
+    t0_ns = obs_ns[0] if t0 is None or pd.isna(t0) else pd.Timestamp(t0).value
+
+    starts = pd.DatetimeIndex(df["start_ts"]).dropna()
+    starts_ns = np.sort(starts.asi8)
+
+    ended = df[df["end_ts"].notna()]
+    ends_ns = pd.DatetimeIndex(ended["end_ts"]).asi8
+    order = np.argsort(ends_ns, kind="stable")
+    ends_ns = ends_ns[order]
+    ended_starts_ns = pd.DatetimeIndex(ended["start_ts"]).asi8[order]
+
+    # Prefix sums of clipped starts (hours after t0), with a leading 0 for "none yet"
+    starts_cumsum_h = np.concatenate([[0.0], np.cumsum(np.maximum((starts_ns - t0_ns) / 3.6e12, 0.0))])
+    ended_starts_cumsum_h = np.concatenate([[0.0], np.cumsum(np.maximum((ended_starts_ns - t0_ns) / 3.6e12, 0.0))])
+
+    i_s = np.searchsorted(starts_ns, obs_ns, side="right")  # count of starts with start <= T
+    i_e = np.searchsorted(ends_ns, obs_ns, side="right")    # count of ends   with end   <= T
+
+    N_active = i_s - i_e
+    S_active_h = np.maximum(starts_cumsum_h[i_s] - ended_starts_cumsum_h[i_e], 0.0)
+    T_rel_h = (obs_ns - t0_ns) / 3.6e12
+    R = N_active * T_rel_h - S_active_h
+
+    # Numerical safety: never negative
+    return np.where(N_active > 0, np.maximum(R, 0.0), 0.0)
+
+
 #-------- Element-wise empirical metrics ------
 
 @dataclass
@@ -411,33 +892,22 @@ def compute_elementwise_empirical_metrics(df: pd.DataFrame, times: List[pd.Times
         if n == 0:
             return W_star, lam_star
 
-        comp = df[df["end_ts"].notna()].copy().sort_values("end_ts")
+        obs_ns = pd.DatetimeIndex(times).asi8
+
+        comp = df[df["end_ts"].notna()].sort_values("end_ts")
         comp_durations = ((comp["end_ts"] - comp["start_ts"]).dt.total_seconds() / 3600.0).to_numpy()
-        comp_end_times = comp["end_ts"].to_list()
-
-        starts = df["start_ts"].sort_values().to_list()
-
-        j = 0
-        count_c = 0
-        sum_c = 0.0
-        k = 0
-        count_starts = 0
-        t0 = times[0]
-
-        for i, t in enumerate(times):
-            while j < len(comp_end_times) and comp_end_times[j] <= t:
-                sum_c += comp_durations[j]
-                count_c += 1
-                j += 1
-            if count_c > 0:
-                W_star[i] = sum_c / count_c
-
-            while k < len(starts) and starts[k] <= t:
-                count_starts += 1
-                k += 1
-            elapsed_h = (t - t0).total_seconds() / 3600.0
-            if elapsed_h > 0:
-                lam_star[i] = count_starts / elapsed_h
+        comp_end_ns = pd.DatetimeIndex(comp["end_ts"]).asi8
+        starts_ns = np.sort(pd.DatetimeIndex(df["start_ts"]).dropna().asi8)
+
+        # Completions and arrivals up to each T, with prefix sums of the completed durations
+        count_c = np.searchsorted(comp_end_ns, obs_ns, side="right")
+        sum_c = np.concatenate([[0.0], np.cumsum(comp_durations)])[count_c]
+        count_starts = np.searchsorted(starts_ns, obs_ns, side="right")
+        elapsed_h = elapsed_hours(times)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            W_star = np.where(count_c > 0, sum_c / count_c, np.nan)
+            lam_star = np.where(elapsed_h > 0, count_starts / elapsed_h, np.nan)
 
         return W_star, lam_star
 
@@ -468,36 +938,36 @@ def compute_end_effect_series(df: pd.DataFrame,
     if n == 0:
         return rA, rB, rho
 
-    df = df.copy()
-    df["duration_h"] = (df["end_ts"] - df["start_ts"]).dt.total_seconds() / 3600.0
-    df_sorted_by_end = df.sort_values("end_ts")
-    df_sorted_by_start = df.sort_values("start_ts")
-
-    t0 = times[0]
-
-    for i, t in enumerate(times):
-        elapsed_h = (t - t0).total_seconds() / 3600.0
-        if elapsed_h <= 0:
-            continue
-
-        A_T = float(A_vals[i]) if i < len(A_vals) and np.isfinite(A_vals[i]) else np.nan
-        if not np.isfinite(A_T) or A_T <= 0:
-            continue
-
-        mask_full = df_sorted_by_end["end_ts"].notna() & (df_sorted_by_end["end_ts"] <= t)
-        A_full = float(df_sorted_by_end.loc[mask_full, "duration_h"].sum()) if mask_full.any() else 0.0
-
-        E_T = max(A_T - A_full, 0.0)
-        rA[i] = E_T / A_T if A_T > 0 else np.nan
-
-        mask_started = (df_sorted_by_start["start_ts"] <= t)
-        total_started = int(mask_started.sum())
-        mask_incomplete_by_t = mask_started & ((df_sorted_by_start["end_ts"].isna()) | (df_sorted_by_start["end_ts"] > t))
-        B_T = int(mask_incomplete_by_t.sum())
-        rB[i] = (B_T / total_started) if total_started > 0 else np.nan
-
-        Wstar_t = float(W_star[i]) if i < len(W_star) else float('nan')
-        rho[i] = (elapsed_h / Wstar_t) if np.isfinite(Wstar_t) and Wstar_t > 0 else np.nan
+    T_ns = pd.DatetimeIndex(times).asi8
+    elapsed = elapsed_hours(times)
+    A_T = np.full(n, np.nan, dtype=float)
+    A_T[:min(n, len(A_vals))] = np.asarray(A_vals, dtype=float)[:n]
+    Wstar_T = np.full(n, np.nan, dtype=float)
+    Wstar_T[:min(n, len(W_star))] = np.asarray(W_star, dtype=float)[:n]
+
+    has_start = df["start_ts"].notna().to_numpy()
+    has_end = df["end_ts"].notna().to_numpy()
+    start_ns = pd.DatetimeIndex(df["start_ts"]).asi8
+    end_ns = pd.DatetimeIndex(df["end_ts"]).asi8
+
+    # A_full(T): prefix sums of the durations of the items ended by T, in order of end time
+    by_end = np.argsort(end_ns[has_end], kind="stable")
+    ends_sorted = end_ns[has_end][by_end]
+    durations_h = np.where(has_start, end_ns - start_ns, 0)[has_end][by_end] / 3.6e12
+    A_full = np.concatenate([[0.0], np.cumsum(durations_h)])[np.searchsorted(ends_sorted, T_ns, side="right")]
+
+    # B(T): items started by T that have not ended by T; an item is both started and ended by T
+    # exactly when the later of its start and end is
+    total_started = np.searchsorted(np.sort(start_ns[has_start]), T_ns, side="right")
+    both = has_start & has_end
+    completed = np.searchsorted(np.sort(np.maximum(start_ns[both], end_ns[both])), T_ns, side="right")
+    B_T = total_started - completed
+
+    valid = (elapsed > 0) & np.isfinite(A_T) & (A_T > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rA[valid] = np.maximum(A_T - A_full, 0.0)[valid] / A_T[valid]
+        rB[valid] = np.where(total_started > 0, B_T / total_started, np.nan)[valid]
+        rho[valid] = np.where(np.isfinite(Wstar_T) & (Wstar_T > 0), elapsed / Wstar_T, np.nan)[valid]
 
     return rA, rB, rho
 
@@ -509,8 +979,7 @@ def compute_tracking_errors(times: List[pd.Timestamp],
     n = len(times)
     if n == 0:
         return np.array([]), np.array([]), np.array([])
-    t0 = times[0]
-    elapsed_hours = np.array([(t - t0).total_seconds() / 3600.0 for t in times], dtype=float)
+    elapsed = elapsed_hours(times)
 
     eW = np.full(n, np.nan, dtype=float)
     eLam = np.full(n, np.nan, dtype=float)
@@ -521,7 +990,7 @@ def compute_tracking_errors(times: List[pd.Timestamp],
     eW[valid_W] = np.abs(w_vals[valid_W] - W_star[valid_W]) / W_star[valid_W]
     eLam[valid_L] = np.abs(lam_vals[valid_L] - lam_star[valid_L]) / lam_star[valid_L]
 
-    return eW, eLam, elapsed_hours
+    return eW, eLam, elapsed
 
 
 def compute_coherence_score(eW: np.ndarray,
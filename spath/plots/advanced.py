@@ -8,9 +8,11 @@ from typing import Optional, Tuple, List
 import pandas as pd
 
 from spath.filter import FilterResult
+from spath.instrument import timed
 from spath.metrics import FlowMetricsResult
 
 
+@timed
 def plot_llaw_manifold_3d(
     df,
     metrics,                           # FlowMetricsResult
@@ -131,6 +133,7 @@ def plot_llaw_manifold_3d(
     return [out_path]
 
 
+@timed
 def plot_advanced_charts(
     df: pd.DataFrame,
     args,
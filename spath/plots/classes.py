@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import math
+import os
+from typing import Dict, List, Optional
+
+from matplotlib import pyplot as plt
+
+from spath.class_metrics import ClassMetrics, write_class_tables
+from spath.filter import FilterResult
+from spath.instrument import timed
+from spath.plots.helpers import format_date_axis, plot_series
+
+# (attribute, panel title, y label, step plot)
+_FACETS = [
+    ("N", "N(t) — Sample Path", "N(t)", True),
+    ("L", "L(T) — Time-Average of N(t)", "L(T)", False),
+    ("Lambda", "Λ(T) — Cumulative Arrival Rate", "Λ(T) [1/hr]", False),
+    ("w", "w(T) — Average Residence Time", "w(T) [hrs]", False),
+]
+
+
+def draw_class_facets(results: Dict[str, ClassMetrics],
+                      attr: str,
+                      title: str,
+                      ylabel: str,
+                      out_path: str,
+                      step: bool = False,
+                      max_cols: int = 3,
+                      caption: Optional[str] = None) -> None:
+    """One small-multiple panel per class on shared axes, so classes can be compared at a glance."""
+    n = len(results)
+    ncols = min(max_cols, n)
+    nrows = math.ceil(n / ncols)
+    fig, axes = plt.subplots(nrows, ncols, figsize=(4.5 * ncols, 3.2 * nrows), sharex=True, sharey=True,
+                             squeeze=False)
+
+    for ax, (name, r) in zip(axes.flat, results.items()):
+        m = r.metrics
+        values = getattr(m, attr)
+        if step:
+            plot_series(ax, m.times, values, label=ylabel, style="step")
+        else:
+            plot_series(ax, m.times, values, label=ylabel)
+        ax.set_title(f"{name} (n={r.count})")
+        ax.set_ylabel(ylabel)
+        format_date_axis(ax)
+
+    for ax in list(axes.flat)[n:]:
+        ax.set_visible(False)
+
+    plt.tight_layout(rect=(0, 0, 1, 0.92))
+    fig.suptitle(title, fontsize=14, y=0.98)
+    if caption:
+        fig.text(0.5, 0.945, caption, ha="center", va="top")
+    fig.savefig(out_path)
+    plt.close(fig)
+
+
+@timed
+def plot_class_charts(results: Dict[str, ClassMetrics],
+                      args,
+                      filter_result: Optional[FilterResult],
+                      out_dir: str) -> List[str]:
+    """Write the per-class metric tables and faceted charts under <out_dir>/classes."""
+    if not results:
+        return []
+    written = write_class_tables(results, out_dir)
+    class_dir = os.path.join(out_dir, 'classes')
+
+    label = filter_result.label if filter_result is not None else ""
+    for attr, title, ylabel, step in _FACETS:
+        out_path = os.path.join(class_dir, f'{attr}_by_class.png')
+        draw_class_facets(results, attr, f'{title} by class', ylabel, out_path, step=step, caption=label)
+        written.append(out_path)
+
+    return written
@@ -9,8 +9,9 @@ import pandas as pd
 from matplotlib import pyplot as plt
 
 from spath.filter import FilterResult
+from spath.instrument import timed
 from spath.metrics import compute_elementwise_empirical_metrics, FlowMetricsResult, ElementWiseEmpiricalMetrics, \
-    compute_tracking_errors, compute_coherence_score, compute_end_effect_series
+    compute_tracking_errors, compute_coherence_score, compute_end_effect_series, elapsed_hours
 from spath.plots.helpers import format_date_axis, add_caption, _clip_axis_to_percentile, init_fig_ax
 
 
@@ -225,12 +226,7 @@ def draw_arrival_departure_convergence_stack(
           idle-tail artifact where the ratio would decay toward 0.
     """
     # ---- Compute elapsed hours and throughput rate θ(T) ----------------------
-    n = len(times)
-    if n > 0:
-        t0 = times[0]
-        elapsed_h = np.array([(t - t0).total_seconds() / 3600.0 for t in times], dtype=float)
-    else:
-        elapsed_h = np.array([], dtype=float)
+    elapsed_h = elapsed_hours(times)
 
     with np.errstate(divide="ignore", invalid="ignore"):
         theta_rate = np.where(elapsed_h > 0.0, departures_cum / elapsed_h, np.nan)
@@ -244,7 +240,7 @@ def draw_arrival_departure_convergence_stack(
             last_dep_idx = int(inc.max())
 
     # Mask θ(T) after the last departure (prevents idle tail from misleading viewers)
-    if last_dep_idx >= 0 and last_dep_idx + 1 < n:
+    if last_dep_idx >= 0 and last_dep_idx + 1 < len(times):
         theta_rate[last_dep_idx + 1:] = np.nan
 
     # ---- Figure ----------------------------------------------------------------
@@ -304,7 +300,8 @@ def draw_residence_vs_sojourn_stack(
     """
     # --- Compute W*(t) aligned to `times`
     if len(times) > 0:
-        W_star_hours, _ = compute_elementwise_empirical_metrics(df, times).as_tuple()
+        with timed("empirical_metrics"):
+            W_star_hours, _ = compute_elementwise_empirical_metrics(df, times).as_tuple()
     else:
         W_star_hours = np.array([])
 
@@ -347,6 +344,7 @@ def draw_residence_vs_sojourn_stack(
     plt.close(fig)
 
 
+@timed
 def plot_arrival_rate_convergence(
     args,
     filter_result: Optional[FilterResult],
@@ -399,6 +397,7 @@ def plot_arrival_rate_convergence(
     return [eq_path, lambda_path]
 
 
+@timed
 def plot_residence_time_sojourn_time_coherence_charts(df, args, filter_result, metrics, out_dir):
     # Empirical targets & dynamic baselines
     horizon_days = args.horizon_days
@@ -411,7 +410,8 @@ def plot_residence_time_sojourn_time_coherence_charts(df, args, filter_result, m
     written: List[str] = []
 
     if len(metrics.times) > 0:
-        W_star_ts, lam_star_ts = compute_elementwise_empirical_metrics(df, metrics.times).as_tuple()
+        with timed("empirical_metrics"):
+            W_star_ts, lam_star_ts = compute_elementwise_empirical_metrics(df, metrics.times).as_tuple()
     else:
         W_star_ts = np.array([])
         lam_star_ts = np.array([])
@@ -441,8 +441,9 @@ def plot_residence_time_sojourn_time_coherence_charts(df, args, filter_result, m
                                                    lambda_warmup_hours=lambda_warmup_hours)
         written.append(ts_conv_dyn3)
     # --- End-effect diagnostics ---
-    rA_ts, rB_ts, rho_ts = compute_end_effect_series(df, metrics.times, metrics.A, W_star_ts) if len(
-        metrics.times) > 0 else (np.array([]), np.array([]), np.array([]))
+    with timed("end_effects"):
+        rA_ts, rB_ts, rho_ts = compute_end_effect_series(df, metrics.times, metrics.A, W_star_ts) if len(
+            metrics.times) > 0 else (np.array([]), np.array([]), np.array([]))
     if len(metrics.times) > 0:
         ts_conv_dyn4 = os.path.join(out_dir, 'advanced/residence_time_convergence_errors_endeffects.png')
         draw_dynamic_convergence_panel_with_errors_and_endeffects(
@@ -456,6 +457,7 @@ def plot_residence_time_sojourn_time_coherence_charts(df, args, filter_result, m
     return written
 
 
+@timed
 def plot_residence_vs_sojourn_stack(
         df: pd.DataFrame,
         args,
@@ -512,12 +514,7 @@ def draw_ll_scatter_coherence(
     y_vals = lam_star * W_star_hours
     x_vals = np.asarray(L_vals, dtype=float)
 
-    n = len(times)
-    if n > 0:
-        t0 = times[0]
-        elapsed_h = np.array([(t - t0).total_seconds() / 3600.0 for t in times], dtype=float)
-    else:
-        elapsed_h = np.array([], dtype=float)
+    elapsed_h = elapsed_hours(times)
 
     # Mask: finite and past horizon
     finite_mask = np.isfinite(x_vals) & np.isfinite(y_vals) & (x_vals > 0.0)
@@ -584,6 +581,7 @@ def draw_ll_scatter_coherence(
     return score, ok_count, total_count
 
 
+@timed
 def plot_sample_path_convergence(
     df: pd.DataFrame,
     args,
@@ -612,7 +610,8 @@ def plot_sample_path_convergence(
 
     # derive W*(t), λ*(t) aligned to times
     if len(metrics.times) > 0:
-        W_star_hours, lam_star = compute_elementwise_empirical_metrics(df, metrics.times).as_tuple()
+        with timed("empirical_metrics"):
+            W_star_hours, lam_star = compute_elementwise_empirical_metrics(df, metrics.times).as_tuple()
     else:
         W_star_hours = np.array([])
         lam_star = np.array([])
@@ -643,6 +642,7 @@ def plot_sample_path_convergence(
     return [png_path]
 
 
+@timed
 def plot_convergence_charts(
     df: pd.DataFrame,
     args,
@@ -11,10 +11,11 @@ from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
 from spath.filter import FilterResult
-from spath.metrics import FlowMetricsResult
+from spath.instrument import timed
+from spath.metrics import FlowMetricsResult, elapsed_hours
 
 from spath.plots.helpers import init_fig_ax, format_and_save, add_caption, _clip_axis_to_percentile, format_date_axis, \
-    draw_step_chart, draw_line_chart
+    draw_step_chart, draw_line_chart, plot_series, decimate
 
 
 def draw_lambda_chart(
@@ -31,16 +32,14 @@ def draw_lambda_chart(
 ) -> None:
     """Line chart with optional percentile-based y-limits and warmup exclusion."""
     fig, ax = init_fig_ax(figsize=(10.0, 3.6))
-    ax.plot(times, values, label=ylabel)
+    plot_series(ax, times, values, label=ylabel)
 
     # Inline percentile clipping
     vals = np.asarray(values, dtype=float)
     if vals.size > 0:
         mask = np.isfinite(vals)
-        if lambda_warmup_hours and times:
-            t0 = times[0]
-            ages_hr = np.array([(t - t0).total_seconds() / 3600.0 for t in times])
-            mask &= ages_hr >= float(lambda_warmup_hours)
+        if lambda_warmup_hours and len(times) > 0:
+            mask &= elapsed_hours(times) >= float(lambda_warmup_hours)
         data = vals[mask]
         if data.size > 0 and np.isfinite(data).any():
             top = (
@@ -114,6 +113,7 @@ def draw_L_vs_Lambda_w(
     plt.close(fig)
 
 
+@timed
 def plot_core_sample_path_analysis_stack(args, filter_result, metrics, out_dir):
     four_col_stack = os.path.join(out_dir, 'sample_path_flow_metrics.png')
     draw_four_panel_column(metrics.times, metrics.N, metrics.L, metrics.Lambda, metrics.w,
@@ -136,17 +136,17 @@ def draw_four_panel_column(times: List[pd.Timestamp],
                            ) -> None:
     fig, axes = plt.subplots(4, 1, figsize=(12, 11), sharex=True)
 
-    axes[0].step(times, N_vals, where='post', label='N(t)')
+    plot_series(axes[0], times, N_vals, label='N(t)', style='step')
     axes[0].set_title('N(t) — Sample Path')
     axes[0].set_ylabel('N(t)')
     axes[0].legend()
 
-    axes[1].plot(times, L_vals, label='L(T)')
+    plot_series(axes[1], times, L_vals, label='L(T)')
     axes[1].set_title('L(T) — Time-Average of N(t)')
     axes[1].set_ylabel('L(T)')
     axes[1].legend()
 
-    axes[2].plot(times, Lam_vals, label='Λ(T) [1/hr]')
+    plot_series(axes[2], times, Lam_vals, label='Λ(T) [1/hr]')
     axes[2].set_title('Λ(T) — Cumulative Arrival Rate')
     axes[2].set_ylabel('Λ(T) [1/hr]')
     axes[2].legend()
@@ -155,7 +155,7 @@ def draw_four_panel_column(times: List[pd.Timestamp],
                              lower_p=lambda_pctl_lower,
                              warmup_hours=lambda_warmup_hours)
 
-    axes[3].plot(times, w_vals, label='w(T) [hrs]')
+    plot_series(axes[3], times, w_vals, label='w(T) [hrs]')
     axes[3].set_title('w(T) — Average Residence Time')
     axes[3].set_ylabel('w(T) [hrs]')
     axes[3].set_xlabel('Date')
@@ -194,17 +194,17 @@ def draw_five_panel_column(times: List[pd.Timestamp],
                            ) -> None:
     fig, axes = plt.subplots(5, 1, figsize=(12, 14), sharex=True)
 
-    axes[0].step(times, N_vals, where='post', label='N(t)')
+    plot_series(axes[0], times, N_vals, label='N(t)', style='step')
     axes[0].set_title('N(t) — Sample Path')
     axes[0].set_ylabel('N(t)')
     axes[0].legend()
 
-    axes[1].plot(times, L_vals, label='L(T)')
+    plot_series(axes[1], times, L_vals, label='L(T)')
     axes[1].set_title('L(T) — Time-Average of N(t)')
     axes[1].set_ylabel('L(T)')
     axes[1].legend()
 
-    axes[2].plot(times, Lam_vals, label='Λ(T) [1/hr]')
+    plot_series(axes[2], times, Lam_vals, label='Λ(T) [1/hr]')
     axes[2].set_title('Λ(T) — Cumulative Arrival Rate')
     axes[2].set_ylabel('Λ(T) [1/hr]')
     axes[2].legend()
@@ -213,14 +213,15 @@ def draw_five_panel_column(times: List[pd.Timestamp],
                              lower_p=lambda_pctl_lower,
                              warmup_hours=lambda_warmup_hours)
 
-    axes[3].plot(times, w_vals, label='w(T) [hrs]')
+    plot_series(axes[3], times, w_vals, label='w(T) [hrs]')
     if scatter_times is not None and scatter_values is not None and len(scatter_times) > 0:
+        scatter_times, scatter_values = decimate(scatter_times, scatter_values, method="minmax")
         axes[3].scatter(scatter_times, scatter_values, s=16, alpha=0.6, marker='o', label=scatter_label)
     axes[3].set_title('w(T) — Average Residence Time')
     axes[3].set_ylabel('w(T) [hrs]')
     axes[3].legend()
 
-    axes[4].plot(times, A_vals, label='A(T) [hrs·items]')
+    plot_series(axes[4], times, A_vals, label='A(T) [hrs·items]')
     axes[4].set_title('A(T) — cumulative area ∫N(t)dt')
     axes[4].set_ylabel('A(T) [hrs·items]')
     axes[4].set_xlabel('Date')
@@ -251,17 +252,17 @@ def draw_five_panel_column_with_scatter(times: List[pd.Timestamp],
                                         ) -> None:
     fig, axes = plt.subplots(5, 1, figsize=(12, 14), sharex=True)
 
-    axes[0].step(times, N_vals, where='post', label='N(t)')
+    plot_series(axes[0], times, N_vals, label='N(t)', style='step')
     axes[0].set_title('N(t) — Sample Path')
     axes[0].set_ylabel('N(t)')
     axes[0].legend()
 
-    axes[1].plot(times, L_vals, label='L(T)')
+    plot_series(axes[1], times, L_vals, label='L(T)')
     axes[1].set_title('L(T) — Time-Average of N(t)')
     axes[1].set_ylabel('L(T)')
     axes[1].legend()
 
-    axes[2].plot(times, Lam_vals, label='Λ(T) [1/hr]')
+    plot_series(axes[2], times, Lam_vals, label='Λ(T) [1/hr]')
     axes[2].set_title('Λ(T) — Cumulative Arrival Rate')
     axes[2].set_ylabel('Λ(T) [1/hr]')
     axes[2].legend()
@@ -270,13 +271,14 @@ def draw_five_panel_column_with_scatter(times: List[pd.Timestamp],
                              lower_p=lambda_pctl_lower,
                              warmup_hours=lambda_warmup_hours)
 
-    axes[3].plot(times, w_vals, label='w(T) [hrs]')
+    plot_series(axes[3], times, w_vals, label='w(T) [hrs]')
     axes[3].set_title('w(T) — Average Residence Time (plain, own scale)')
     axes[3].set_ylabel('w(T) [hrs]')
     axes[3].legend()
 
-    axes[4].plot(times, w_vals, label='w(T) [hrs]')
+    plot_series(axes[4], times, w_vals, label='w(T) [hrs]')
     if scatter_times is not None and scatter_values is not None and len(scatter_values) > 0:
+        scatter_times, scatter_values = decimate(scatter_times, scatter_values, method="minmax")
         axes[4].scatter(scatter_times, scatter_values, s=16, alpha=0.6, marker='o', label=scatter_label)
     axes[4].set_title('w(T) — with per-item durations (scatter, combined scale)')
     axes[4].set_ylabel('w(T) [hrs]')
@@ -308,6 +310,7 @@ def draw_five_panel_column_with_scatter(times: List[pd.Timestamp],
     plt.close(fig)
 
 
+@timed
 def plot_core_flow_metrics_charts(
     df: pd.DataFrame,
     args,
@@ -375,6 +378,56 @@ def plot_core_flow_metrics_charts(
     return [path_N, path_L, path_Lam, path_w, path_invariant, path_sample_path_analysis, path_w_scatter]
 
 
+@timed
+def plot_sliding_window_charts(
+    args,
+    filter_result: Optional[FilterResult],
+    metrics: FlowMetricsResult,
+    out_dir: str,
+) -> List[str]:
+    """Charts for trailing-window metrics from `compute_sliding_window_flow_metrics`."""
+    core_panels_dir = os.path.join(out_dir, "core")
+    filter_label = filter_result.label if filter_result else ""
+    days = metrics.window / pd.Timedelta(days=1)
+    window_label = f"{days:g}-day window"
+    note = f"Filters: {filter_label}; trailing {window_label}"
+
+    path_L = os.path.join(core_panels_dir, "sliding_window_L.png")
+    draw_line_chart(
+        metrics.times,
+        metrics.L,
+        f"L(T) — Average N(t) over trailing {window_label}",
+        "L(T)",
+        path_L,
+        caption=note,
+    )
+
+    path_Lam = os.path.join(core_panels_dir, "sliding_window_Lambda.png")
+    draw_lambda_chart(
+        metrics.times,
+        metrics.Lambda,
+        f"Λ(T) — Rate over trailing {window_label}",
+        "Λ(T) [1/hr]",
+        path_Lam,
+        lambda_pctl_upper=args.lambda_pctl,
+        lambda_pctl_lower=args.lambda_lower_pctl,
+        lambda_warmup_hours=args.lambda_warmup,
+        caption=note,
+    )
+
+    path_w = os.path.join(core_panels_dir, "sliding_window_w.png")
+    draw_line_chart(
+        metrics.times,
+        metrics.w,
+        f"w(T) — Average residence time over trailing {window_label}",
+        "w(T) [hrs]",
+        path_w,
+        caption=note,
+    )
+    return [path_L, path_Lam, path_w]
+
+
+@timed
 def plot_sojourn_time_scatter(args, df, filter_result, metrics,out_dir) -> str:
     t_scatter_times: List[pd.Timestamp] = []
     t_scatter_vals = np.array([])
@@ -414,11 +467,13 @@ def draw_line_chart_with_scatter(times: List[pd.Timestamp],
                                  line_label: str = 'Average Residence Time',
                                  scatter_label: str = "element sojourn time",
                                  unit: str = "timestamp",
-                                 caption: Optional[str] = None
+                                 caption: Optional[str] = None,
+                                 max_points: Optional[int] = None
                                  ) -> None:
     fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(times, values, label=line_label)
+    plot_series(ax, times, values, label=line_label, max_points=max_points)
     if scatter_times is not None and scatter_values is not None and len(scatter_times) > 0:
+        scatter_times, scatter_values = decimate(scatter_times, scatter_values, max_points, method="minmax")
         ax.scatter(scatter_times, scatter_values, s=16, alpha=0.6, marker='o', label=scatter_label)
 
     format_and_save(fig, ax, title, ylabel, unit, caption, out_path)
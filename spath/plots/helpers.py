@@ -9,6 +9,9 @@ from matplotlib import pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
+from spath.instrument import timed
+from spath.metrics import elapsed_hours
+
 
 def add_caption(fig: Figure, text: str) -> None:
     """Add a caption below the x-axis."""
@@ -68,6 +71,123 @@ def init_fig_ax(figsize: Tuple[float, float] = (10.0, 3.4)) -> Tuple[Figure, Axe
     return fig, ax
 
 
+# ---------- Decimation ----------
+#
+# Event-mode series have about two points per input row, far more than a chart has pixels.
+# Series longer than the point budget are decimated before plotting:
+#   - lines use LTTB (largest triangle three buckets), which keeps the points that carry the shape,
+#   - step plots and scatters keep the first, last, min and max point of each x-pixel column, so
+#     that every spike and every outlier is still drawn.
+# The default budget of 4000 points is four points per pixel column of a 10in chart at 100 dpi.
+
+_MAX_PLOT_POINTS: Optional[int] = 4000
+
+
+def set_max_plot_points(max_points: Optional[int]) -> None:
+    """Set the default point budget per plotted series. None or 0 disables decimation."""
+    global _MAX_PLOT_POINTS
+    _MAX_PLOT_POINTS = max_points or None
+
+
+def get_max_plot_points() -> Optional[int]:
+    return _MAX_PLOT_POINTS
+
+
+def _x_as_float(x) -> np.ndarray:
+    # Datetimes as float ns relative to the first point (no int64 overflow in the area products)
+    index = pd.Index(x)
+    if pd.api.types.is_datetime64_any_dtype(index.dtype):
+        ns = index.asi8
+        return (ns - ns[0]).astype(float) if len(ns) else ns.astype(float)
+    return index.to_numpy(dtype=float)
+
+
+def _take(seq, idx: np.ndarray):
+    if isinstance(seq, (pd.Index, np.ndarray)):
+        return seq[idx]
+    if isinstance(seq, pd.Series):
+        return seq.iloc[idx]
+    return [seq[i] for i in idx]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by largest-triangle-three-buckets downsampling of (x, y) to `n_out` points.
+
+    `x` must be ascending. The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the point kept from the previous bucket
+    and the mean of the next bucket. NaN values are only kept where a whole bucket is NaN.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    y_key = np.where(np.isfinite(y), y, np.nan)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        nlo, nhi = hi, max(edges[b + 2] if b + 2 < len(edges) else n, hi + 1)
+        cur_y, next_y = y_key[lo:hi], y_key[nlo:nhi]
+        # Anchor on the previous kept point; after a NaN point, on the mean of this bucket
+        ay = y_key[a] if np.isfinite(y_key[a]) else (np.nanmean(cur_y) if np.isfinite(cur_y).any() else np.nan)
+        avg_x = x[nlo:nhi].mean()
+        avg_y = np.nanmean(next_y) if np.isfinite(next_y).any() else ay
+        area = np.abs((x[a] - avg_x) * (cur_y - ay) - (x[a] - x[lo:hi]) * (avg_y - ay))
+        area = np.where(np.isfinite(area), area, -1.0)
+        a = lo + int(np.argmax(area))
+        kept[b + 1] = a
+    return np.unique(kept)
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, n_columns: int) -> np.ndarray:
+    """
+    Indices of the first, last, minimum and maximum point in each of `n_columns` equal-width x
+    columns, in ascending x order. `x` need not be sorted.
+    """
+    n = len(x)
+    if n <= 4 * n_columns or n_columns < 1:
+        return np.arange(n)
+    order = np.argsort(x, kind="stable")
+    xs, ys = x[order], y[order]
+    span = xs[-1] - xs[0]
+    col = np.zeros(n, dtype=np.int64) if span <= 0 else np.minimum(
+        ((xs - xs[0]) / span * n_columns).astype(np.int64), n_columns - 1)
+
+    starts = np.flatnonzero(np.diff(col, prepend=-1))
+    ends = np.append(starts[1:], n) - 1
+    # Min and max per column: order by (column, value); NaNs never win
+    by_min = np.lexsort((np.where(np.isfinite(ys), ys, np.inf), col))
+    by_max = np.lexsort((np.where(np.isfinite(ys), -ys, np.inf), col))
+    kept = np.concatenate([starts, ends, by_min[starts], by_max[starts]])
+    return np.sort(order[np.unique(kept)])
+
+
+def decimate(times, values, max_points: Optional[int] = None, method: str = "lttb"):
+    """
+    Downsample a series to at most about `max_points` points for plotting.
+
+    `method` is "lttb" (lines) or "minmax" (step plots and scatters). `max_points` defaults to
+    the budget set with `set_max_plot_points`. Returns (times, values) unchanged when the series
+    is within budget, otherwise the kept subset of each, as the same kinds of sequence.
+    """
+    budget = _MAX_PLOT_POINTS if max_points is None else max_points
+    n = len(values)
+    if not budget or n <= budget or len(times) != n:
+        return times, values
+    x = _x_as_float(times)
+    y = np.asarray(values, dtype=float)
+    if method == "minmax":
+        idx = minmax_indices(x, y, max(budget // 4, 1))
+    elif method == "lttb":
+        idx = lttb_indices(x, y, budget)
+    else:
+        raise ValueError(f"Unknown decimation method {method!r}; use 'lttb' or 'minmax'")
+    return _take(times, idx), _take(values, idx)
+
+
+@timed
 def plot_series(
     ax: Axes,
     times: Sequence[pd.Timestamp],
@@ -75,10 +195,13 @@ def plot_series(
     label: str,
     style: str = "line",
     where: str = "post",
+    max_points: Optional[int] = None,
 ) -> None:
     if style == "step":
+        times, values = decimate(times, values, max_points, method="minmax")
         ax.step(times, values, where=where, label=label)
     else:
+        times, values = decimate(times, values, max_points, method="lttb")
         ax.plot(times, values, label=label)
 
 
@@ -92,9 +215,10 @@ def draw_series_chart(
     caption: Optional[str] = None,
     style: str = "line",
     figsize: Tuple[float, float] = (10.0, 3.4),
+    max_points: Optional[int] = None,
 ) -> None:
     fig, ax = init_fig_ax(figsize=figsize)
-    plot_series(ax, times, values, label=ylabel, style=style)
+    plot_series(ax, times, values, label=ylabel, style=style, max_points=max_points)
     format_and_save(fig, ax, title, ylabel, unit, caption, out_path)
 
 
@@ -138,10 +262,8 @@ def _clip_axis_to_percentile(ax: plt.Axes,
     if vals.size == 0:
         return
     mask = np.isfinite(vals)
-    if warmup_hours and times:
-        t0 = times[0]
-        ages_hr = np.array([(t - t0).total_seconds() / 3600.0 for t in times])
-        mask &= (ages_hr >= float(warmup_hours))
+    if warmup_hours and len(times) > 0:
+        mask &= (elapsed_hours(times) >= float(warmup_hours))
     data = vals[mask]
     if data.size == 0 or not np.isfinite(data).any():
         return
@@ -9,11 +9,13 @@ from typing import Optional, List
 import pandas as pd
 
 from spath.filter import FilterResult
+from spath.instrument import timed
 from spath.metrics import FlowMetricsResult
 
 from spath.plots.core import draw_five_panel_column, draw_five_panel_column_with_scatter
 
 
+@timed
 def plot_five_column_stacks(df, args, filter_result, metrics, out_dir):
     t_scatter_times = df["start_ts"].tolist()
     t_scatter_vals = df["duration_hr"].to_numpy()
@@ -41,6 +43,7 @@ def plot_five_column_stacks(df, args, filter_result, metrics, out_dir):
     return written
 
 
+@timed
 def plot_misc_charts(df: pd.DataFrame,
     args,
     filter_result: Optional[FilterResult],
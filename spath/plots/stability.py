@@ -11,89 +11,12 @@ import pandas as pd
 from matplotlib import pyplot as plt
 
 from spath.filter import FilterResult
-from spath.metrics import compute_elementwise_empirical_metrics, FlowMetricsResult
+from spath.instrument import timed
+from spath.metrics import compute_elementwise_empirical_metrics, compute_total_active_age_series, FlowMetricsResult
 from spath.plots.helpers import format_date_axis, _clip_axis_to_percentile, add_caption
 
 
-def compute_total_active_age_series(
-    df: pd.DataFrame,
-    times: List[pd.Timestamp]
-) -> np.ndarray:
-    """
-    Return R(T) aligned to `times`: total age (HOURS) of ACTIVE elements at T.
-
-    Numerically safe: all prefix sums are done in time **relative to t0** and
-    in float64 HOURS (not ns) to avoid int64 overflows.
-
-    active(T): start <= T and (end > T or end is NaT)
-    window clip: ages measured from s' = max(start, t0), so R(t0) = 0.
-    """
-    n = len(times)
-    R = np.zeros(n, dtype=float)
-    if n == 0:
-        return R
-
-    # Ensure ascending times
-    T_seq: List[pd.Timestamp] = [pd.Timestamp(t) for t in times]
-    t0 = T_seq[0]
-    t0_ns = pd.Timestamp(t0).value  # int64 (ns since epoch)
-
-    # ----------------- Prepare start/end arrays -----------------
-    # Starts (absolute for comparisons; sorted)
-    starts_dt = pd.to_datetime(df["start_ts"]).sort_values().to_numpy(dtype="datetime64[ns]")
-
-    # Ends: only completed items; keep their corresponding starts for subtraction
-    ended = df[df["end_ts"].notna()].copy()
-    ended.sort_values("end_ts", inplace=True)
-    ends_dt = pd.to_datetime(ended["end_ts"]).to_numpy(dtype="datetime64[ns]")
-    ended_starts_dt = pd.to_datetime(ended["start_ts"]).to_numpy(dtype="datetime64[ns]")
-
-    # ----------------- Relative-to-t0 in HOURS (float64) -----------------
-    # Convert to ns int for relative deltas, then to hours
-    starts_ns = starts_dt.astype("int64")
-    starts_rel_h = np.maximum((starts_ns - t0_ns) / 3.6e12, 0.0).astype(np.float64)
-    starts_rel_cumsum_h = np.cumsum(starts_rel_h, dtype=np.float64)
-
-    ended_starts_ns = ended_starts_dt.astype("int64")
-    ended_starts_rel_h = np.maximum((ended_starts_ns - t0_ns) / 3.6e12, 0.0).astype(np.float64)
-    ended_starts_rel_cumsum_h = np.cumsum(ended_starts_rel_h, dtype=np.float64)
-
-    # Pointers over sorted arrays
-    S = starts_dt.size
-    E = ends_dt.size
-    i_s = 0  # count of starts with start <= T
-    i_e = 0  # count of ends   with end   <= T
-
-    # ----------------- Main sweep -----------------
-    for i, T in enumerate(T_seq):
-        T_dt_ns = np.datetime64(T).astype("datetime64[ns]")
-
-        # Advance pointers monotonically
-        while i_s < S and starts_dt[i_s] <= T_dt_ns:
-            i_s += 1
-        while i_e < E and ends_dt[i_e] <= T_dt_ns:
-            i_e += 1
-
-        N_active = i_s - i_e
-        if N_active <= 0:
-            R[i] = 0.0
-            continue
-
-        # Sum of clipped (relative) starts up to T, in HOURS
-        S_le_T_rel_h = starts_rel_cumsum_h[i_s - 1] if i_s > 0 else 0.0
-        S_le_T_ended_rel_h = ended_starts_rel_cumsum_h[i_e - 1] if i_e > 0 else 0.0
-        S_active_rel_h = max(S_le_T_rel_h - S_le_T_ended_rel_h, 0.0)
-
-        # R_h = N_active * (T - t0) [hours] - sum_active_clipped_starts [hours]
-        T_rel_h = (pd.Timestamp(T).value - t0_ns) / 3.6e12  # ns → hours
-        R_h = float(N_active) * T_rel_h - S_active_rel_h
-
-        # Numerical safety: never negative
-        R[i] = max(R_h, 0.0)
-
-    return R
-
-
+@timed
 def plot_rate_stability_charts(
     df: pd.DataFrame,
     args,                 # kept for signature consistency
@@ -112,25 +35,28 @@ def plot_rate_stability_charts(
     written: List[str] = []
 
     # Observation grid
-    times = [pd.Timestamp(t) for t in metrics.times]
-    if not times:
+    times = pd.DatetimeIndex(metrics.times)
+    if len(times) == 0:
         return written
 
     # Elapsed hours since t0
-    t0 = metrics.t0 if hasattr(metrics, "t0") and pd.notna(metrics.t0) else times[0]
-    elapsed_h = np.array([(t - t0).total_seconds() / 3600.0 for t in times], dtype=float)
+    elapsed_h = metrics.elapsed_hours
     denom = np.where(elapsed_h > 0.0, elapsed_h, np.nan)
 
     # Core rate series
     N_raw = np.asarray(metrics.N, dtype=float)
-    R_raw = compute_total_active_age_series(df, times)  # hours
+    R_raw = getattr(metrics, "R", None)  # hours
+    if R_raw is None:
+        R_raw = compute_total_active_age_series(df, times)
+    R_raw = np.asarray(R_raw, dtype=float)
 
     with np.errstate(divide="ignore", invalid="ignore"):
         N_over_T = N_raw / denom
         R_over_T = R_raw / denom
 
     # Dynamic empirical series (for λ* and W*)
-    W_star_ts, lam_star_ts = compute_elementwise_empirical_metrics(df, times).as_tuple()
+    with timed("empirical_metrics"):
+        W_star_ts, lam_star_ts = compute_elementwise_empirical_metrics(df, times).as_tuple()
     w_ts = np.asarray(metrics.w, dtype=float)
 
     # Optional display bits
@@ -285,6 +211,7 @@ def plot_rate_stability_charts(
     return written
 
 
+@timed
 def plot_stability_charts(
     df: pd.DataFrame,
     args,
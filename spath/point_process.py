@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2025 Krishna Kumar
 # SPDX-License-Identifier: MIT
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import numpy as np
 import pandas as pd
 """
 point_process
@@ -131,3 +132,112 @@ def to_arrival_departure_process(df: pd.DataFrame) -> List[Tuple[pd.Timestamp, i
             events.append((et, -1, 0))
     events.sort(key=lambda x: (x[0], -x[1]))
     return events
+
+
+def open_items(df: pd.DataFrame) -> List[Tuple[str, pd.Timestamp]]:
+    """
+    The (id, start_ts) keys of the items in `df` that have no `end_ts` yet.
+
+    Ids need not be unique, so an item is identified by its id together with its start time.
+    """
+    still_open = df[df["end_ts"].isna()]
+    return list(zip(still_open["id"].astype(str), still_open["start_ts"]))
+
+
+def items_seen(df: pd.DataFrame, since: pd.Timestamp) -> int:
+    """The number of items in `df` that start at or before `since` (none if `since` is NaT)."""
+    if pd.isna(since):
+        return 0
+    return int((df["start_ts"] <= since).sum())
+
+
+def items_seen_digest(df: pd.DataFrame, since: pd.Timestamp) -> str:
+    """
+    An order-independent digest of the items in `df` that start at or before `since`, as they
+    were at `since`: their id, start and (if at or before `since`) end. Ends after `since` are
+    left out, so the digest does not change when items open at `since` end later.
+    """
+    if pd.isna(since):
+        return f"{0:016x}"
+    seen = (df["start_ts"] <= since).to_numpy()
+    ended_by_since = (df["end_ts"] <= since).to_numpy()    # False for open items (NaT)
+    rows = pd.DataFrame({
+        "id": df["id"].astype(str).to_numpy()[seen],
+        "start": pd.DatetimeIndex(df["start_ts"]).asi8[seen],
+        "end": np.where(ended_by_since, pd.DatetimeIndex(df["end_ts"]).asi8, np.iinfo(np.int64).min)[seen],
+    })
+    # A sum of row hashes (wrapping at 2**64) does not depend on the order of the rows
+    total = pd.util.hash_pandas_object(rows, index=False).to_numpy().sum(dtype=np.uint64)
+    return f"{int(total):016x}"
+
+
+def to_incremental_arrival_departure_process(
+    df: pd.DataFrame,
+    since: pd.Timestamp,
+    open_keys: List[Tuple[str, pd.Timestamp]],
+    seen: Optional[int] = None,
+    seen_digest: Optional[str] = None,
+) -> Tuple[List[Tuple[pd.Timestamp, int, int]], List[Tuple[str, pd.Timestamp]]]:
+    """
+    The arrival and departure events in a grown export of an append-only item log that were not
+    in an earlier export, whose events were processed up to `since`.
+
+    New events are:
+        - an arrival (and a departure, if it has ended) for every item that starts after `since`, and
+        - a departure for every item in `open_keys` (open in the earlier export) that has since ended.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The current export, with 'id', 'start_ts' and 'end_ts'.
+    since : pd.Timestamp
+        Time up to which events were processed from the earlier export.
+    open_keys : list of (id, start_ts)
+        The items that were open in the earlier export, as returned by `open_items`.
+    seen : int, optional
+        The number of items in the earlier export that start at or before `since`, as returned
+        by `items_seen`. If given, `df` must have the same number of such items.
+    seen_digest : str, optional
+        The digest of those items, as returned by `items_seen_digest`. If given, `df` must have
+        the same items (by id, start and end up to `since`), so that an export that replaces an
+        old item with a backdated one is not mistaken for an append.
+
+    Returns
+    -------
+    (events, open_keys)
+        The new events, sorted as in `to_arrival_departure_process`, and the keys of the items
+        that are open in the current export.
+
+    Raises
+    ------
+    ValueError
+        If a previously open item ended at or before `since`, or if items starting at or before
+        `since` were added to, removed from or changed in the export (a backfill): the export is not
+        append-only past `since`, and the metrics must be recomputed from scratch.
+    """
+    if seen is not None and items_seen(df, since) != seen:
+        raise ValueError(
+            f"The export has {items_seen(df, since)} items starting at or before {since}, "
+            f"where the events already processed had {seen}"
+        )
+    if seen_digest is not None and items_seen_digest(df, since) != seen_digest:
+        raise ValueError(f"The items starting at or before {since} differ from those already processed")
+    ids = df["id"].astype(str)
+    keys = pd.MultiIndex.from_arrays([ids, df["start_ts"]])
+    was_open = keys.isin(open_keys) if open_keys else np.zeros(len(df), dtype=bool)
+    is_new = (df["start_ts"] > since).to_numpy()
+
+    closed = df[was_open & df["end_ts"].notna().to_numpy()]
+    if len(closed) > 0 and closed["end_ts"].min() <= since:
+        raise ValueError(
+            f"An item open at {since} ended at {closed['end_ts'].min()}, before the events already processed"
+        )
+
+    new_items = df[is_new]
+    events: List[Tuple[pd.Timestamp, int, int]] = [(st, +1, 1) for st in new_items["start_ts"]]
+    events += [(et, -1, 0) for et in new_items["end_ts"] if pd.notna(et)]
+    events += [(et, -1, 0) for et in closed["end_ts"]]
+    events.sort(key=lambda x: (x[0], -x[1]))
+
+    now_open = (was_open | is_new) & df["end_ts"].isna().to_numpy()
+    return events, list(zip(ids[now_open], df["start_ts"][now_open]))
@@ -8,26 +8,30 @@ See README.md for context.
 """
 from __future__ import annotations
 
+import os
 import sys
 from argparse import Namespace
-from typing import List, Tuple
-
-import pandas as pd
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 import cli
-from csv_loader import csv_to_dataframe
 from file_utils import ensure_output_dirs, write_cli_args_to_file, copy_input_csv_to_output
-from filter import FilterResult, apply_filters
-from metrics import compute_finite_window_flow_metrics, FlowMetricsResult
-from point_process import to_arrival_departure_process
-from spath.metrics import ElementWiseEmpiricalMetrics, compute_elementwise_empirical_metrics
-from spath.plots.advanced import plot_advanced_charts
-from spath.plots.convergence import plot_convergence_charts
-from spath.plots.core import plot_core_flow_metrics_charts
-from spath.plots.misc import plot_misc_charts
-from spath.plots.stability import plot_stability_charts
+from spath.instrument import TimingRegistry, timed
+
+# pandas, the metric modules and (above all) matplotlib are imported where they are first used,
+# so that --help and --metrics-only runs do not pay for the chart stack at startup.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from spath.cache import CachedAnalysis
+
 
 def produce_all_charts(df,  args, filter_result, metrics, empirical_metrics, out_dir):
+    from spath.plots.advanced import plot_advanced_charts
+    from spath.plots.convergence import plot_convergence_charts
+    from spath.plots.core import plot_core_flow_metrics_charts
+    from spath.plots.misc import plot_misc_charts
+    from spath.plots.stability import plot_stability_charts
+
     written: List[str] = []
     # create plots
     written += plot_core_flow_metrics_charts(df, args, filter_result, metrics, out_dir)
@@ -37,22 +41,177 @@ def produce_all_charts(df,  args, filter_result, metrics, empirical_metrics, out
     written += plot_misc_charts(df, args, filter_result, metrics, out_dir)
     return written
 
+
+def write_metrics_tables(args, metrics, empirical_metrics, out_dir) -> List[str]:
+    # --metrics-only output: the metric series as CSV instead of charts
+    path = os.path.join(out_dir, "core", "flow_metrics.csv")
+    table = metrics.to_dataframe()
+    table["W_star"] = empirical_metrics.W_star
+    table["lam_star"] = empirical_metrics.lam_star
+    table.to_csv(path, index=False)
+    return [path]
+
+
+def _can_resume(args: Namespace) -> bool:
+    # Filters that can drop an item after its arrival was counted (e.g. when it completes)
+    # do not keep the input append-only, so the metrics cannot be resumed under them.
+    unstable = [args.completed, args.incomplete, args.outlier_hours, args.outlier_pctl, args.outlier_iqr]
+    if any(f for f in unstable):
+        print("[INFO] --checkpoint is ignored with completion or outlier filters; recomputing flow metrics")
+        return False
+    return True
+
 # -------------------------------
 # Orchestration
 # -------------------------------
-def run_analysis(csv_path: str, args: Namespace, out_dir: str) -> List[str]:
-    df = csv_to_dataframe(csv_path, args=args)
-    filter_result: FilterResult = apply_filters(df, args)
+def cache_params(args: Namespace) -> dict:
+    """The options that affect the loaded data and the metrics; chart settings are deliberately excluded."""
+    names = [*cli.LOAD_OPTIONS, "completed", "incomplete", "classes",
+             "outlier_hours", "outlier_pctl", "outlier_iqr", "outlier_iqr_two_sided"]
+    return {name: getattr(args, name, None) for name in names}
+
+
+def checkpoint_params(args: Namespace) -> dict:
+    """
+    The options a checkpoint must have been saved under to be resumed: the CSV parsing options,
+    which decide the loaded timestamps, and the class filter.
+    """
+    return {**{name: getattr(args, name, None) for name in cli.LOAD_OPTIONS}, "classes": args.classes}
+
+
+@timed("load")
+def load_input(csv_path: str, args: Namespace):
+    from csv_loader import csv_to_dataframe
+
+    return csv_to_dataframe(csv_path, args=args)
+
+
+def analyze_dataframe(df, args: Namespace) -> CachedAnalysis:
+    """Filter a loaded DataFrame and compute its flow metrics. `df` itself is not modified."""
+    from filter import FilterResult, apply_filters
+    from metrics import compute_finite_window_flow_metrics, FlowMetricsResult
+    from point_process import to_arrival_departure_process
+    from spath.cache import CachedAnalysis
+    from spath.checkpoint import compute_flow_metrics_incrementally
+    from spath.metrics import ElementWiseEmpiricalMetrics, compute_elementwise_empirical_metrics
+
+    with timed("filter"):
+        filter_result: FilterResult = apply_filters(df, args)
     df = filter_result.df
-    # Build arrival departure process
-    arrival_departure_process: List[Tuple[pd.Timestamp, int, int]] = to_arrival_departure_process(df)
-    # Compute core finite window flow metrics
-    metrics: FlowMetricsResult = compute_finite_window_flow_metrics(arrival_departure_process)
+    if getattr(args, "checkpoint", None) and _can_resume(args):
+        # Append-only input: extend the metrics saved by the previous run with the new events only
+        with timed("metrics_checkpoint"):
+            metrics, resumed = compute_flow_metrics_incrementally(df, args.checkpoint, params=checkpoint_params(args))
+        print(f"[INFO] {'Resumed' if resumed else 'Recomputed'} flow metrics; checkpoint at {args.checkpoint}")
+    else:
+        # Build arrival departure process
+        with timed("events"):
+            arrival_departure_process = to_arrival_departure_process(df)
+        # Compute core finite window flow metrics
+        with timed("metrics"):
+            metrics: FlowMetricsResult = compute_finite_window_flow_metrics(arrival_departure_process)
+
+    # Total age of the active items, R(T), for the stability charts
+    with timed("total_active_age"):
+        metrics = metrics.with_total_active_age(df)
 
     # Compute  ElementWiseMetrics once
-    empirical_metrics: ElementWiseEmpiricalMetrics = compute_elementwise_empirical_metrics(df, metrics.times)
+    with timed("empirical_metrics"):
+        empirical_metrics: ElementWiseEmpiricalMetrics = compute_elementwise_empirical_metrics(df, metrics.times)
+    return CachedAnalysis(df=df, filter_result=filter_result, metrics=metrics, empirical_metrics=empirical_metrics)
+
 
-    return produce_all_charts(df, args, filter_result, metrics, empirical_metrics, out_dir)
+def run_analysis(csv_path: str, args: Namespace, out_dir: str) -> List[str]:
+    """
+    Load, analyze and write the outputs for one scenario. The time (and, with --timings-memory,
+    the peak memory) of each stage is written to timings.json and timings.txt in `out_dir`.
+    """
+    timings = TimingRegistry(memory=getattr(args, "timings_memory", False))
+    with timings.activate():
+        written = _run_analysis(csv_path, args, out_dir)
+    print(f"[INFO] Wrote stage timings to {timings.write(out_dir)[1]}")
+    return written
+
+
+def get_analysis(csv_path: str, args: Namespace,
+                 load: Optional[Callable[[], pd.DataFrame]] = None) -> CachedAnalysis:
+    """
+    The analysis of `csv_path` under `args`, from the metrics cache if it has one and computed
+    (and stored in the cache) otherwise. `load` returns the loaded input and is only called when
+    the analysis is computed; by default the CSV is loaded with `load_input`.
+    """
+    from spath.cache import MetricsCache, cache_key
+
+    # The checkpoint already avoids recomputation, and must see every run, so it bypasses the cache.
+    use_cache = not getattr(args, "no_cache", True) and not getattr(args, "checkpoint", None)
+    if use_cache:
+        cache = MetricsCache(args.cache_dir or os.path.join(args.output_dir, ".spath-cache"))
+        key = cache_key(csv_path, cache_params(args))
+        with timed("cache_load"):
+            analysis = cache.load(key)
+        if analysis is not None:
+            print(f"[INFO] Using cached metrics from {cache.path_for(key)}")
+            return analysis
+
+    df = load() if load is not None else load_input(csv_path, args)
+    analysis = analyze_dataframe(df, args)
+    if use_cache:
+        with timed("cache_store"):
+            cache.store(key, analysis)
+    return analysis
+
+
+def _run_analysis(csv_path: str, args: Namespace, out_dir: str) -> List[str]:
+    return write_outputs(get_analysis(csv_path, args), args, out_dir)
+
+
+def write_outputs(analysis: CachedAnalysis, args: Namespace, out_dir: str) -> List[str]:
+    """Write the charts (or, with --metrics-only, the metric tables) for an analysis under `out_dir`."""
+    df, filter_result = analysis.df, analysis.filter_result
+    metrics, empirical_metrics = analysis.metrics, analysis.empirical_metrics
+    metrics_only = getattr(args, "metrics_only", False)
+
+    if metrics_only:
+        with timed("metrics_tables"):
+            written = write_metrics_tables(args, metrics, empirical_metrics, out_dir)
+    else:
+        with timed("charts"):
+            from spath.plots.helpers import set_max_plot_points
+
+            set_max_plot_points(getattr(args, "max_plot_points", None))
+            written = produce_all_charts(df, args, filter_result, metrics, empirical_metrics, out_dir)
+
+    # Trailing-window metrics over the same arrival departure process
+    if getattr(args, "window_days", None):
+        with timed("sliding_window"):
+            import pandas as pd
+            from metrics import compute_sliding_window_flow_metrics
+            from point_process import to_arrival_departure_process
+
+            sliding_metrics = compute_sliding_window_flow_metrics(
+                to_arrival_departure_process(df), pd.Timedelta(days=args.window_days)
+            )
+            if metrics_only:
+                path = os.path.join(out_dir, "core", "sliding_window_metrics.csv")
+                sliding_metrics.to_dataframe().to_csv(path, index=False)
+                written.append(path)
+            else:
+                from spath.plots.core import plot_sliding_window_charts
+                written += plot_sliding_window_charts(args, filter_result, sliding_metrics, out_dir)
+
+    # Per-class metrics from the same load, restricted to --classes if given
+    if getattr(args, "by_class", False):
+        with timed("by_class"):
+            from spath.class_metrics import compute_class_metrics, write_class_tables
+
+            class_results = compute_class_metrics(df, jobs=args.jobs)
+            if metrics_only:
+                written += write_class_tables(class_results, out_dir)
+            else:
+                from spath.plots.classes import plot_class_charts
+                written += plot_class_charts(class_results, args, filter_result, out_dir)
+
+    return written
 
 
 def main():
@@ -68,7 +227,7 @@ def main():
             args,
             out_dir
         )
-        print("Wrote charts:\n" + "\n".join(paths))
+        print(("Wrote metrics:\n" if args.metrics_only else "Wrote charts:\n") + "\n".join(paths))
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
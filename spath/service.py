@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Local HTTP query service for flow metrics.
+
+    python service.py team-a.csv bugs=team-b.csv [--port 8765] [--cache-size 1024]
+
+Dashboards need L(T), Λ(T) and w(T) over arbitrary windows, classes and boundaries. Rather than
+running `sample_path_analysis.py` per request, the service loads each dataset once (with
+`CSVLoader`), indexes it, and answers JSON queries over HTTP on a local port. It only uses the
+standard library server and needs no network access beyond the loopback interface.
+
+Index
+-----
+The sample path of a class is determined by its sorted arrival and departure times. With prefix
+sums of those times, the metrics of the window [t0, T] are a few binary searches away:
+
+    Arrivals(T)   = #arrivals in [t0, T]
+    Departures(T) = #departures <= T
+    N(T)          = #arrivals <= T - #departures <= T
+    A(T)          = ∫_{t0}^{T} N(t) dt, where ∫_{t0}^{T} #{a_i <= t} dt = Σ_i (T - max(a_i, t0))⁺
+    L(T) = A(T) / (T - t0),  Λ(T) = Arrivals(T) / (T - t0),  w(T) = A(T) / Arrivals(T)
+
+These are the finite-window definitions of `compute_finite_window_flow_metrics`. N, A and the
+counts add up over disjoint classes, so a query for several classes sums their indexes. A series
+of k observation times costs O(k log n), whatever the length of the window.
+
+Endpoints
+---------
+Parameters are given in the query string of a GET or as a JSON object in the body of a POST.
+Times are ISO 8601 strings; aware times are converted to UTC, naive times are taken as UTC.
+
+    GET  /datasets   the loaded datasets: items, classes and time span
+    GET  /window     metrics of the window [start, end]
+                     dataset (needed if more than one is loaded), start, end (default: the
+                     first and last event), classes (comma-separated, default all)
+    GET  /series     the metric series at observation times in [start, end]: calendar boundaries
+                     for freq (as in calendar mode, t0 is the first boundary), or explicit times
+    GET  /stats      query counts and result cache statistics
+
+Results are kept in an LRU cache of `--cache-size` recent queries. Errors are returned as
+{"error": message} with status 400 (bad query) or 404 (unknown endpoint or dataset).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from spath.csv_loader import CSVLoader
+from spath.filter import class_keys, parse_classes
+from spath.metrics import calendar_boundaries
+
+_NS_PER_HOUR = 3_600_000_000_000
+_MAX_SERIES_POINTS = 200_000
+
+
+class QueryError(ValueError):
+    """A query the service cannot answer; reported to the client with `status`."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class PrefixIndex:
+    """Sorted arrival and departure times of a set of items, with prefix sums of the times in hours."""
+
+    def __init__(self, arrivals_ns: np.ndarray, departures_ns: np.ndarray, ref_ns: int):
+        self.ref_ns = ref_ns
+        self.arr = np.sort(np.asarray(arrivals_ns, dtype=np.int64))
+        self.dep = np.sort(np.asarray(departures_ns, dtype=np.int64))
+        # Times in hours relative to ref_ns: the sums of raw ns epochs would overflow int64
+        self._arr_sum = np.concatenate([[0.0], np.cumsum((self.arr - ref_ns) / _NS_PER_HOUR)])
+        self._dep_sum = np.concatenate([[0.0], np.cumsum((self.dep - ref_ns) / _NS_PER_HOUR)])
+
+    def _area_under_count(self, times: np.ndarray, prefix: np.ndarray, t0_ns: int, T_ns: np.ndarray) -> np.ndarray:
+        # ∫_{t0}^{T} #{x_i <= t} dt in hours, for each T >= t0
+        n_t0 = np.searchsorted(times, t0_ns, side="right")
+        n_T = np.searchsorted(times, T_ns, side="right")
+        h_t0 = (t0_ns - self.ref_ns) / _NS_PER_HOUR
+        h_T = (T_ns - self.ref_ns) / _NS_PER_HOUR
+        return n_t0 * (h_T - h_t0) + (n_T - n_t0) * h_T - (prefix[n_T] - prefix[n_t0])
+
+    def counts(self, t0_ns: int, T_ns: np.ndarray) -> Dict[str, np.ndarray]:
+        """N, A, Arrivals and Departures at each T in `T_ns` (sorted or not) for the window starting at t0."""
+        arr_le_T = np.searchsorted(self.arr, T_ns, side="right")
+        dep_le_T = np.searchsorted(self.dep, T_ns, side="right")
+        return {
+            "N": (arr_le_T - dep_le_T).astype(float),
+            "A": (self._area_under_count(self.arr, self._arr_sum, t0_ns, T_ns)
+                  - self._area_under_count(self.dep, self._dep_sum, t0_ns, T_ns)),
+            "Arrivals": (arr_le_T - np.searchsorted(self.arr, t0_ns, side="left")).astype(float),
+            "Departures": dep_le_T.astype(float),
+        }
+
+
+def _metrics(counts: Dict[str, np.ndarray], t0_ns: int, T_ns: np.ndarray) -> Dict[str, np.ndarray]:
+    elapsed = (T_ns - t0_ns) / _NS_PER_HOUR
+    A, arrivals = counts["A"], counts["Arrivals"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        L = np.where(elapsed > 0, A / elapsed, np.nan)
+        Lam = np.where(elapsed > 0, arrivals / elapsed, np.nan)
+        w = np.where(arrivals > 0, A / arrivals, np.nan)
+    return {"L": L, "Lambda": Lam, "w": w, **counts}
+
+
+class Dataset:
+    """A loaded item table, indexed per class."""
+
+    def __init__(self, name: str, df: pd.DataFrame, class_column: str = "class"):
+        self.name = name
+        self.items = len(df)
+        starts = df["start_ts"].to_numpy("datetime64[ns]").astype(np.int64)
+        end_ts = df["end_ts"].to_numpy("datetime64[ns]")
+        ended = ~np.isnat(end_ts)
+        ends = end_ts.astype(np.int64)
+        self.first_ns = int(starts.min()) if len(starts) else 0
+        self.last_ns = int(max(starts.max(), ends[ended].max() if ended.any() else starts.max())) if len(starts) else 0
+
+        self.all = PrefixIndex(starts, ends[ended], self.first_ns)
+        self.by_class: Dict[str, PrefixIndex] = {}
+        if class_column in df.columns:
+            # Split once on the distinct (lowercased) levels, as the class filter matches them
+            codes, levels = pd.factorize(class_keys(df[class_column]))
+            for code, level in enumerate(levels):
+                rows = codes == code
+                self.by_class[str(level)] = PrefixIndex(starts[rows], ends[rows & ended], self.first_ns)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "items": self.items,
+            "classes": sorted(self.by_class),
+            "first_event": _iso(self.first_ns),
+            "last_event": _iso(self.last_ns),
+        }
+
+    def _indexes(self, classes: Optional[List[str]]) -> List[PrefixIndex]:
+        if not classes:
+            return [self.all]
+        unknown = [c for c in classes if c not in self.by_class]
+        if unknown:
+            raise QueryError(f"Unknown classes for dataset {self.name!r}: {unknown}")
+        return [self.by_class[c] for c in classes]
+
+    def evaluate(self, t0_ns: int, T_ns: np.ndarray, classes: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Flow metrics at the times `T_ns` (int64 ns, each >= t0_ns) of the window starting at t0."""
+        total: Dict[str, np.ndarray] = {}
+        for index in self._indexes(classes):
+            for name, values in index.counts(t0_ns, T_ns).items():
+                total[name] = total[name] + values if name in total else values
+        return _metrics(total, t0_ns, T_ns)
+
+
+def load_dataset(name: str, path: str, loader: Optional[CSVLoader] = None) -> Dataset:
+    loader = loader if loader is not None else CSVLoader()
+    return Dataset(name, loader.load(path))
+
+
+# ---------- queries ----------
+
+def _iso(ns: int) -> str:
+    return pd.Timestamp(ns).isoformat()
+
+
+def _json_values(values: np.ndarray) -> List[Optional[float]]:
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+def _parse_time(value: Any, what: str) -> int:
+    try:
+        t = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"Invalid {what}: {value!r}")
+    if pd.isna(t):
+        raise QueryError(f"Invalid {what}: {value!r}")
+    if t.tz is not None:
+        t = t.tz_convert("UTC").tz_localize(None)
+    return t.value
+
+
+class FlowMetricsService:
+    """Answers window and series queries over a set of datasets, with an LRU cache of results."""
+
+    def __init__(self, datasets: Sequence[Dataset], cache_size: int = 1024):
+        self.datasets: Dict[str, Dataset] = {d.name: d for d in datasets}
+        self.queries = 0
+        self._lock = threading.Lock()
+        # Results are cached as encoded JSON, so that a hit is returned without any work
+        self._cached = lru_cache(maxsize=cache_size)(self._answer)
+
+    def query(self, route: str, params: Dict[str, Any]) -> bytes:
+        """The JSON response for `route` with `params`. Raises QueryError."""
+        with self._lock:
+            self.queries += 1
+        if route == "/datasets":
+            return json.dumps({"datasets": [d.describe() for d in self.datasets.values()]}).encode()
+        if route == "/stats":
+            info = self._cached.cache_info()
+            return json.dumps({"queries": self.queries, "cache": {"hits": info.hits, "misses": info.misses,
+                                                                  "size": info.currsize, "max_size": info.maxsize}}).encode()
+        if route not in ("/window", "/series"):
+            raise QueryError(f"Unknown endpoint {route!r}", status=404)
+        return self._cached(route, json.dumps(params, sort_keys=True))
+
+    def _dataset(self, params: Dict[str, Any]) -> Dataset:
+        name = params.get("dataset")
+        if name is None:
+            if len(self.datasets) != 1:
+                raise QueryError(f"Give a dataset: one of {sorted(self.datasets)}")
+            return next(iter(self.datasets.values()))
+        if name not in self.datasets:
+            raise QueryError(f"Unknown dataset {name!r}: one of {sorted(self.datasets)}", status=404)
+        return self.datasets[name]
+
+    def _answer(self, route: str, params_json: str) -> bytes:
+        params = json.loads(params_json)
+        ds = self._dataset(params)
+        classes = params.get("classes")
+        if isinstance(classes, list):
+            classes = ",".join(str(c) for c in classes)
+        classes = parse_classes(classes)
+        start_ns = _parse_time(params["start"], "start") if params.get("start") else ds.first_ns
+        end_ns = _parse_time(params["end"], "end") if params.get("end") else ds.last_ns
+        if end_ns < start_ns:
+            raise QueryError("end must not be before start")
+
+        if route == "/window":
+            T_ns = np.array([end_ns], dtype=np.int64)
+            values = ds.evaluate(start_ns, T_ns, classes)
+            return json.dumps({"dataset": ds.name, "start": _iso(start_ns), "end": _iso(end_ns),
+                               "classes": classes, **{k: _json_values(v)[0] for k, v in values.items()}}).encode()
+
+        if params.get("times"):
+            times = params["times"]
+            if isinstance(times, str):
+                times = times.split(",")
+            T_ns = np.array([_parse_time(t, "time") for t in times], dtype=np.int64)
+            if (T_ns < start_ns).any():
+                raise QueryError("Observation times must not be before start")
+            t0_ns = start_ns
+        elif params.get("freq"):
+            try:
+                bounds = calendar_boundaries(pd.Timestamp(start_ns), pd.Timestamp(end_ns), params["freq"])
+            except ValueError as e:
+                raise QueryError(str(e))
+            T_ns = bounds.asi8
+            t0_ns = int(T_ns[0]) if len(T_ns) else start_ns
+        else:
+            raise QueryError("A series needs freq or times")
+        if len(T_ns) > _MAX_SERIES_POINTS:
+            raise QueryError(f"Too many observation times ({len(T_ns)}); at most {_MAX_SERIES_POINTS}")
+
+        values = ds.evaluate(t0_ns, T_ns, classes)
+        return json.dumps({"dataset": ds.name, "t0": _iso(t0_ns), "classes": classes,
+                           "times": np.datetime_as_string(T_ns.astype("datetime64[ns]"), unit="s").tolist(),
+                           **{k: _json_values(v) for k, v in values.items()}}).encode()
+
+
+# ---------- HTTP ----------
+
+class _Handler(BaseHTTPRequestHandler):
+    service: FlowMetricsService
+    quiet: bool = True
+
+    def _respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, params: Dict[str, Any]) -> None:
+        route = urlparse(self.path).path.rstrip("/") or "/"
+        try:
+            body = self.service.query(route, params)
+        except QueryError as e:
+            self._respond(e.status, json.dumps({"error": str(e)}).encode())
+        except Exception as e:  # a bug must not take the service down
+            self._respond(500, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode())
+        else:
+            self._respond(200, body)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._handle({k: v[-1] for k, v in query.items()})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            self._respond(400, json.dumps({"error": f"Invalid JSON body: {e}"}).encode())
+            return
+        self._handle(params)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(service: FlowMetricsService, host: str = "127.0.0.1", port: int = 8765,
+                quiet: bool = True) -> ThreadingHTTPServer:
+    """An HTTP server for `service` (not yet serving; call serve_forever). Port 0 picks a free port."""
+    handler = type("FlowMetricsHandler", (_Handler,), {"service": service, "quiet": quiet})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def _dataset_arg(spec: str) -> Tuple[str, str]:
+    # "name=path" or just "path" (named after the file)
+    name, sep, path = spec.partition("=")
+    return (name, path) if sep else (Path(spec).stem, spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve flow metric queries over local datasets")
+    parser.add_argument("datasets", nargs="+", help="CSV files to load, as PATH or NAME=PATH")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default 8765)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Number of recent query results to keep")
+    parser.add_argument("--date-format", type=str, default=None,
+                        help="Explicit datetime format string for parsing the timestamps")
+    parser.add_argument("--delimiter", type=str, default=None, help="CSV delimiter (default: detected)")
+    parser.add_argument("--dayfirst", action="store_true", default=False,
+                        help="Interpret ambiguous dates as day-first")
+    parser.add_argument("--verbose", action="store_true", default=False, help="Log every request")
+    args = parser.parse_args(argv)
+
+    loader = CSVLoader(date_format=args.date_format, dayfirst=args.dayfirst, delimiter=args.delimiter)
+    datasets = []
+    for name, path in map(_dataset_arg, args.datasets):
+        start = time.perf_counter()
+        try:
+            datasets.append(load_dataset(name, path, loader))
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot load {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"[INFO] Loaded {name}: {datasets[-1].items} items in {time.perf_counter() - start:.2f}s")
+
+    server = make_server(FlowMetricsService(datasets, cache_size=args.cache_size),
+                         host=args.host, port=args.port, quiet=not args.verbose)
+    print(f"[INFO] Serving on http://{args.host}:{server.server_address[1]}/ (Ctrl-C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
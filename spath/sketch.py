@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Mergeable quantile sketch.
+
+The percentile and IQR outlier filters need quantiles of the completed durations. When data
+arrives in chunks (or across incremental runs) the full duration array is not at hand, so the
+quantiles come from a sketch instead: a compact summary that is updated with each chunk, can
+be merged with sketches of other chunks, and is saved with the metrics checkpoint.
+
+`QuantileSketch` is a KLL-style sketch (Karnin, Lang & Liberty, 2016). Values are kept in a
+stack of levels; an item at level h stands for 2**h input values. When a level exceeds its
+capacity it is sorted and every other item is promoted to the next level. Capacities shrink
+geometrically (by 2/3) from the top level down, so the sketch holds about 3k values however
+many it has seen, and the normalized rank error of a quantile is about 1.65 / k.
+
+Until the first compaction the sketch holds every value and its quantiles are exact (linearly
+interpolated, as `np.percentile`). Compactions alternate between keeping the even and the odd
+items of a level rather than choosing at random, so results are reproducible.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Normalized rank error ~ _ERROR_CONSTANT / k for a single quantile
+_ERROR_CONSTANT = 1.65
+_MIN_CAPACITY = 8
+
+
+class QuantileSketch:
+    """A KLL-style mergeable sketch of the quantiles of a stream of floats."""
+
+    def __init__(self, k: int = 200):
+        if k < _MIN_CAPACITY:
+            raise ValueError(f"k must be at least {_MIN_CAPACITY} (got {k})")
+        self.k = int(k)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._parity: List[int] = [0]
+
+    @classmethod
+    def with_rank_error(cls, epsilon: float) -> QuantileSketch:
+        """A sketch sized for a normalized rank error of about `epsilon` (e.g. 0.01)."""
+        if not (0.0 < epsilon < 1.0):
+            raise ValueError(f"Rank error must be between 0 and 1 (got {epsilon})")
+        return cls(k=max(_MIN_CAPACITY, math.ceil(_ERROR_CONSTANT / epsilon)))
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], k: int = 200) -> QuantileSketch:
+        sketch = cls(k=k)
+        sketch.update(values)
+        return sketch
+
+    @property
+    def rank_error(self) -> float:
+        """Approximate normalized rank error of a quantile; 0 while the sketch is still exact."""
+        return 0.0 if self.is_exact else _ERROR_CONSTANT / self.k
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self._levels) == 1
+
+    @property
+    def retained(self) -> int:
+        """Number of values held by the sketch."""
+        return sum(len(level) for level in self._levels)
+
+    # ---------- updates ----------
+
+    def update(self, values: Iterable[float]) -> QuantileSketch:
+        """Add a chunk of values. NaN and infinite values are ignored."""
+        chunk = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=float).ravel()
+        chunk = chunk[np.isfinite(chunk)]
+        if chunk.size == 0:
+            return self
+        self.count += int(chunk.size)
+        self.min = min(self.min, float(chunk.min()))
+        self.max = max(self.max, float(chunk.max()))
+        self._levels[0] = np.concatenate([self._levels[0], chunk])
+        self._compress()
+        return self
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """Merge another sketch into this one (in place). The result keeps this sketch's k."""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+            self._parity.append(0)
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.concatenate([self._levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - 1 - h
+        return max(_MIN_CAPACITY, math.ceil(self.k * (2.0 / 3.0) ** depth))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) <= self._capacity(h):
+                h += 1
+                continue
+            if h + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+                self._parity.append(0)
+            level = np.sort(level)
+            # An odd item out stays at this level; the rest are halved into the next level.
+            rest, level = level[len(level) - len(level) % 2:], level[:len(level) - len(level) % 2]
+            promoted = level[self._parity[h]::2]
+            self._parity[h] ^= 1
+            self._levels[h] = rest
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1], promoted])
+            # Adding a level lowers the capacities below it, so recheck from the bottom.
+            h = 0
+
+    # ---------- queries ----------
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """Quantiles for probabilities `qs` in [0, 1]. NaN for an empty sketch."""
+        qs = np.asarray(list(qs) if not isinstance(qs, np.ndarray) else qs, dtype=float)
+        if np.any((qs < 0.0) | (qs > 1.0)):
+            raise ValueError("Quantile probabilities must be between 0 and 1")
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        if self.is_exact:
+            return np.percentile(self._levels[0], qs * 100.0)
+
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        values, cum_weight = values[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum_weight, qs * self.count, side="left")
+        out = values[np.minimum(idx, len(values) - 1)]
+        out = np.where(qs <= 0.0, self.min, np.where(qs >= 1.0, self.max, out))
+        return np.clip(out, self.min, self.max)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def percentiles(self, ps: Iterable[float]) -> np.ndarray:
+        """Percentiles for `ps` in [0, 100], as `np.percentile`."""
+        return self.quantiles(np.asarray(list(ps) if not isinstance(ps, np.ndarray) else ps, dtype=float) / 100.0)
+
+    def percentile(self, p: float) -> float:
+        return float(self.percentiles([p])[0])
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A JSON-serializable representation, read back by `from_dict`."""
+        return {
+            "k": self.k,
+            "count": self.count,
+            "min": None if self.count == 0 else self.min,
+            "max": None if self.count == 0 else self.max,
+            "levels": [level.tolist() for level in self._levels],
+            "parity": list(self._parity),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> QuantileSketch:
+        sketch = cls(k=payload["k"])
+        sketch.count = int(payload["count"])
+        if sketch.count:
+            sketch.min = float(payload["min"])
+            sketch.max = float(payload["max"])
+        sketch._levels = [np.asarray(level, dtype=float) for level in payload["levels"]] or [np.empty(0)]
+        sketch._parity = [int(p) for p in payload["parity"]] or [0]
+        if len(sketch._parity) != len(sketch._levels):
+            raise ValueError("Malformed quantile sketch: levels and parities differ in length")
+        return sketch
+
+    def __repr__(self) -> str:
+        return (f"QuantileSketch(k={self.k}, count={self.count}, retained={self.retained}, "
+                f"levels={len(self._levels)})")
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+"""
+Live tail mode: follow a growing event log, like `tail -f`.
+
+    python tail.py events.csv --output-dir live [--freq day] [--interval 2] [--write-every 30]
+
+The log is a CSV (with a header row) or NDJSON file of items, with the same columns as the input
+of `sample_path_analysis.py` (see `CSVLoader`). Rows are only ever appended: a new item is
+appended when it starts, and an item that ends is appended again, with the same id and start_ts
+and its end_ts filled in. The latest row for an (id, start_ts) key is the current state of the item.
+
+Only the bytes appended since the last poll are read and parsed. Their rows become arrival and
+departure events, which extend the finite-window flow metrics from the saved sample path state
+(`FlowMetricsResult.extend`), so the history is never re-parsed or re-swept. The metrics are the
+same as those `sample_path_analysis.py` computes from the whole log.
+
+Events are held back until a later event time has been seen (or for `--lateness` beyond that),
+so rows for the same instant can arrive in separate polls. Rows for times that have already
+been processed (an arrival or departure later than `--lateness` allows) cannot be added to the
+sample path; they are counted and reported instead.
+
+A reader task polls the log every `--interval` seconds. A writer task rewrites the outputs at
+most every `--write-every` seconds, off the event loop so that polling continues while charts render:
+
+    - flow_metrics.csv            the metric series (FlowMetricsResult.to_dataframe)
+    - flow_buckets.csv            per-bucket values, with --freq (FlowMetricsResult.to_bucket_dataframe)
+    - sample_path_flow_metrics.png N(t), L(T), Λ(T) and w(T), unless --no-charts
+
+Files are replaced atomically, so readers never see a partial file. With --once, the log is read
+to its end, the outputs are written and the command exits.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+import warnings
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from spath.csv_loader import CSVLoader
+from spath.metrics import FlowMetricsResult, compute_finite_window_flow_metrics
+
+Event = Tuple[pd.Timestamp, int, int]
+Key = Tuple[str, int]  # (id, start_ts in ns): ids need not be unique
+
+
+def _log_format(path: str, fmt: Optional[str]) -> str:
+    if fmt is not None:
+        return fmt
+    return "ndjson" if Path(path).suffix.lower() in (".ndjson", ".jsonl") else "csv"
+
+
+class LogFollower:
+    """
+    Incremental finite-window flow metrics over an append-only item log.
+
+    `poll()` reads and ingests the rows appended since the last call; `flush()` sweeps the events
+    that are ready into `metrics`. Both are synchronous; `follow` drives them from an event loop.
+    """
+
+    def __init__(self, path: str, loader: Optional[CSVLoader] = None, fmt: Optional[str] = None,
+                 freq: Optional[str] = None, lateness: pd.Timedelta | str = "0s"):
+        self.path = str(path)
+        self.format = _log_format(self.path, fmt)
+        if self.format not in ("csv", "ndjson"):
+            raise ValueError(f"Unsupported log format {self.format!r}: use 'csv' or 'ndjson'")
+        self.loader = loader if loader is not None else CSVLoader(warn_on_empty=False,
+                                                                  error_on_all_invalid_times=False)
+        self.freq = freq
+        self.lateness = pd.Timedelta(lateness)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all state and start again from the beginning of the log."""
+        self.metrics: Optional[FlowMetricsResult] = None
+        self.rows = 0
+        self.late_rows = 0
+        self._offset = 0
+        self._partial = b""
+        self._header: Optional[bytes] = None
+        self._sep: Optional[str] = None
+        self._open: Dict[Key, int] = {}
+        self._recent: Dict[Key, int] = {}  # items with a held-back arrival, by start ns
+        self._buffer: List[Event] = []
+        self._max_seen = pd.NaT
+
+    # ---------- state ----------
+
+    @property
+    def open_items(self) -> int:
+        return len(self._open)
+
+    @property
+    def held_back(self) -> int:
+        return len(self._buffer)
+
+    def processed_until(self) -> pd.Timestamp:
+        """Latest event time swept into the metrics; later events can still be added."""
+        if self.metrics is None or self.metrics.state is None:
+            return pd.NaT
+        state = self.metrics.state
+        return state.last_time if pd.isna(state.watermark) else max(state.last_time, state.watermark)
+
+    # ---------- reading ----------
+
+    def _read_new_lines(self, at_end: bool = False) -> List[bytes]:
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return []
+        if size < self._offset:
+            warnings.warn(f"{self.path} was truncated; starting again from its beginning", RuntimeWarning)
+            self.reset()
+        data = b""
+        if size > self._offset:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            self._offset += len(data)
+        lines = (self._partial + data).split(b"\n")
+        # An incomplete last line waits for the rest of it, unless the log is known to be complete
+        self._partial = b"" if at_end else lines.pop()
+        return [ln.rstrip(b"\r") for ln in lines if ln.strip()]
+
+    def _parse(self, lines: List[bytes]) -> pd.DataFrame:
+        if self.format == "ndjson":
+            records = []
+            for ln in lines:
+                try:
+                    records.append(json.loads(ln))
+                except json.JSONDecodeError:
+                    warnings.warn(f"Skipping malformed NDJSON line: {ln[:80]!r}", RuntimeWarning)
+            raw = pd.DataFrame.from_records(records) if records else pd.DataFrame()
+        else:
+            if self._header is None:
+                self._header, lines = lines[0], lines[1:]
+                self._sep = self.loader.resolve_delimiter(self.path)
+            if not lines:
+                return pd.DataFrame()
+            raw = pd.read_csv(io.BytesIO(b"\n".join([self._header] + lines)), sep=self._sep,
+                              dtype={self.loader.required_columns[0]: str})
+        if raw.empty:
+            return raw
+        return self.loader.prepare(raw)
+
+    def poll(self, at_end: bool = False) -> int:
+        """
+        Read and ingest the complete rows appended since the last poll. Returns the number of rows.
+        With `at_end`, the log is taken to be complete and a last line without a newline is read too.
+        """
+        lines = self._read_new_lines(at_end)
+        if not lines:
+            return 0
+        df = self._parse(lines)
+        if not df.empty:
+            self.ingest(df)
+        return len(df)
+
+    # ---------- events ----------
+
+    def ingest(self, df: pd.DataFrame) -> None:
+        """Turn item rows (in the `CSVLoader` DataFrame contract) into held-back events."""
+        self.rows += len(df)
+        # Within a chunk, the last row for a key is the item's current state
+        ids = df["id"].astype(str).to_numpy()
+        starts = df["start_ts"].to_numpy("datetime64[ns]").astype(np.int64)
+        ends = df["end_ts"].to_numpy("datetime64[ns]")
+        latest: Dict[Key, int] = {}
+        for i, key in enumerate(zip(ids, starts.tolist())):
+            latest[key] = i
+
+        since = self.processed_until()
+        since_ns = -np.inf if pd.isna(since) else since.value
+        events = self._buffer
+        for key, i in latest.items():
+            end = ends[i]
+            ended = not np.isnat(end)
+            if key in self._open:
+                if ended:
+                    del self._open[key]
+                    end_ts = pd.Timestamp(end)
+                    if end_ts.value <= since_ns:
+                        self.late_rows += 1  # the item stays counted in N(t)
+                    else:
+                        events.append((end_ts, -1, 0))
+            elif key in self._recent or key[1] <= since_ns:
+                # Restates a known item, or arrives too late to be added to the sample path
+                if key not in self._recent:
+                    self.late_rows += 1
+            else:
+                self._recent[key] = key[1]
+                events.append((pd.Timestamp(key[1]), +1, 1))
+                if ended:
+                    events.append((pd.Timestamp(end), -1, 0))
+                else:
+                    self._open[key] = key[1]
+        if events:
+            latest_time = max(e[0] for e in events)
+            self._max_seen = latest_time if pd.isna(self._max_seen) else max(self._max_seen, latest_time)
+
+    def flush(self, final: bool = False) -> int:
+        """
+        Sweep the held-back events that are ready into `metrics`: those before the latest event time
+        seen less the lateness allowance, or all of them if `final`. Returns the number of events swept.
+        """
+        if not self._buffer:
+            return 0
+        self._buffer.sort(key=lambda e: (e[0], -e[1]))
+        n_ready = len(self._buffer)
+        if not final:
+            cutoff = self._max_seen - self.lateness
+            n_ready = bisect_left([e[0] for e in self._buffer], cutoff)
+        if n_ready == 0:
+            return 0
+        ready, self._buffer = self._buffer[:n_ready], self._buffer[n_ready:]
+        if self.metrics is None:
+            self.metrics = compute_finite_window_flow_metrics(ready, freq=self.freq)
+        else:
+            self.metrics = self.metrics.extend(ready)
+        since_ns = self.processed_until().value
+        self._recent = {k: s for k, s in self._recent.items() if s > since_ns}
+        return n_ready
+
+    def status(self) -> str:
+        through = "-" if self.metrics is None else f"{self.metrics.tn}"
+        late = f", {self.late_rows} late rows ignored" if self.late_rows else ""
+        return (f"{self.rows} rows, {self.open_items} open items, {self.held_back} events held back, "
+                f"metrics through {through}{late}")
+
+
+# ---------- outputs ----------
+
+def _replace(path: str, write) -> str:
+    # Write through a temporary file so that readers never see a partial file
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{ext}"
+    write(tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def write_outputs(metrics: FlowMetricsResult, out_dir: str, charts: bool = True,
+                  caption: Optional[str] = None) -> List[str]:
+    """Rewrite the live outputs for `metrics` in `out_dir`. Returns the paths written."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = [_replace(os.path.join(out_dir, "flow_metrics.csv"),
+                        lambda p: metrics.to_dataframe().to_csv(p, index=False))]
+    if metrics.mode == "calendar" and len(metrics.times) > 1:
+        written.append(_replace(os.path.join(out_dir, "flow_buckets.csv"),
+                                lambda p: metrics.to_bucket_dataframe().to_csv(p, index=False)))
+    if charts and len(metrics.times) > 0:
+        from spath.plots.core import draw_four_panel_column
+
+        written.append(_replace(
+            os.path.join(out_dir, "sample_path_flow_metrics.png"),
+            lambda p: draw_four_panel_column(metrics.times, metrics.N, metrics.L, metrics.Lambda, metrics.w,
+                                             "Sample Path Flow Metrics (live)", p, caption=caption)))
+    return written
+
+
+async def follow(follower: LogFollower, out_dir: str, interval: float = 2.0, write_every: float = 30.0,
+                 charts: bool = True, once: bool = False, quiet: bool = False) -> FlowMetricsResult:
+    """
+    Follow `follower`'s log until cancelled (or, with `once`, until its end), rewriting the outputs
+    in `out_dir` at most every `write_every` seconds. Returns the last metrics.
+    """
+    dirty = asyncio.Event()
+    done = asyncio.Event()
+
+    async def reader():
+        try:
+            while True:
+                rows = await asyncio.to_thread(follower.poll)
+                if once and rows == 0:
+                    await asyncio.to_thread(follower.poll, True)
+                swept = follower.flush(final=once and rows == 0)
+                if swept:
+                    dirty.set()
+                if once and rows == 0:
+                    return
+                if rows == 0:
+                    await asyncio.sleep(interval)
+        finally:
+            done.set()
+            dirty.set()
+
+    async def writer():
+        last_write = -np.inf
+        while not done.is_set() or dirty.is_set():
+            await dirty.wait()
+            dirty.clear()
+            if once and not done.is_set():
+                continue  # a single write once the log has been read to its end
+            if not done.is_set():
+                # Throttle: coalesce the updates of the next few polls into one write
+                await asyncio.sleep(max(0.0, last_write + write_every - time.monotonic()))
+                dirty.clear()
+            metrics = follower.metrics  # results are immutable; extend returns a new one
+            if metrics is not None:
+                caption = f"Following {os.path.basename(follower.path)}: {follower.status()}"
+                await asyncio.to_thread(write_outputs, metrics, out_dir, charts, caption)
+                if not quiet:
+                    print(f"[INFO] {follower.status()}", flush=True)
+            last_write = time.monotonic()
+
+    read_task = asyncio.create_task(reader())
+    try:
+        await asyncio.gather(read_task, writer())
+    finally:
+        read_task.cancel()
+    return follower.metrics
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Follow a growing item log and keep its flow metrics up to date")
+    parser.add_argument("log", type=str, help="Path to a CSV or NDJSON item log that only grows")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None,
+                        help="Log format (default: from the file extension; .ndjson/.jsonl are NDJSON)")
+    parser.add_argument("--output-dir", type=str, default="live",
+                        help="Directory for the live outputs (default: live)")
+    parser.add_argument("--freq", type=str, default=None,
+                        help="Calendar frequency for the observation times (e.g. day, hour, 15min). "
+                             "Default: every event time, as sample_path_analysis.py")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Seconds between polls of the log when it has not grown (default 2)")
+    parser.add_argument("--write-every", type=float, default=30.0,
+                        help="Rewrite the outputs at most this often, in seconds (default 30)")
+    parser.add_argument("--lateness", type=str, default="0s",
+                        help="How long to hold events back for rows that arrive out of order (e.g. 5min)")
+    parser.add_argument("--no-charts", action="store_true", default=False,
+                        help="Only write the metric tables")
+    parser.add_argument("--once", action="store_true", default=False,
+                        help="Read the log to its end, write the outputs and exit")
+    parser.add_argument("--date-format", type=str, default=None,
+                        help="Explicit datetime format string for parsing the timestamps")
+    parser.add_argument("--delimiter", type=str, default=None,
+                        help="CSV delimiter (default: detected)")
+    parser.add_argument("--dayfirst", action="store_true", default=False,
+                        help="Interpret ambiguous dates as day-first")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    loader = CSVLoader(date_format=args.date_format, dayfirst=args.dayfirst, delimiter=args.delimiter,
+                       warn_on_empty=False, error_on_all_invalid_times=False)
+    try:
+        follower = LogFollower(args.log, loader=loader, fmt=args.format, freq=args.freq,
+                               lateness=args.lateness)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        asyncio.run(follow(follower, args.output_dir, interval=args.interval, write_every=args.write_every,
+                           charts=not args.no_charts, once=args.once))
+    except KeyboardInterrupt:
+        # Sweep what is held back and leave the outputs current
+        follower.flush(final=True)
+        if follower.metrics is not None:
+            write_outputs(follower.metrics, args.output_dir, charts=not args.no_charts)
+        print(f"[INFO] Stopped: {follower.status()}")
+
+
+if __name__ == "__main__":
+    main()
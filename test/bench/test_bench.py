@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+import pytest
+
+from bench import workloads
+from bench.cases import CASES
+from bench.cli import main, parse_scales
+from bench.runner import Measurement, compare, load_results, measure, save_results
+
+
+def test_workloads_are_reproducible():
+    a = workloads.items(500, seed=7)
+    b = workloads.items(500, seed=7)
+    assert a.equals(b)
+    assert not a.equals(workloads.items(500, seed=8))
+    assert 0 < a["end_ts"].isna().mean() < 0.2
+    assert (a["end_ts"].dropna() >= a.loc[a["end_ts"].notna(), "start_ts"]).all()
+
+    ps = workloads.presences(400, seed=7)
+    assert len(ps) == 400
+    assert [p.onset_time for p in ps] == [p.onset_time for p in workloads.presences(400, seed=7)]
+    assert all(p.reset_time > p.onset_time for p in ps)
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_every_case_runs_at_a_small_size(name):
+    m = measure(CASES[name], 300, repeats=2)
+    assert m.case == name and m.n == 300 and m.repeats == 2
+    assert 0 < m.best_s <= m.median_s
+    assert m.peak_bytes > 0
+
+
+def test_measure_rejects_zero_repeats():
+    with pytest.raises(ValueError):
+        measure(CASES["pcalc.closure"], 100, repeats=0)
+
+
+def test_compare_flags_time_and_memory_regressions():
+    base = {m.key: m for m in [
+        Measurement("a", 10, 3, best_s=1.0, median_s=1.0, peak_bytes=100),
+        Measurement("b", 10, 3, best_s=1.0, median_s=1.0, peak_bytes=100),
+    ]}
+    current = [
+        Measurement("a", 10, 3, best_s=1.4, median_s=1.5, peak_bytes=110),
+        Measurement("b", 10, 3, best_s=0.5, median_s=0.5, peak_bytes=200),
+        Measurement("c", 10, 3, best_s=9.0, median_s=9.0, peak_bytes=999),
+    ]
+    by_key = {c.key: c for c in compare(current, base, time_tolerance=0.5, memory_tolerance=0.2)}
+    assert not by_key["a/10"].regressed
+    assert by_key["a/10"].time_ratio == pytest.approx(1.4)
+    assert by_key["b/10"].regressed and by_key["b/10"].memory_ratio == pytest.approx(2.0)
+    assert by_key["c/10"].baseline is None and not by_key["c/10"].regressed
+    assert np.isnan(by_key["c/10"].time_ratio)
+
+
+def test_save_results_merges_into_existing_file(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_results(path, [Measurement("a", 10, 1, 1.0, 1.0, 10)], seed=1)
+    save_results(path, [Measurement("a", 10, 1, 2.0, 2.0, 20), Measurement("b", 10, 1, 3.0, 3.0, 30)],
+                 seed=1, merge=True)
+    loaded = load_results(path)
+    assert set(loaded) == {"a/10", "b/10"}
+    assert loaded["a/10"].best_s == 2.0
+    assert "environment" in json.loads(path.read_text())
+
+
+def test_parse_scales():
+    assert parse_scales("small") == [1000, 10000]
+    assert parse_scales("full")[-1] == 10 ** 7
+    assert parse_scales("1e4, 500,1e4") == [500, 10000]
+
+
+def test_cli_saves_baseline_then_detects_regression(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--scales", "200", "--cases", "spath.*", "--repeats", "1", "--baseline", str(baseline)]
+    assert main(args + ["--save-baseline"]) == 0
+    assert set(load_results(baseline)) == {"spath.sample_path_metrics/200", "spath.csv_loader/200"}
+
+    # Shrink the recorded times so that the next run looks like a regression
+    payload = json.loads(baseline.read_text())
+    for entry in payload["results"]:
+        entry["best_s"] /= 100.0
+    baseline.write_text(json.dumps(payload))
+    assert main(args + ["--output", str(tmp_path / "run.json")]) == 1
+    assert "REGRESSED" in capsys.readouterr().out
+    assert set(load_results(tmp_path / "run.json")) == set(load_results(baseline))
@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: MIT
 from sortedcontainers import SortedSet
 
-from pcalc import Entity, PresenceAssertion, BasisTopology
+from pcalc import Entity, EntityRegistry, PresenceAssertion, BasisTopology
 from pcalc.presence import EMPTY_PRESENCE
 
 # Sample entities
@@ -118,3 +118,38 @@ def test_get_cover_missing_returns_empty():
     topology = BasisTopology([])
     cover = topology.get_cover(Entity("ghost"), Entity("phantom"))
     assert cover == SortedSet([])
+
+
+def test_covers_are_keyed_on_registry_codes():
+    registry = EntityRegistry()
+    presences = make([(0, 2)]) + make([(1, 3)], e=E2, b=B2)
+    topology = BasisTopology(presences, registry=registry)
+    assert set(topology.cover_index.keys()) == {(0, 1), (2, 3)}
+    assert topology.registry is registry
+
+
+def test_get_cover_uses_entity_id():
+    topology = BasisTopology(make([(0, 2), (3, 4)]))
+    assert len(topology.get_cover(Entity("e1"), Entity("b1"))) == 2
+    assert len(topology.get_cover(Entity("unknown"), B1)) == 0
+
+
+def test_closure_intervals_match_closure():
+    presences = make([(0, 2), (1, 3), (3, 4), (6, 7)]) + make([(0, 1)], e=E2)
+    topology = BasisTopology(presences)
+    element_codes, boundary_codes, onsets, resets = topology.closure_intervals()
+    code = topology.registry.lookup
+    assert element_codes.tolist() == [code(E1), code(E1), code(E2)]
+    assert boundary_codes.tolist() == [code(B1)] * 3
+    assert onsets.tolist() == [0, 6, 0]
+    assert resets.tolist() == [4, 7, 1]
+    assert sorted(zip(onsets, resets)) == sorted((p.onset_time, p.reset_time) for p in topology.closure())
+
+
+def test_closure_with_plain_string_entities():
+    presences = [PresenceAssertion(element="a", boundary="b", onset_time=0, reset_time=2),
+                 PresenceAssertion(element="a", boundary="b", onset_time=1, reset_time=3)]
+    topology = BasisTopology(presences)
+    closure = topology.closure()
+    assert [(p.element, p.onset_time, p.reset_time) for p in closure] == [("a", 0, 3)]
+    assert len(topology.get_cover("a", "b")) == 2
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import random
+
+import numpy as np
+import pytest
+
+from pcalc import (
+    Entity, PresenceAssertion, BasisTopology, PresenceMatrix, Timescale, BitemporalIndex, PresenceSnapshot
+)
+
+E1, E2 = Entity("e1"), Entity("e2")
+B = Entity("b")
+SENSOR, CLERK = Entity("sensor"), Entity("clerk")
+
+
+def revisions():
+    return [
+        # e1 is observed as open ended at t=1, then closed at t=5
+        PresenceAssertion(E1, B, 0.0, float("inf"), observer=SENSOR, assert_time=1.0),
+        PresenceAssertion(E1, B, 0.0, 4.0, observer=SENSOR, assert_time=5.0),
+        # e2 is observed by the clerk at t=3
+        PresenceAssertion(E2, B, 2.0, 3.0, observer=CLERK, assert_time=3.0),
+        # a timeless assertion that is always known
+        PresenceAssertion(E2, B, 10.0, 11.0, observer=CLERK, assert_time=None),
+    ]
+
+
+def version_key(p):
+    return p.element, p.boundary, p.observer, p.onset_time
+
+
+@pytest.mark.parametrize("t, expected", [
+    (0.0, [3]),
+    (1.0, [0, 3]),
+    (3.0, [0, 2, 3]),
+    (4.999, [0, 2, 3]),
+    (5.0, [1, 2, 3]),
+    (100.0, [1, 2, 3]),
+])
+def test_as_of_with_supersession(t, expected):
+    index = BitemporalIndex(revisions(), version_key=version_key)
+    assert index.as_of(t).positions.tolist() == expected
+
+
+def test_without_version_key_nothing_is_superseded():
+    index = BitemporalIndex(revisions())
+    assert index.as_of(100.0).positions.tolist() == [0, 1, 2, 3]
+    assert len(index.current()) == 4
+
+
+def test_by_observer():
+    presences = revisions()
+    index = BitemporalIndex(presences, version_key=version_key)
+    assert list(index.by_observer(SENSOR)) == presences[:2]
+    assert list(index.by_observer(SENSOR, as_of=2.0)) == [presences[0]]
+    assert list(index.by_observer(CLERK, as_of=2.0)) == [presences[3]]
+    assert len(index.by_observer(Entity("nobody"))) == 0
+    assert len(index.as_of(2.0, observer=Entity("nobody"))) == 0
+
+
+def test_snapshot_is_a_view():
+    presences = revisions()
+    snapshot = BitemporalIndex(presences, version_key=version_key).current()
+    assert isinstance(snapshot, PresenceSnapshot)
+    assert snapshot[0] is presences[1]
+    assert snapshot[-1] is presences[3]
+    assert list(snapshot[1:]) == presences[2:]
+
+
+def test_snapshot_feeds_topology_and_matrix():
+    index = BitemporalIndex(revisions(), version_key=version_key)
+    snapshot = index.as_of(5.0)
+    topology = BasisTopology(snapshot)
+    assert len(topology.get_cover(E1, B)) == 1
+    assert topology.get_cover(E1, B)[0].reset_time == 4.0
+
+    matrix = PresenceMatrix(snapshot, time_scale=Timescale(0.0, 6.0, 1.0))
+    assert matrix.shape == (2, 6)
+    assert np.allclose(matrix[0], [1, 1, 1, 1, 0, 0])
+
+
+def test_as_of_matches_brute_force():
+    rng = random.Random(42)
+    entities = [Entity(f"e{i}") for i in range(20)]
+    presences = [
+        PresenceAssertion(
+            rng.choice(entities), B, 0.0, 1.0,
+            observer=rng.choice([SENSOR, CLERK]),
+            assert_time=rng.choice([None, float(rng.randint(0, 50))]),
+        )
+        for _ in range(300)
+    ]
+    key = lambda p: (p.element, p.observer)  # noqa: E731
+    index = BitemporalIndex(presences, version_key=key)
+
+    for t in [-1.0, 0.0, 7.0, 25.5, 50.0, 60.0]:
+        expected = [
+            i for i in range(len(presences))
+            if index.known_from[i] <= t < index.known_until[i]
+        ]
+        assert index.as_of(t).positions.tolist() == expected
+        for observer in [SENSOR, CLERK]:
+            assert index.as_of(t, observer=observer).positions.tolist() == [
+                i for i in expected if presences[i].observer == observer
+            ]
+
+    # Exactly one version of each fact is current
+    facts = {key(p) for p in presences}
+    assert len(index.current()) == len(facts)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from pcalc import Entity, EntityRegistry, PresenceAssertion, BasisTopology
+from pcalc.co_presence import co_presence, CoPresenceMatrix
+
+E1, E2, E3 = Entity("e1"), Entity("e2"), Entity("e3")
+B1, B2 = Entity("b1"), Entity("b2")
+
+
+def make_topology():
+    return BasisTopology([
+        PresenceAssertion(E1, B1, 0.0, 4.0),
+        PresenceAssertion(E1, B1, 3.0, 6.0),  # merged with the one above in the closure
+        PresenceAssertion(E2, B1, 2.0, 5.0),
+        PresenceAssertion(E3, B1, 5.0, 8.0),
+        PresenceAssertion(E1, B2, 1.0, 3.0),
+        PresenceAssertion(E2, B2, 2.5, 10.0),
+    ])
+
+
+def as_dict(m: CoPresenceMatrix):
+    return {(r.id, c.id): v for r, c, v in m}
+
+
+def test_element_pairs():
+    m = co_presence(make_topology(), by="element")
+    assert m.symmetric
+    # e1-e2: [2, 5) in b1 and [2.5, 3) in b2; e1-e3: [5, 6) in b1; e2 and e3 only touch.
+    assert as_dict(m) == pytest.approx({("e1", "e2"): 3.5, ("e1", "e3"): 1.0})
+
+
+def test_boundary_pairs():
+    m = co_presence(make_topology(), by="boundary")
+    # e1 in b1 and b2 over [1, 3); e2 in b1 and b2 over [2.5, 5)
+    assert as_dict(m) == pytest.approx({("b1", "b2"): 4.5})
+
+
+def test_element_boundary_incidence():
+    m = co_presence(make_topology(), by="element_boundary")
+    assert not m.symmetric
+    assert as_dict(m) == pytest.approx({
+        ("e1", "b1"): 6.0, ("e2", "b1"): 3.0, ("e3", "b1"): 3.0,
+        ("e1", "b2"): 2.0, ("e2", "b2"): 7.5,
+    })
+
+
+def test_window_clips_co_presence():
+    m = co_presence(make_topology(), by="element", window=(4.0, 10.0))
+    assert as_dict(m) == pytest.approx({("e1", "e2"): 1.0, ("e1", "e3"): 1.0})
+
+
+def test_infinite_presences():
+    topology = BasisTopology([
+        PresenceAssertion(E1, B1, 0.0, float("inf")),
+        PresenceAssertion(E2, B1, float("-inf"), 2.0),
+        PresenceAssertion(E3, B1, 5.0, float("inf")),
+    ])
+    assert as_dict(co_presence(topology)) == {("e1", "e2"): 2.0, ("e1", "e3"): float("inf")}
+    assert as_dict(co_presence(topology, window=(0.0, 10.0))) == {("e1", "e2"): 2.0, ("e1", "e3"): 5.0}
+
+
+def test_dense_top_k_and_threshold():
+    m = co_presence(make_topology(), by="element")
+    dense = m.to_dense()
+    assert dense.shape == m.shape
+    assert np.allclose(dense, dense.T)
+    code = m.registry.lookup
+    assert dense[code(E1), code(E2)] == pytest.approx(3.5)
+
+    top = m.top_k(1)
+    assert [(r.id, c.id) for r, c, _ in top] == [("e1", "e2")]
+    assert len(m.top_k(10)) == 2
+    assert m.top_k(0) == []
+
+    assert as_dict(m.threshold(2.0)) == pytest.approx({("e1", "e2"): 3.5})
+
+
+def test_to_scipy():
+    pytest.importorskip("scipy")
+    m = co_presence(make_topology(), by="element")
+    assert np.allclose(m.to_scipy().toarray(), m.to_dense())
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        co_presence(make_topology(), by="observer")
+
+
+def test_empty_topology():
+    m = co_presence(BasisTopology([]))
+    assert m.nnz == 0
+    assert m.to_dense().shape == (0, 0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_matches_brute_force(chunk_size):
+    rng = random.Random(7)
+    elements = [Entity(f"e{i}") for i in range(12)]
+    boundaries = [Entity(f"b{i}") for i in range(3)]
+    presences = []
+    for _ in range(200):
+        t0 = float(rng.randint(0, 100))
+        presences.append(PresenceAssertion(rng.choice(elements), rng.choice(boundaries), t0, t0 + rng.randint(1, 15)))
+    topology = BasisTopology(presences, registry=EntityRegistry())
+    closure = topology.closure()
+
+    expected = {}
+    for p, q in itertools.combinations(closure, 2):
+        if p.boundary == q.boundary and p.element != q.element:
+            overlap = min(p.reset_time, q.reset_time) - max(p.onset_time, q.onset_time)
+            if overlap > 0:
+                key = tuple(sorted([p.element.id, q.element.id], key=lambda id: topology.registry.lookup(Entity(id))))
+                expected[key] = expected.get(key, 0.0) + overlap
+
+    assert as_dict(co_presence(topology, chunk_size=chunk_size)) == pytest.approx(expected)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import numpy as np
+import pytest
+
+from pcalc import Entity, EntityRegistry
+from pcalc.entity import EntityView
+
+
+class Customer:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+        self.metadata = {}
+
+
+def test_entities_are_identified_by_id():
+    assert Entity("e1") == Entity("e1")
+    assert Entity("e1") != Entity("e2")
+    assert hash(Entity("e1")) == hash(Entity("e1"))
+    assert len({Entity("e1"), Entity("e1"), Entity("e2")}) == 2
+
+
+def test_entity_view_equals_wrapped_entity():
+    customer = Customer("cust-001", "Alice")
+    assert EntityView(customer) == Entity("cust-001")
+    assert Entity("cust-001") == EntityView(customer)
+
+
+def test_entity_equals_its_id_but_not_other_objects():
+    assert Entity("e1") == "e1" and "e1" == Entity("e1")
+    assert Entity("e1") != "e2"
+    assert "e1" in {Entity("e1")}
+    assert Entity("e1") != None  # noqa: E711
+    assert Entity("1") != 1
+
+
+def test_registry_assigns_dense_codes_in_order():
+    registry = EntityRegistry()
+    assert registry.code(Entity("a")) == 0
+    assert registry.code(Entity("b")) == 1
+    assert registry.code(Entity("a")) == 0
+    assert registry.code(None) == EntityRegistry.NONE_CODE
+    assert len(registry) == 2
+    assert registry.ids == ["a", "b"]
+
+
+def test_registry_encode_and_decode():
+    registry = EntityRegistry()
+    a, b = Entity("a"), Entity("b")
+    codes = registry.encode([a, b, None, a])
+    assert codes.dtype == np.int32
+    assert codes.tolist() == [0, 1, -1, 0]
+    assert registry.decode(codes) == [a, b, None, a]
+
+
+def test_registry_lookup_does_not_register():
+    registry = EntityRegistry()
+    assert registry.lookup(Entity("a")) is None
+    assert Entity("a") not in registry
+    registry.code(Entity("a"))
+    assert registry.lookup(Entity("a")) == 0
+    assert Entity("a") in registry
+
+
+def test_registry_rebuilt_from_ids_keeps_codes():
+    registry = EntityRegistry()
+    registry.encode([Entity(id) for id in ["x", "y", "z"]])
+    rebuilt = EntityRegistry(registry.ids)
+    assert rebuilt.encode([Entity("z"), Entity("x")]).tolist() == [2, 0]
+    assert rebuilt.entity(1) is None
+    y = Entity("y")
+    rebuilt.code(y)
+    assert rebuilt.entity(1) is y
+
+
+def test_registry_accepts_ids_in_place_of_entities():
+    registry = EntityRegistry()
+    assert registry.code("a") == 0
+    assert registry.code(Entity("a")) == 0
+    assert registry.lookup("a") == 0 and registry.lookup("b") is None
+    assert "a" in registry and Entity("a") in registry
+    assert registry.entity(0) == "a" == Entity("a")
+    with pytest.raises(TypeError):
+        registry.code(1)
+    with pytest.raises(TypeError):
+        registry.lookup(object())
+    assert 1 not in registry
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import numpy as np
+import pytest
+
+import pcalc.fanout
+from pcalc import Entity, PresenceAssertion, BasisTopology
+from pcalc.fanout import boundary_invariant_series
+from pcalc.presence_invariant import PresenceInvariant
+
+
+def make_presences(num_boundaries=5, n=400, seed=1):
+    rng = np.random.default_rng(seed)
+    boundaries = [Entity(f"b{i}") for i in range(num_boundaries)]
+    elements = [Entity(f"e{i}") for i in range(50)]
+    return boundaries, [
+        PresenceAssertion(elements[e], boundaries[b], float(t), float(t + d))
+        for e, b, t, d in zip(
+            rng.integers(0, 50, n), rng.integers(0, num_boundaries, n), rng.uniform(0, 20, n), rng.exponential(2, n)
+        )
+    ]
+
+
+def test_matches_per_boundary_invariant():
+    boundaries, presences = make_presences()
+    times = np.array([1.0, 5.0, 12.5, 20.0, 30.0])
+    table = boundary_invariant_series(presences, 0.0, times, processes=1)
+    assert len(table) == len(boundaries) * len(times)
+
+    for b in boundaries:
+        metrics = PresenceInvariant(BasisTopology([p for p in presences if p.boundary == b]))
+        rows = table.for_boundary(b)
+        assert rows["time"].tolist() == times.tolist()
+        for k, t in enumerate(times):
+            assert (rows["L"][k], rows["Lambda"][k], rows["w"][k]) == pytest.approx(metrics.invariant(0.0, t))
+
+
+def test_process_pool_matches_inline(monkeypatch):
+    monkeypatch.setattr(pcalc.fanout, "_MIN_INTERVALS_FOR_POOL", 0)
+    _, presences = make_presences(num_boundaries=40, n=2000)
+    topology = BasisTopology(presences)
+    times = np.linspace(0.5, 25.0, 50)
+    inline = boundary_invariant_series(topology, 0.0, times, processes=1)
+    pooled = boundary_invariant_series(topology, 0.0, times, processes=2)
+    for name, column in inline.columns().items():
+        assert np.array_equal(column, pooled.columns()[name]), name
+
+
+def test_unknown_boundary_has_no_rows():
+    _, presences = make_presences()
+    table = boundary_invariant_series(presences, 0.0, [1.0], processes=1)
+    assert all(len(column) == 0 for column in table.for_boundary(Entity("nowhere")).values())
+
+
+def test_empty():
+    table = boundary_invariant_series([], 0.0, [1.0, 2.0])
+    assert len(table) == 0
+
+
+def test_to_dataframe():
+    pytest.importorskip("pandas")
+    boundaries, presences = make_presences(num_boundaries=2)
+    df = boundary_invariant_series(presences, 0.0, [5.0, 10.0], processes=1).to_dataframe()
+    assert list(df.columns) == ["boundary", "time", "A", "N", "L", "Lambda", "w"]
+    assert set(df["boundary"]) == {"b0", "b1"}
+    assert np.allclose(df["L"], df["Lambda"] * df["w"])
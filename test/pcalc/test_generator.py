@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import heapq
+import importlib.util
+
+import numpy as np
+import pytest
+
+from pcalc import BasisTopology, PresenceArrays
+from pcalc.generator import (bursty_arrivals, durations, element_paths, independent_presences, mmc_queue,
+                             poisson_arrivals, queue_departures)
+
+
+def test_generators_are_seeded():
+    a = element_paths(200, 3, seed=11)
+    b = element_paths(200, 3, seed=11)
+    for name in ("element", "boundary", "onset", "reset"):
+        assert np.array_equal(getattr(a, name), getattr(b, name))
+    assert not np.array_equal(a.onset, element_paths(200, 3, seed=12).onset)
+    assert np.array_equal(mmc_queue(100, seed=np.random.default_rng(3)).reset, mmc_queue(100, seed=3).reset)
+
+
+def test_single_server_departures_match_the_lindley_recursion():
+    rng = np.random.default_rng(0)
+    arrivals = np.cumsum(rng.exponential(1.0, 2000))
+    service = rng.exponential(0.9, 2000)
+    expected, last = [], -np.inf
+    for a, s in zip(arrivals, service):
+        last = max(a, last) + s
+        expected.append(last)
+    assert queue_departures(arrivals, service) == pytest.approx(expected)
+
+
+def test_multi_server_departures_match_a_direct_simulation():
+    rng = np.random.default_rng(1)
+    arrivals = np.cumsum(rng.exponential(0.4, 1000))
+    service = rng.exponential(1.0, 1000)
+    free, expected = [0.0, 0.0, 0.0], []
+    for a, s in zip(arrivals, service):
+        start = max(a, heapq.heappop(free))
+        heapq.heappush(free, start + s)
+        expected.append(start + s)
+    assert queue_departures(arrivals, service, servers=3) == pytest.approx(expected)
+    # More servers never make anyone leave later
+    assert np.all(queue_departures(arrivals, service, servers=4) <= np.asarray(expected) + 1e-12)
+
+
+def test_mm1_sojourn_time_converges():
+    q = mmc_queue(200_000, arrival_rate=0.5, service_rate=1.0, seed=5)
+    # M/M/1: mean time in system is 1 / (mu - lambda)
+    assert (q.reset - q.onset)[20_000:].mean() == pytest.approx(2.0, rel=0.05)
+    assert np.all(np.diff(q.onset) > 0)
+
+
+def test_split_waiting_presences_tile_the_time_in_system():
+    whole = mmc_queue(5000, arrival_rate=0.9, seed=8)
+    split = mmc_queue(5000, arrival_rate=0.9, seed=8, split_waiting=True)
+    assert split.boundaries == ["waiting", "service"]
+    assert np.bincount(split.boundary)[1] == 5000
+    total = np.zeros(5000)
+    np.add.at(total, split.element, split.reset - split.onset)
+    assert total == pytest.approx(whole.reset - whole.onset)
+
+
+def test_arrival_processes_have_the_requested_rate():
+    assert len(poisson_arrivals(50_000, rate=4.0, seed=1)) == 50_000
+    assert 50_000 / poisson_arrivals(50_000, rate=4.0, seed=1)[-1] == pytest.approx(4.0, rel=0.03)
+    bursty = bursty_arrivals(50_000, rate=4.0, mean_burst=20, spread=0.01, seed=1)
+    assert len(bursty) == 50_000 and np.all(np.diff(bursty) >= 0)
+    assert 50_000 / bursty[-1] == pytest.approx(4.0, rel=0.2)
+    # Bursty gaps are far more variable than Poisson gaps (coefficient of variation 1)
+    gaps = np.diff(bursty)
+    assert gaps.std() / gaps.mean() > 2.0
+
+
+@pytest.mark.parametrize("distribution", ["exponential", "lognormal", "pareto", "constant"])
+def test_durations_have_the_requested_mean(distribution):
+    d = durations(400_000, mean=3.0, distribution=distribution, shape=2.5 if distribution == "pareto" else None,
+                  seed=2)
+    assert np.all(d > 0)
+    assert d.mean() == pytest.approx(3.0, rel=0.03)
+
+
+def test_invalid_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        durations(10, distribution="weibull")
+    with pytest.raises(ValueError):
+        durations(10, distribution="pareto", shape=1.0)
+    with pytest.raises(ValueError):
+        element_paths(10, 2, routing=[[0.5, 0.2], [0.0, 1.0]])
+    with pytest.raises(ValueError):
+        independent_presences(10, boundaries=0)
+    with pytest.raises(ValueError):
+        queue_departures([1.0], [1.0], servers=0)
+
+
+def test_element_paths_follow_the_routing_matrix():
+    routing = [[0, 1, 0], [0, 0, 1], [1, 0, 0]]
+    paths = element_paths(2000, ["a", "b", "c"], mean_stages=4, routing=routing, seed=4)
+    same = paths.element[1:] == paths.element[:-1]
+    assert np.all((paths.boundary[:-1][same] + 1) % 3 == paths.boundary[1:][same])
+    # Visits of an element are back to back
+    assert paths.onset[1:][same] == pytest.approx(paths.reset[:-1][same])
+    assert len(paths) / 2000 == pytest.approx(4.0, rel=0.1)
+
+
+def test_censor_and_open_items():
+    arrays = independent_presences(1000, rate=1.0, mean_duration=20.0, seed=3)
+    censored = arrays.censor(at=500.0)
+    assert np.all(censored.onset < 500.0)
+    assert censored.is_open.any() and np.all(censored.reset[~censored.is_open] <= 500.0)
+    opened = arrays.with_open(0.25, seed=1)
+    assert opened.is_open.mean() == pytest.approx(0.25, abs=0.05)
+    assert np.array_equal(opened.onset, arrays.onset)
+
+
+def test_to_presences_builds_a_topology():
+    arrays = element_paths(50, ["x", "y"], seed=6).with_open(0.1, seed=2)
+    presences = arrays.to_presences()
+    assert len(presences) == len(arrays)
+    assert {p.boundary.id for p in presences} <= {"x", "y"}
+    assert presences[0].element.id == f"e{arrays.element[0]}"
+    assert sum(p.reset_time == float("inf") for p in presences) == arrays.is_open.sum()
+    # Back to back visits to the same boundary are joined in the closure
+    assert 0 < len(BasisTopology(presences).closure()) <= len(presences)
+
+
+def test_to_frame_matches_the_spath_item_log(tmp_path):
+    pd = pytest.importorskip("pandas")
+    from spath.csv_loader import CSVLoader
+
+    arrays = mmc_queue(300, seed=9, split_waiting=True).with_open(0.1, seed=3)
+    df = arrays.to_frame(origin="2024-03-01", unit="h")
+    assert list(df.columns) == ["id", "start_ts", "end_ts", "class"]
+    assert df["end_ts"].isna().sum() == arrays.is_open.sum()
+    hours = (df["start_ts"] - pd.Timestamp("2024-03-01")).dt.total_seconds() / 3600.0
+    assert hours.to_numpy() == pytest.approx(arrays.onset)
+    assert set(df["class"]) == {"waiting", "service"}
+
+    loaded = CSVLoader().load(str(arrays.to_csv(tmp_path / "queue.csv", origin="2024-03-01")))
+    assert len(loaded) == len(arrays)
+    assert loaded["end_ts"].isna().sum() == arrays.is_open.sum()
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None and importlib.util.find_spec("fastparquet") is None,
+                    reason="requires pyarrow or fastparquet")
+def test_to_parquet_round_trips(tmp_path):
+    pd = pytest.importorskip("pandas")
+    arrays = independent_presences(100, boundaries=["p", "q"], seed=1)
+    path = arrays.to_parquet(tmp_path / "items.parquet")
+    assert pd.read_parquet(path).equals(arrays.to_frame())
+
+
+def test_presence_arrays_default_boundary():
+    arrays = PresenceArrays(np.array([0, 1]), np.zeros(2, dtype=np.int32), np.array([0.0, 1.0]), np.array([1.0, np.inf]))
+    assert len(arrays) == 2
+    assert arrays.to_frame()["class"].tolist() == ["boundary", "boundary"]
+    assert arrays.element_ids().tolist() == ["e0", "e1"]
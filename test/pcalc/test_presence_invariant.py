@@ -164,4 +164,23 @@ def test_presence_invariant_under_closure(start, end):
     # Check invariant: avg_mass == incidence * flow_rate
     lhs = avg_density
     rhs = incidence_rate * avg_mass
-    assert abs(lhs - rhs) < 1e-6, f"Invariant failed for [{start}, {end}): {lhs} != {rhs}"
\ No newline at end of file
+    assert abs(lhs - rhs) < 1e-6, f"Invariant failed for [{start}, {end}): {lhs} != {rhs}"
+
+def test_invariant_series_matches_invariant():
+    import numpy as np
+    presences = make_presences()
+    metrics = PresenceInvariant(BasisTopology(presences))
+    times = np.array([0.0, 0.5, 1.0, 2.5, 4.6, 5.0, 6.0])
+    L, Λ, w = metrics.invariant_series(0.0, times)
+    for k, t in enumerate(times):
+        assert (L[k], Λ[k], w[k]) == pytest.approx(metrics.invariant(0.0, t)), t
+
+
+def test_invariant_series_with_late_start():
+    import numpy as np
+    presences = make_presences()
+    metrics = PresenceInvariant(BasisTopology(presences))
+    times = np.array([1.5, 3.5, 10.0])
+    L, Λ, w = metrics.invariant_series(1.5, times)
+    for k, t in enumerate(times):
+        assert (L[k], Λ[k], w[k]) == pytest.approx(metrics.invariant(1.5, t)), t
@@ -388,3 +388,38 @@ def test_presence_invariant(case, start, end):
 
     L, Λ, W = metrics.get_presence_metrics(start, end)
     assert L == pytest.approx(Λ * W, rel=1e-6)  # modulo floating point math.
+
+
+# Weighted (mass based) presence invariant
+
+
+@pytest.mark.parametrize("case, start, end", [
+    ("Full interval", 0.0, 6.0),
+    ("Early window", 0.0, 2.0),
+    ("Mid window", 1.5, 3.5),
+    ("Late window", 4.0, 6.0),
+])
+def test_presence_invariant_weighted(case, start, end):
+    from pcalc.presence_mass import RampPresence, ConstantPresence
+    presences = [
+        RampPresence(0.0, 2.0).assertion(Entity(), dummy),
+        ConstantPresence(1.5, 3.0, weight=4.0).assertion(Entity(), dummy),
+        ConstantPresence(3.0, 4.5, weight=0.5).assertion(Entity(), dummy),
+        ConstantPresence(4.6, np.inf, weight=2.0).assertion(Entity(), dummy),
+    ]
+    ts = Timescale(t0=0.0, t1=6.0, bin_width=1.0)
+    metrics = PresenceInvariantDiscrete(PresenceMatrix(presences=presences, time_scale=ts, weighted=True))
+
+    A, N, T = metrics.get_presence_summary(start, end)
+    assert A == pytest.approx(sum(p.mass_contribution(start, end) for p in presences))
+    L, Λ, W = metrics.get_presence_metrics(start, end)
+    assert L == pytest.approx(Λ * W, rel=1e-6)
+
+
+def test_weighted_summary_of_binary_presences_matches_unweighted():
+    presences = make_presences()
+    ts = Timescale(t0=0.0, t1=6.0, bin_width=1.0)
+    weighted = PresenceInvariantDiscrete(PresenceMatrix(presences=presences, time_scale=ts, weighted=True))
+    unweighted = PresenceInvariantDiscrete(PresenceMatrix(presences=presences, time_scale=ts))
+    for start, end in [(0.0, 6.0), (0.0, 2.0), (1.0, 4.0)]:
+        assert weighted.get_presence_summary(start, end) == pytest.approx(unweighted.get_presence_summary(start, end))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import math
+
+import numpy as np
+import pytest
+
+from pcalc import Entity, PresenceAssertion
+from pcalc.presence_mass import (
+    adaptive_quad,
+    AntiderivativeTable,
+    MassIntegrator,
+    ConstantPresence,
+    RampPresence,
+    DelayedPresence,
+    SignalPresence,
+    bin_masses,
+)
+
+E = Entity("e")
+B = Entity("b")
+
+
+def test_adaptive_quad_polynomial():
+    assert math.isclose(adaptive_quad(lambda t: t ** 3, 0.0, 2.0), 4.0, rel_tol=1e-12)
+
+
+def test_adaptive_quad_step_function():
+    actual = adaptive_quad(lambda t: 1.0 if t >= 1.3 else 0.0, 0.0, 4.0, tol=1e-10)
+    assert abs(actual - 2.7) < 1e-8
+
+
+def test_adaptive_quad_empty_interval():
+    assert adaptive_quad(lambda t: 1.0, 2.0, 2.0) == 0.0
+
+
+def test_adaptive_quad_rejects_infinite_limits():
+    with pytest.raises(ValueError):
+        adaptive_quad(lambda t: 1.0, 0.0, float("inf"))
+
+
+def test_antiderivative_table_matches_closed_form():
+    table = AntiderivativeTable(np.sin, 0.0, math.pi, vectorized=True)
+    t = np.linspace(0.0, math.pi, 37)
+    assert np.allclose(table(t), 1.0 - np.cos(t), atol=1e-9)
+
+
+def test_antiderivative_table_clips_outside_range():
+    table = AntiderivativeTable(lambda t: 2.0, 1.0, 3.0)
+    assert table(0.0) == 0.0
+    assert math.isclose(float(table(10.0)), 4.0)
+
+
+@pytest.mark.parametrize("presence, window, expected", [
+    (ConstantPresence(0.0, 4.0, weight=2.0), (1.0, 3.0), 4.0),
+    (ConstantPresence(0.0, 4.0, weight=2.0), (-5.0, 10.0), 8.0),
+    (ConstantPresence(float("-inf"), 4.0), (2.0, 6.0), 2.0),
+    (ConstantPresence(1.0, float("inf")), (0.0, float("inf")), float("inf")),
+    (RampPresence(0.0, 10.0), (0.0, 5.0), 1.25),
+    (RampPresence(0.0, 10.0, peak=2.0), (0.0, 10.0), 10.0),
+    (DelayedPresence(0.0, 5.0, delay=2.0), (0.0, 5.0), 3.0),
+    (DelayedPresence(0.0, 5.0, delay=2.0), (0.0, 2.0), 0.0),
+    (DelayedPresence(0.0, 5.0, delay=7.0), (0.0, 5.0), 0.0),
+])
+def test_closed_form_masses(presence, window, expected):
+    actual = presence(*window)
+    if math.isinf(expected):
+        assert actual == expected
+    else:
+        assert math.isclose(actual, expected, abs_tol=1e-12)
+
+
+def test_bin_masses_sum_to_total():
+    ramp = RampPresence(0.0, 10.0)
+    masses = ramp.bin_masses(np.arange(0.0, 11.0))
+    assert np.allclose(masses, (2 * np.arange(10) + 1) / 20.0)
+    assert math.isclose(masses.sum(), ramp(0.0, 10.0))
+
+
+def test_signal_presence_matches_quadrature():
+    integrator = MassIntegrator()
+    revenue = SignalPresence(lambda e, b, t: 100.0 * (1.0 + 0.1 * t), E, B, 0.0, 12.0, integrator=integrator)
+    assert math.isclose(revenue(3.0, 6.0), 300.0 + 5.0 * (36.0 - 9.0), rel_tol=1e-10)
+    # Outside the support there is no mass
+    assert revenue(12.0, 20.0) == 0.0
+
+
+def test_signal_presence_table_is_cached():
+    integrator = MassIntegrator()
+    calls = []
+
+    def signal(e, b, t):
+        calls.append(t)
+        return t
+
+    p = SignalPresence(signal, E, B, 0.0, 1.0, integrator=integrator)
+    p(0.0, 0.5)
+    evaluated = len(calls)
+    for k in range(10):
+        p(0.1 * k, 0.1 * k + 0.05)
+    assert len(calls) == evaluated
+    assert integrator.misses == 1
+    assert integrator.hits == 10
+
+
+def test_integrator_lru_bound():
+    integrator = MassIntegrator(max_tables=2)
+    presences = [SignalPresence(lambda e, b, t: 1.0, E, B, 0.0, 1.0 + k, integrator=integrator) for k in range(3)]
+    for p in presences:
+        p(0.0, 1.0)
+    assert len(integrator) == 2
+    # The first table was evicted and must be rebuilt
+    presences[0](0.0, 1.0)
+    assert integrator.misses == 4
+
+
+def test_signal_presence_requires_finite_horizon():
+    with pytest.raises(ValueError):
+        SignalPresence(lambda e, b, t: 1.0, E, B, 0.0, float("inf"))
+
+    p = SignalPresence(lambda e, b, t: 1.0, E, B, 0.0, float("inf"), horizon=(0.0, 10.0))
+    assert math.isclose(p(5.0, float("inf")), 5.0)
+
+
+def test_presence_assertion_uses_presence_function():
+    p = RampPresence(0.0, 10.0).assertion(E, B)
+    assert p.onset_time == 0.0 and p.reset_time == 10.0
+    assert math.isclose(p.mass(), 5.0)
+    assert math.isclose(p.mass_contribution(0.0, 5.0), 1.25)
+    assert p.mass_contribution(10.0, 12.0) == 0.0
+
+
+@pytest.mark.parametrize("presence", [
+    PresenceAssertion(E, B, 0.5, 2.5),
+    RampPresence(0.5, 2.5).assertion(E, B),
+    PresenceAssertion(E, B, 0.5, 2.5, presence=SignalPresence(lambda e, b, t: t * t, E, B, 0.5, 2.5)),
+])
+def test_bin_masses_match_mass_contribution(presence):
+    edges = np.arange(0.0, 4.0)
+    expected = [presence.mass_contribution(lo, hi) for lo, hi in zip(edges[:-1], edges[1:])]
+    assert np.allclose(bin_masses(presence, edges), expected)
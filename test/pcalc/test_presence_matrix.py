@@ -195,4 +195,56 @@ def test_column_slice_out_of_bounds(materialize):
 
     col_block = matrix[:, 4:10]
     expected = np.zeros((3, 1))  # Only bin 4 exists, bin 5–9 ignored
-    assert np.allclose(col_block, expected[:, :matrix.shape[1]-4])
\ No newline at end of file
+    assert np.allclose(col_block, expected[:, :matrix.shape[1]-4])
+
+# --- Weighted matrices
+
+
+@pytest.mark.parametrize("materialize", [True, False])
+def test_weighted_matrix_of_binary_presences_is_scaled_by_bin_width(materialize):
+    ts = Timescale(0.0, 10.0, 2.0)
+    weighted = PresenceMatrix(presences, time_scale=ts, materialize=materialize, weighted=True)
+    unweighted = PresenceMatrix(presences, time_scale=ts)
+    assert np.allclose(weighted[:], unweighted[:] * ts.bin_width)
+
+
+@pytest.mark.parametrize("materialize", [True, False])
+def test_weighted_matrix_values(materialize):
+    from pcalc.presence_mass import RampPresence, ConstantPresence
+    ts = Timescale(0.0, 5.0, 1.0)
+    weighted_presences = [
+        RampPresence(0.0, 4.0).assertion(Entity(), dummy_boundary),
+        ConstantPresence(1.5, 3.5, weight=2.0).assertion(Entity(), dummy_boundary),
+    ]
+    matrix = PresenceMatrix(weighted_presences, time_scale=ts, materialize=materialize, weighted=True)
+    expected = np.array([
+        [0.125, 0.375, 0.625, 0.875, 0.0],
+        [0.0, 1.0, 2.0, 1.0, 0.0],
+    ])
+    assert np.allclose(matrix[:], expected)
+    assert np.allclose(matrix[0, 1:3], expected[0, 1:3])
+    assert np.isclose(matrix[1, 2], 2.0)
+
+
+def test_weighted_matrix_clips_last_bin_to_timescale():
+    from pcalc.presence_mass import ConstantPresence
+    ts = Timescale(0.0, 2.5, 1.0)
+    p = ConstantPresence(0.0, 10.0).assertion(Entity(), dummy_boundary)
+    matrix = PresenceMatrix([p], time_scale=ts, weighted=True)
+    assert np.allclose(matrix[0], [1.0, 1.0, 0.5])
+
+
+def test_row_codes_support_array_group_by():
+    e1, e2 = Entity("e1"), Entity("e2")
+    rows = [
+        PresenceAssertion(e1, dummy_boundary, 0.0, 2.0),
+        PresenceAssertion(e2, dummy_boundary, 1.0, 2.0),
+        PresenceAssertion(e1, dummy_boundary, 3.0, 4.0),
+    ]
+    ts = Timescale(0.0, 5.0, 1.0)
+    matrix = PresenceMatrix(rows, time_scale=ts)
+    assert matrix.element_codes.tolist() == [0, 1, 0]
+    assert matrix.boundary_codes.tolist() == [2, 2, 2]
+    totals = np.bincount(matrix.element_codes, weights=matrix.materialize().sum(axis=1))
+    assert totals[matrix.registry.lookup(e1)] == 3.0
+    assert totals[matrix.registry.lookup(e2)] == 1.0
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+import random
+
+import numpy as np
+import pytest
+
+from pcalc import Entity, PresenceAssertion
+from pcalc.transitions import transition_graph
+
+E1, E2 = Entity("e1"), Entity("e2")
+TODO, DOING, DONE = Entity("todo"), Entity("doing"), Entity("done")
+
+
+def workflow():
+    return [
+        # e1: todo -> doing -> done, given out of order
+        PresenceAssertion(E1, DOING, 2.0, 5.0),
+        PresenceAssertion(E1, TODO, 0.0, 2.0),
+        PresenceAssertion(E1, DONE, 6.0, 7.0),
+        # e2: todo -> doing -> todo -> doing
+        PresenceAssertion(E2, TODO, 1.0, 4.0),
+        PresenceAssertion(E2, DOING, 4.0, 6.0),
+        PresenceAssertion(E2, TODO, 5.0, 8.0),
+        PresenceAssertion(E2, DOING, 9.0, 10.0),
+    ]
+
+
+def test_edges_and_metrics():
+    graph = transition_graph(workflow())
+    edges = {(s.id, t.id): m for s, t, m in graph.edges()}
+    assert set(edges) == {("todo", "doing"), ("doing", "done"), ("doing", "todo")}
+
+    todo_doing = edges[("todo", "doing")]
+    assert todo_doing["count"] == 3
+    # dwell in todo: 2, 3, 3; delay: 0, 0, 1
+    assert todo_doing["dwell_total"] == pytest.approx(8.0)
+    assert todo_doing["dwell_mean"] == pytest.approx(8.0 / 3)
+    assert todo_doing["delay_mean"] == pytest.approx(1.0 / 3)
+    assert (todo_doing["delay_min"], todo_doing["delay_max"]) == (0.0, 1.0)
+
+    # e2 re-enters todo before leaving doing: a negative delay
+    assert edges[("doing", "todo")]["delay_min"] == -1.0
+    assert edges[("doing", "done")] == graph.edge(DOING, DONE)
+
+
+def test_edge_lookup():
+    graph = transition_graph(workflow())
+    assert graph.edge(TODO, DOING)["count"] == 3
+    assert graph.edge(DONE, TODO) is None
+    assert graph.edge(Entity("unknown"), TODO) is None
+
+
+def test_node_metrics():
+    graph = transition_graph(workflow())
+    nodes = {
+        graph.registry.entity(int(b)).id: (v, d, i, o)
+        for b, v, d, i, o in zip(graph.boundaries, graph.visits, graph.boundary_dwell_total, graph.entries, graph.exits)
+    }
+    assert nodes == {
+        "todo": (3, 8.0, 2, 0),
+        "doing": (3, 6.0, 0, 1),
+        "done": (1, 1.0, 0, 1),
+    }
+
+
+def test_adjacency():
+    graph = transition_graph(workflow())
+    code = graph.registry.lookup
+    adjacency = graph.adjacency()
+    assert adjacency[code(TODO), code(DOING)] == 3
+    assert adjacency.sum() == 5
+    assert graph.adjacency("delay_max")[code(DOING), code(TODO)] == -1.0
+
+
+def test_empty():
+    graph = transition_graph([])
+    assert graph.num_edges == 0 and graph.num_nodes == 0
+
+
+def test_matches_per_element_walk():
+    rng = random.Random(3)
+    elements = [Entity(f"e{i}") for i in range(30)]
+    boundaries = [Entity(f"b{i}") for i in range(4)]
+    presences = []
+    for e in elements:
+        t = 0.0
+        for _ in range(rng.randint(1, 8)):
+            t += rng.randint(0, 3)
+            d = rng.randint(1, 5)
+            presences.append(PresenceAssertion(e, rng.choice(boundaries), t, t + d))
+            t += d
+    rng.shuffle(presences)
+
+    expected = {}
+    for e in elements:
+        timeline = sorted((p for p in presences if p.element == e), key=lambda p: (p.onset_time, p.reset_time))
+        for a, b in zip(timeline, timeline[1:]):
+            key = (a.boundary.id, b.boundary.id)
+            count, delay = expected.get(key, (0, 0.0))
+            expected[key] = (count + 1, delay + b.onset_time - a.reset_time)
+
+    graph = transition_graph(presences)
+    actual = {(s.id, t.id): (m["count"], m["delay_mean"] * m["count"]) for s, t, m in graph.edges()}
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert actual[key] == pytest.approx(expected[key])
+    assert graph.counts.sum() == len(presences) - len(elements)
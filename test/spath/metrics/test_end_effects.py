@@ -125,3 +125,36 @@ def test_rho_equals_elapsed_over_mean_duration_at_completion(df_one_item, times_
 def test_empty_times_return_empty_arrays(df_one_item):
     rA, rB, rho = compute_end_effect_series(df_one_item, [], np.array([]), np.array([]))
     assert rA.size == 0 and rB.size == 0 and rho.size == 0
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Many items: matches a direct evaluation at each time
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_matches_direct_evaluation_with_open_items():
+    rng = np.random.default_rng(4)
+    start = _t("2024-01-01") + pd.to_timedelta(np.sort(rng.uniform(0, 500, 300)), unit="h")
+    end = (start + pd.to_timedelta(rng.exponential(30, 300), unit="h")).where(rng.uniform(size=300) > 0.2)
+    df = pd.DataFrame({"start_ts": start, "end_ts": end})
+    times = list(pd.date_range("2024-01-01", periods=60, freq="10h"))
+    A_vals = rng.uniform(0, 4000, 60)
+    A_vals[[5, 9]] = [np.nan, 0.0]
+    W_star = rng.uniform(1, 40, 55)        # shorter than times: the tail has no W*
+
+    rA, rB, rho = compute_end_effect_series(df, times, A_vals, W_star)
+
+    duration_h = (df["end_ts"] - df["start_ts"]).dt.total_seconds() / 3600.0
+    for i, t in enumerate(times):
+        elapsed_h = (t - times[0]).total_seconds() / 3600.0
+        if elapsed_h <= 0 or not np.isfinite(A_vals[i]) or A_vals[i] <= 0:
+            assert np.isnan(rA[i]) and np.isnan(rB[i]) and np.isnan(rho[i])
+            continue
+        A_full = duration_h[df["end_ts"] <= t].sum()
+        started = df["start_ts"] <= t
+        open_at_t = started & (df["end_ts"].isna() | (df["end_ts"] > t))
+        assert rA[i] == pytest.approx(max(A_vals[i] - A_full, 0.0) / A_vals[i])
+        assert rB[i] == pytest.approx(open_at_t.sum() / started.sum())
+        if i < len(W_star):
+            assert rho[i] == pytest.approx(elapsed_h / W_star[i])
+        else:
+            assert np.isnan(rho[i])
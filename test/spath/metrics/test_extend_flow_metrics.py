@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+# test/spath/metrics/test_extend_flow_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.metrics import compute_finite_window_flow_metrics, compute_sliding_window_flow_metrics
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def random_events():
+    rng = np.random.default_rng(11)
+    base = _t("2024-01-01")
+    events = []
+    for s, d in zip(np.sort(rng.uniform(0, 400, size=150)), rng.exponential(30, size=150)):
+        events.append((base + pd.Timedelta(hours=float(s)), +1, 1))
+        events.append((base + pd.Timedelta(hours=float(s + d)), -1, 0))
+    events.sort(key=lambda e: (e[0], -e[1]))
+    return events
+
+
+def _assert_same_series(a, b):
+    assert a.times.equals(b.times)
+    for name in ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures"):
+        assert np.allclose(getattr(a, name), getattr(b, name), equal_nan=True), name
+    assert a.tn == b.tn
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Behavior
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.mark.parametrize("freq", [None, "D", "6h"])
+def test_extend_matches_full_recompute(random_events, freq):
+    full = compute_finite_window_flow_metrics(random_events, freq=freq)
+    head, tail = random_events[:120], random_events[120:]
+    extended = compute_finite_window_flow_metrics(head, freq=freq).extend(tail)
+    _assert_same_series(extended, full)
+    assert extended.state.A == pytest.approx(full.state.A)
+
+
+def test_extend_in_several_steps(random_events):
+    full = compute_finite_window_flow_metrics(random_events)
+    result = compute_finite_window_flow_metrics(random_events[:50])
+    for lo in range(50, len(random_events), 40):
+        result = result.extend(random_events[lo:lo + 40])
+    _assert_same_series(result, full)
+
+
+def test_calendar_mode_holds_back_events_after_last_boundary(random_events):
+    result = compute_finite_window_flow_metrics(random_events[:100], freq="D")
+    assert result.state.pending
+    assert all(t > result.tn for (t, _, _) in result.state.pending)
+
+
+def test_extend_with_no_events_is_identity(random_events):
+    result = compute_finite_window_flow_metrics(random_events)
+    assert result.extend([]) is result
+
+
+def test_extend_rejects_events_already_processed(random_events):
+    result = compute_finite_window_flow_metrics(random_events[:100])
+    with pytest.raises(ValueError):
+        result.extend([random_events[50]])
+
+
+def test_sliding_window_results_cannot_be_extended(random_events):
+    sliding = compute_sliding_window_flow_metrics(random_events, "1D")
+    with pytest.raises(ValueError):
+        sliding.extend(random_events[-1:])
@@ -7,7 +7,12 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from spath.metrics import compute_finite_window_flow_metrics
+from spath.metrics import (
+    calendar_boundaries,
+    compute_finite_window_flow_metrics,
+    compute_sample_path_metrics,
+    compute_sliding_window_flow_metrics,
+)
 
 def _t(s: str) -> pd.Timestamp:
     return pd.Timestamp(s)
@@ -48,7 +53,7 @@ def test_event_mode_sets_mode_event(simple_events):
 
 def test_event_mode_times_include_first_and_last_event(simple_events):
     res = compute_finite_window_flow_metrics(simple_events, freq=None)
-    assert res.times == sorted([e[0] for e in simple_events])
+    assert list(res.times) == sorted([e[0] for e in simple_events])
 
 def test_event_mode_final_identity_L_equals_A_over_elapsed(simple_events):
     res = compute_finite_window_flow_metrics(simple_events, freq=None)
@@ -85,6 +90,13 @@ def test_calendar_mode_times_are_midnight_boundaries(overlap_events):
     )
     assert all(t == t.normalize() for t in res.times)
 
+def test_calendar_boundaries_are_the_calendar_mode_times(overlap_events):
+    first, last = overlap_events[0][0], overlap_events[-1][0]
+    res = compute_finite_window_flow_metrics(overlap_events, freq="h", start=first, end=last)
+    assert calendar_boundaries(first, last, "h").equals(res.times)
+    days = calendar_boundaries(_t("2024-01-03 06:00"), _t("2024-01-05 18:00"), "day")
+    assert list(days) == [_t("2024-01-03"), _t("2024-01-04"), _t("2024-01-05")]
+
 def test_calendar_mode_carry_in_reflects_in_N0(carry_in_events):
     res = compute_finite_window_flow_metrics(
         carry_in_events,
@@ -115,6 +127,40 @@ def test_calendar_mode_tn_is_last_boundary(overlap_events):
     res = compute_finite_window_flow_metrics(overlap_events, freq="day", end=last)
     assert res.tn == res.times[-1]
 
+@pytest.mark.parametrize("freq, tz", [("D", None), ("6h", "UTC"), ("min", "UTC"), ("h", "America/New_York")])
+def test_calendar_mode_matches_scalar_sweep(freq, tz):
+    rng = np.random.default_rng(8)
+    base = pd.Timestamp("2023-03-01 07:13", tz=tz)
+    starts = base + pd.to_timedelta(np.sort(rng.uniform(0, 24 * 20, size=300)), unit="h").round("s")
+    ends = starts + pd.to_timedelta(rng.exponential(30, size=300), unit="h").round("s")
+    events = sorted([(t, +1, 1) for t in starts] + [(t, -1, 0) for t in ends], key=lambda e: (e[0], -e[1]))
+
+    res = compute_finite_window_flow_metrics(events, freq=freq)
+    assert res.times[0] == events[0][0].floor(freq)
+    assert res.times[-1] == events[-1][0].floor(freq)
+    step = pd.tseries.frequencies.to_offset(freq).nanos
+    assert len(res.times) == (res.times[-1] - res.times[0]).value // step + 1
+
+    T, L, Lam, w, N, A, Arr, Dep = compute_sample_path_metrics(events, list(res.times))
+    for got, expected in [(res.L, L), (res.Lambda, Lam), (res.w, w), (res.N, N), (res.A, A),
+                          (res.Arrivals, Arr), (res.Departures, Dep)]:
+        np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+def test_calendar_mode_buckets_difference_the_cumulative_series(overlap_events):
+    res = compute_finite_window_flow_metrics(overlap_events, freq="h", include_next_boundary=True)
+    buckets = res.to_bucket_dataframe()
+    assert len(buckets) == len(res.times) - 1
+    assert (buckets["end"] - buckets["start"] == pd.Timedelta(hours=1)).all()
+    np.testing.assert_allclose(buckets["Arrivals"].cumsum(), res.Arrivals[1:] - res.Arrivals[0])
+    np.testing.assert_allclose(buckets["A"].sum(), res.A[-1])
+    # 03:00-04:00: two items until 03:30, then one
+    assert buckets.loc[buckets["start"] == _t("2024-01-01 03:00"), "L"].item() == pytest.approx(1.5)
+
+def test_buckets_reject_sliding_window_metrics(overlap_events):
+    sliding = compute_sliding_window_flow_metrics(overlap_events, "2h", freq="h")
+    with pytest.raises(ValueError):
+        sliding.to_bucket_dataframe()
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # Empty inputs
@@ -122,9 +168,18 @@ def test_calendar_mode_tn_is_last_boundary(overlap_events):
 
 def test_empty_events_returns_empty_times():
     res = compute_finite_window_flow_metrics([], freq=None)
-    assert res.times == []
+    assert len(res.times) == 0
 
 def test_empty_events_returns_empty_arrays():
     res = compute_finite_window_flow_metrics([], freq="day")
     assert all(getattr(res, name).size == 0
                for name in ["L", "Lambda", "w", "N", "A", "Arrivals", "Departures"])
+
+
+def test_times_are_datetime_index_with_cached_elapsed_hours(simple_events):
+    res = compute_finite_window_flow_metrics(simple_events)
+    assert isinstance(res.times, pd.DatetimeIndex)
+    assert res.times.dtype == "datetime64[ns]"
+    expected = np.array([(t - res.t0).total_seconds() / 3600.0 for t in res.times])
+    np.testing.assert_allclose(res.elapsed_hours, expected)
+    assert res.elapsed_hours is res.elapsed_hours
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+# test/spath/metrics/test_sliding_window_flow_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.metrics import (
+    compute_finite_window_flow_metrics,
+    compute_sample_path_metrics,
+    compute_sliding_window_flow_metrics,
+)
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def overlap_events():
+    t0 = _t("2024-01-01 00:00")
+    t1 = _t("2024-01-01 01:00")
+    t2 = _t("2024-01-01 03:30")
+    t3 = _t("2024-01-01 05:00")
+    return [(t0, +1, 1), (t1, +1, 1), (t2, -1, 0), (t3, -1, 0)]
+
+
+@pytest.fixture
+def random_events():
+    rng = np.random.default_rng(7)
+    base = _t("2024-01-01")
+    starts = np.sort(rng.uniform(0, 500, size=200))
+    durations = rng.exponential(20, size=200)
+    events = []
+    for s, d in zip(starts, durations):
+        events.append((base + pd.Timedelta(hours=float(s)), +1, 1))
+        if rng.random() < 0.9:
+            events.append((base + pd.Timedelta(hours=float(s + d)), -1, 0))
+    events.sort(key=lambda e: (e[0], -e[1]))
+    return events
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Behavior
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_window_longer_than_span_matches_cumulative(overlap_events):
+    sliding = compute_sliding_window_flow_metrics(overlap_events, "30D")
+    cumulative = compute_finite_window_flow_metrics(overlap_events)
+    assert sliding.times.equals(cumulative.times)
+    assert np.allclose(sliding.A, cumulative.A)
+    assert np.allclose(sliding.L, cumulative.L, equal_nan=True)
+    assert np.allclose(sliding.Arrivals, cumulative.Arrivals)
+    assert np.allclose(sliding.Departures, cumulative.Departures)
+    assert sliding.window == pd.Timedelta(days=30)
+
+
+def test_window_counts_items_active_at_window_start(overlap_events):
+    m = compute_sliding_window_flow_metrics(overlap_events, "2h")
+    df = m.to_dataframe().set_index("time")
+    # Window (03:00, 05:00]: two items active at 03:00, none arrive, both depart.
+    row_time = _t("2024-01-01 05:00")
+    assert df.loc[row_time, "A"] == pytest.approx(2 * 0.5 + 1 * 1.5)
+    assert df.loc[row_time, "Arrivals"] == 0
+    assert df.loc[row_time, "Departures"] == 2
+    assert df.loc[row_time, "Lambda"] == pytest.approx(2 / 2.0)
+    assert df.loc[row_time, "w"] == pytest.approx(2.5 / 2)
+
+
+def test_matches_brute_force_per_window(random_events):
+    window = pd.Timedelta(hours=48)
+    m = compute_sliding_window_flow_metrics(random_events, window, freq="6h")
+    for T, A, arr, dep in zip(m.times, m.A, m.Arrivals, m.Departures):
+        s = max(T - window, m.t0)
+        _, _, _, _, _, A_bf, arr_bf, dep_bf = compute_sample_path_metrics(random_events, [s, T])
+        assert A == pytest.approx(A_bf[-1])
+        assert arr == arr_bf[-1] - arr_bf[0]
+        assert dep == dep_bf[-1] - dep_bf[0]
+
+
+def test_littles_law_holds_in_every_window(random_events):
+    m = compute_sliding_window_flow_metrics(random_events, "3D")
+    valid = np.isfinite(m.L) & np.isfinite(m.w)
+    assert np.allclose(m.L[valid], m.Lambda[valid] * m.w[valid])
+
+
+def test_calendar_schedule_is_shared_with_cumulative(random_events):
+    sliding = compute_sliding_window_flow_metrics(random_events, "1D", freq="day")
+    cumulative = compute_finite_window_flow_metrics(random_events, freq="day")
+    assert sliding.times.equals(cumulative.times)
+    assert sliding.mode == "calendar" and sliding.freq == "D"
+    assert np.allclose(sliding.N, cumulative.N)
+
+
+def test_empty_events():
+    m = compute_sliding_window_flow_metrics([], "1D")
+    assert len(m.times) == 0 and m.L.size == 0 and m.window == pd.Timedelta(days=1)
+
+
+def test_non_positive_window_raises(overlap_events):
+    with pytest.raises(ValueError):
+        compute_sliding_window_flow_metrics(overlap_events, "0h")
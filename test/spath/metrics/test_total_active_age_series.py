@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Krishna Kumar
+# SPDX-License-Identifier: MIT
+# test/spath/metrics/test_total_active_age_series.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.metrics import compute_finite_window_flow_metrics, compute_total_active_age_series
+from spath.point_process import to_arrival_departure_process
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+def _brute_force_R(df: pd.DataFrame, times, t0) -> np.ndarray:
+    # Sum the clipped ages of the active items at every T directly
+    R = []
+    for T in times:
+        active = (df["start_ts"] <= T) & (df["end_ts"].isna() | (df["end_ts"] > T))
+        starts = df.loc[active, "start_ts"].where(df.loc[active, "start_ts"] > t0, t0)
+        R.append(sum((T - s).total_seconds() / 3600.0 for s in starts))
+    return np.array(R, dtype=float)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def items():
+    return pd.DataFrame({
+        "start_ts": [_t("2024-01-01 00:00"), _t("2024-01-01 01:00"), _t("2024-01-01 02:00")],
+        "end_ts": [_t("2024-01-01 03:00"), pd.NaT, _t("2024-01-01 02:00")],
+    })
+
+
+@pytest.fixture
+def random_items():
+    rng = np.random.default_rng(11)
+    base = _t("2024-01-01")
+    starts = base + pd.to_timedelta(rng.uniform(0, 500, size=300), unit="h").round("s")
+    ends = starts + pd.to_timedelta(rng.exponential(30, size=300), unit="h").round("s")
+    ends = ends.where(rng.uniform(size=300) > 0.2)
+    return pd.DataFrame({"start_ts": starts, "end_ts": ends}).sort_values("start_ts").reset_index(drop=True)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# compute_total_active_age_series
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_hand_computed_values(items):
+    times = [_t("2024-01-01 00:00"), _t("2024-01-01 01:30"), _t("2024-01-01 02:00"), _t("2024-01-01 04:00")]
+    R = compute_total_active_age_series(items, times)
+    # 01:30: ages 1.5 + 0.5; 02:00: 2 + 1 (item 3 starts and ends at 02:00); 04:00: only item 2, age 3
+    np.testing.assert_allclose(R, [0.0, 2.0, 3.0, 3.0])
+
+
+def test_empty_times_and_items(items):
+    assert compute_total_active_age_series(items, []).size == 0
+    empty = items.iloc[0:0]
+    np.testing.assert_array_equal(compute_total_active_age_series(empty, [_t("2024-01-01")]), [0.0])
+
+
+def test_matches_brute_force_with_clipping_at_t0(random_items):
+    times = list(pd.date_range("2024-01-05", "2024-01-30", freq="7h"))
+    R = compute_total_active_age_series(random_items, times)
+    np.testing.assert_allclose(R, _brute_force_R(random_items, times, times[0]), rtol=1e-10, atol=1e-9)
+
+
+def test_explicit_t0(random_items):
+    times = list(pd.date_range("2024-01-05", "2024-01-30", freq="1D"))
+    t0 = _t("2024-01-03")
+    R = compute_total_active_age_series(random_items, times, t0=t0)
+    np.testing.assert_allclose(R, _brute_force_R(random_items, times, t0), rtol=1e-10, atol=1e-9)
+
+
+def test_tz_aware_timestamps(random_items):
+    df = random_items.assign(start_ts=random_items["start_ts"].dt.tz_localize("UTC"),
+                             end_ts=random_items["end_ts"].dt.tz_localize("UTC"))
+    times = list(pd.date_range("2024-01-05", "2024-01-30", freq="1D", tz="UTC"))
+    np.testing.assert_allclose(compute_total_active_age_series(df, times),
+                               compute_total_active_age_series(random_items, [t.tz_localize(None) for t in times]))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# FlowMetricsResult.R
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_with_total_active_age_attaches_R(random_items):
+    metrics = compute_finite_window_flow_metrics(to_arrival_departure_process(random_items))
+    assert metrics.R is None
+    assert "R" not in metrics.to_dataframe().columns
+
+    with_R = metrics.with_total_active_age(random_items)
+    np.testing.assert_allclose(with_R.R, compute_total_active_age_series(random_items, metrics.times))
+    assert "R" in with_R.to_dataframe().columns
+    # R(T) never exceeds A(T): active ages are part of the area under N(t)
+    assert np.all(with_R.R <= with_R.A + 1e-9)
+
+
+def test_extend_drops_stale_R(random_items):
+    cut = _t("2024-01-12")
+    early = random_items[random_items["start_ts"] <= cut].assign(
+        end_ts=lambda d: d["end_ts"].where(d["end_ts"] <= cut))
+    metrics = compute_finite_window_flow_metrics(to_arrival_departure_process(early)).with_total_active_age(early)
+    extended = metrics.extend([(_t("2024-02-01"), +1, 1)])
+    assert extended.R is None
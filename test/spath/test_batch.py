@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_batch.py
+
+import csv
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SPATH_DIR = REPO_ROOT / "spath"
+
+CSV_TEXT = (
+    "id,start_ts,end_ts,class\n"
+    "1,2024-01-01,2024-01-03,bug\n"
+    "2,2024-01-02,2024-01-05,story\n"
+    "3,2024-01-04,,bug\n"
+    "4,2024-01-06,2024-01-07,story\n"
+)
+
+
+def _run_batch(manifest: Path, *extra):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    return subprocess.run([sys.executable, "batch.py", str(manifest), *extra], cwd=SPATH_DIR, env=env,
+                          capture_output=True, text=True, timeout=300)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / "team-a.csv").write_text(CSV_TEXT)
+    (tmp_path / "team-b.csv").write_text(CSV_TEXT)
+    return tmp_path
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Batch runs
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.mark.slow
+def test_batch_loads_each_input_once_and_shares_metrics(workspace):
+    manifest = workspace / "manifest.json"
+    manifest.write_text(json.dumps({
+        "output_dir": "out",
+        "args": ["--metrics-only", "--no-cache"],
+        "scenarios": [
+            {"input": "team-a.csv", "scenario": "all"},
+            {"input": "team-a.csv", "scenario": "completed", "args": ["--completed"]},
+            {"input": "team-a.csv", "scenario": "all-clipped", "args": ["--lambda-pctl", "99"]},
+            {"input": "team-b.csv", "scenario": "bugs", "args": ["--classes", "bug"]},
+        ],
+    }))
+    report = workspace / "report.csv"
+    proc = _run_batch(manifest, "--jobs", "2", "--report", str(report))
+    assert proc.returncode == 0, proc.stderr
+
+    assert proc.stdout.count("[INFO] Loaded") == 2
+    assert "team-a.csv:all-clipped: 1 outputs" in proc.stdout
+    assert "(shared metrics)" in proc.stdout
+    for stem, scenario in [("team-a", "all"), ("team-a", "completed"), ("team-a", "all-clipped"),
+                           ("team-b", "bugs")]:
+        assert (workspace / "out" / stem / scenario / "core" / "flow_metrics.csv").exists()
+        assert (workspace / "out" / stem / scenario / "timings.txt").exists()
+    # The scenario that loaded team-a.csv records the load; those that shared its metrics do not
+    stages = []
+    for scenario in ("all", "all-clipped"):
+        timings = json.loads((workspace / "out" / "team-a" / scenario / "timings.json").read_text())
+        stages.append([s["path"] for s in timings["stages"]])
+    assert "load" in stages[0] and "metrics" in stages[0]
+    assert stages[1] == ["metrics_tables"]
+
+    with open(report) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert all(r["ok"] == "True" for r in rows)
+    assert [r["shared"] for r in rows if r["scenario"] == "all-clipped"] == ["True"]
+
+
+@pytest.mark.slow
+def test_batch_reports_failing_scenarios_and_continues(workspace):
+    manifest = workspace / "manifest.json"
+    out = ["--metrics-only", "--no-cache", "--output-dir", str(workspace / "out")]
+    manifest.write_text(json.dumps([
+        {"input": "team-a.csv", "scenario": "bad", "args": out + ["--no-such-option"]},
+        {"input": "missing.csv", "scenario": "gone", "args": out},
+        {"input": "team-b.csv", "scenario": "ok", "args": out},
+    ]))
+    proc = _run_batch(manifest)
+    assert proc.returncode == 1
+    assert "team-a.csv:bad" in proc.stderr
+    assert "missing.csv:gone" in proc.stderr
+    assert "1/3 scenarios succeeded" in proc.stdout
+    assert (workspace / "out" / "team-b" / "ok" / "core" / "flow_metrics.csv").exists()
+
+
+@pytest.mark.slow
+def test_batch_reuses_the_metrics_cache_of_single_runs(workspace):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    single = subprocess.run([sys.executable, "sample_path_analysis.py", str(workspace / "team-a.csv"),
+                             "--metrics-only", "--output-dir", str(workspace / "out"), "--scenario", "single"],
+                            cwd=SPATH_DIR, env=env, capture_output=True, text=True, timeout=300)
+    assert single.returncode == 0, single.stderr
+
+    manifest = workspace / "manifest.json"
+    manifest.write_text(json.dumps({
+        "output_dir": "out",
+        "args": ["--metrics-only"],
+        "scenarios": [{"input": "team-a.csv", "scenario": "batch"}],
+    }))
+    proc = _run_batch(manifest)
+    assert proc.returncode == 0, proc.stderr
+    assert "Using cached metrics" in proc.stdout and "[INFO] Loaded" not in proc.stdout
+    timings = json.loads((workspace / "out" / "team-a" / "batch" / "timings.json").read_text())
+    assert [s["path"] for s in timings["stages"]] == ["cache_load", "metrics_tables"]
+
+
+def test_batch_rejects_malformed_manifest(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"scenarios": [{"scenario": "no-input"}]}))
+    proc = _run_batch(manifest)
+    assert proc.returncode == 1
+    assert "has no 'input'" in proc.stderr
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_cache.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.cache import CachedAnalysis, MetricsCache, cache_key, input_fingerprint
+from spath.filter import FilterSpec, run_filters
+from spath.metrics import compute_elementwise_empirical_metrics, compute_finite_window_flow_metrics
+from spath.point_process import to_arrival_departure_process
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def csv_file(tmp_path):
+    p = tmp_path / "events.csv"
+    p.write_text("id,start_ts,end_ts,class\n1,2024-01-01,2024-01-03,bug\n2,2024-01-02,,story\n")
+    return p
+
+
+@pytest.fixture
+def analysis():
+    df = pd.DataFrame({
+        "id": ["a", "b", None],
+        "start_ts": [_t("2024-01-01 00:00"), _t("2024-01-01 02:00"), _t("2024-01-01 05:00")],
+        "end_ts": [_t("2024-01-01 04:00"), pd.NaT, _t("2024-01-01 07:00")],
+        "class": pd.Categorical(["bug", "story", "bug"]),
+    })
+    df["duration_td"] = df["end_ts"] - df["start_ts"]
+    df["duration_hr"] = df["duration_td"].dt.total_seconds() / 3600.0
+    filter_result = run_filters(df, FilterSpec(classes="bug,story"))
+    metrics = compute_finite_window_flow_metrics(to_arrival_departure_process(filter_result.df))
+    empirical = compute_elementwise_empirical_metrics(filter_result.df, metrics.times)
+    return CachedAnalysis(df=filter_result.df, filter_result=filter_result, metrics=metrics,
+                          empirical_metrics=empirical)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Keys
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_key_is_stable_for_same_input_and_params(csv_file):
+    assert cache_key(csv_file, {"classes": None}) == cache_key(csv_file, {"classes": None})
+
+
+def test_key_changes_with_params(csv_file):
+    assert cache_key(csv_file, {"classes": None}) != cache_key(csv_file, {"classes": "bug"})
+
+
+def test_key_changes_with_the_code_that_computes_the_outputs(csv_file, monkeypatch):
+    import spath.cache
+
+    before = cache_key(csv_file, {"classes": None})
+    assert spath.cache.code_fingerprint() == spath.cache.code_fingerprint()
+    monkeypatch.setattr(spath.cache, "code_fingerprint", lambda: "edited metrics.py")
+    assert cache_key(csv_file, {"classes": None}) != before
+
+
+def test_fingerprint_changes_with_content(csv_file):
+    before = input_fingerprint(csv_file)
+    csv_file.write_text(csv_file.read_text() + "3,2024-01-04,,bug\n")
+    assert input_fingerprint(csv_file) != before
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Store / load
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_roundtrip(analysis, tmp_path):
+    cache = MetricsCache(tmp_path / "cache")
+    cache.store("k", analysis)
+    loaded = cache.load("k")
+
+    pd.testing.assert_frame_equal(loaded.df, analysis.df)
+    m, e = loaded.metrics, analysis.metrics
+    assert m.times.equals(e.times) and m.t0 == e.t0 and m.tn == e.tn and m.mode == e.mode
+    for name in ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures"):
+        assert np.array_equal(getattr(m, name), getattr(e, name), equal_nan=True)
+    assert np.array_equal(loaded.empirical_metrics.W_star, analysis.empirical_metrics.W_star, equal_nan=True)
+    assert loaded.filter_result.label == analysis.filter_result.label
+    assert loaded.filter_result.applied == analysis.filter_result.applied
+
+
+def test_roundtrip_keeps_the_index_of_filtered_rows(analysis, tmp_path):
+    filtered = run_filters(analysis.df, FilterSpec(classes="bug")).df
+    assert filtered.index.tolist() == [0, 2]
+    cache = MetricsCache(tmp_path)
+    for key, df in (("filtered", filtered), ("labelled", filtered.set_index("id", drop=False)),
+                    ("range", filtered.reset_index(drop=True))):
+        cache.store(key, CachedAnalysis(df=df, filter_result=analysis.filter_result, metrics=analysis.metrics,
+                                        empirical_metrics=analysis.empirical_metrics))
+        loaded = cache.load(key).df
+        pd.testing.assert_index_equal(loaded.index, df.index, exact=True)
+        pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_roundtrip_tz_aware(analysis, tmp_path):
+    df = analysis.df.copy()
+    df["start_ts"] = df["start_ts"].dt.tz_localize("UTC")
+    df["end_ts"] = df["end_ts"].dt.tz_localize("UTC")
+    metrics = compute_finite_window_flow_metrics(to_arrival_departure_process(df))
+    entry = CachedAnalysis(df=df, filter_result=analysis.filter_result, metrics=metrics,
+                           empirical_metrics=compute_elementwise_empirical_metrics(df, metrics.times))
+    cache = MetricsCache(tmp_path)
+    cache.store("tz", entry)
+    loaded = cache.load("tz")
+    pd.testing.assert_frame_equal(loaded.df.reset_index(drop=True), df.reset_index(drop=True))
+    assert loaded.metrics.times.equals(metrics.times)
+    assert loaded.metrics.t0 == metrics.t0
+
+
+def test_missing_and_corrupt_entries_miss(tmp_path):
+    cache = MetricsCache(tmp_path)
+    assert cache.load("absent") is None
+    cache.path_for("bad").write_bytes(b"not an npz")
+    assert cache.load("bad") is None
+
+
+def test_store_leaves_no_temporary_files(analysis, tmp_path):
+    MetricsCache(tmp_path).store("k", analysis)
+    assert os.listdir(tmp_path) == ["k.npz"]
+
+
+def test_storing_a_newer_export_drops_the_entries_for_the_older_one(analysis, csv_file, tmp_path):
+    cache = MetricsCache(tmp_path / "cache")
+    old = cache_key(csv_file, {"classes": None})
+    other = cache_key(csv_file, {"classes": "bug"})
+    cache.store(old, analysis)
+    cache.store(other, analysis)
+    csv_file.write_text(csv_file.read_text() + "3,2024-01-04,,bug\n")
+    new = cache_key(csv_file, {"classes": None})
+    cache.store(new, analysis)
+    assert not cache.path_for(old).exists()
+    assert cache.path_for(other).exists() and cache.path_for(new).exists()
+
+
+def test_store_evicts_the_least_recently_used_entries(analysis, tmp_path):
+    cache = MetricsCache(tmp_path, max_entries=2)
+    cache.store("a", analysis)
+    cache.store("b", analysis)
+    os.utime(cache.path_for("a"), (0, 0))
+    os.utime(cache.path_for("b"), (1, 1))
+    assert cache.load("a") is not None  # a is now the most recently used
+    cache.store("c", analysis)
+    assert sorted(os.listdir(tmp_path)) == ["a.npz", "c.npz"]
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_checkpoint.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.checkpoint import compute_flow_metrics_incrementally, load_checkpoint, save_checkpoint
+from spath.metrics import compute_finite_window_flow_metrics
+from spath.point_process import (
+    items_seen,
+    items_seen_digest,
+    open_items,
+    to_arrival_departure_process,
+    to_incremental_arrival_departure_process,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def day1():
+    return pd.DataFrame({
+        "id": ["a", "b", "c"],
+        "start_ts": [_t("2024-01-01 00:00"), _t("2024-01-01 02:00"), _t("2024-01-01 05:00")],
+        "end_ts": [_t("2024-01-01 04:00"), pd.NaT, pd.NaT],
+    })
+
+
+@pytest.fixture
+def day2(day1):
+    # b completes, c stays open, d arrives and completes, e arrives
+    return pd.DataFrame({
+        "id": ["a", "b", "c", "d", "e"],
+        "start_ts": [_t("2024-01-01 00:00"), _t("2024-01-01 02:00"), _t("2024-01-01 05:00"),
+                     _t("2024-01-02 01:00"), _t("2024-01-02 03:00")],
+        "end_ts": [_t("2024-01-01 04:00"), _t("2024-01-02 02:00"), pd.NaT,
+                   _t("2024-01-02 06:00"), pd.NaT],
+    })
+
+
+def _assert_same_series(a, b):
+    assert a.times.equals(b.times)
+    for name in ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures"):
+        assert np.allclose(getattr(a, name), getattr(b, name), equal_nan=True), name
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Incremental events
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_incremental_events_are_only_the_new_ones(day1, day2):
+    events, keys = to_incremental_arrival_departure_process(day2, _t("2024-01-01 05:00"), open_items(day1))
+    assert events == [
+        (_t("2024-01-02 01:00"), +1, 1),
+        (_t("2024-01-02 02:00"), -1, 0),
+        (_t("2024-01-02 03:00"), +1, 1),
+        (_t("2024-01-02 06:00"), -1, 0),
+    ]
+    assert sorted(keys) == [("c", _t("2024-01-01 05:00")), ("e", _t("2024-01-02 03:00"))]
+
+
+def test_backdated_completion_is_rejected(day1, day2):
+    day2.loc[1, "end_ts"] = _t("2024-01-01 03:00")
+    with pytest.raises(ValueError):
+        to_incremental_arrival_departure_process(day2, _t("2024-01-01 05:00"), open_items(day1))
+
+
+def test_backfilled_item_is_rejected(day1, day2):
+    since = _t("2024-01-01 05:00")
+    backfilled = pd.concat([day2, pd.DataFrame({"id": ["x"], "start_ts": [since], "end_ts": [pd.NaT]})],
+                           ignore_index=True)
+    assert items_seen(day1, since) == 3
+    with pytest.raises(ValueError):
+        to_incremental_arrival_departure_process(backfilled, since, open_items(day1), seen=3)
+
+
+def test_seen_digest_ignores_order_and_later_ends(day1, day2):
+    since = _t("2024-01-01 05:00")
+    digest = items_seen_digest(day1, since)
+    assert items_seen_digest(day1.iloc[::-1], since) == digest
+    # b and c were open at 05:00; b ending later (and new items) leave the digest unchanged
+    assert items_seen_digest(day2, since) == digest
+
+
+def test_replaced_item_is_rejected_by_the_digest(day1, day2):
+    since = _t("2024-01-01 05:00")
+    swapped = day2.copy()
+    swapped.loc[0, ["id", "start_ts"]] = ["x", _t("2024-01-01 01:00")]   # a dropped, x backdated
+    assert items_seen(swapped, since) == items_seen(day1, since)
+    with pytest.raises(ValueError):
+        to_incremental_arrival_departure_process(swapped, since, open_items(day1), seen=3,
+                                                 seen_digest=items_seen_digest(day1, since))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Checkpoints
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_checkpoint_roundtrip(day1, tmp_path):
+    metrics = compute_finite_window_flow_metrics(to_arrival_departure_process(day1), freq="h")
+    path = save_checkpoint(tmp_path / "cp.json", metrics, open_items(day1), {"classes": None})
+    loaded = load_checkpoint(path)
+    _assert_same_series(loaded.metrics, metrics)
+    assert loaded.metrics.state == metrics.state
+    assert loaded.open_keys == open_items(day1)
+    assert loaded.params == {"classes": None}
+
+
+def test_incremental_run_matches_full_run(day1, day2, tmp_path):
+    path = tmp_path / "cp.json"
+    _, resumed = compute_flow_metrics_incrementally(day1, path)
+    assert not resumed and path.exists()
+
+    metrics, resumed = compute_flow_metrics_incrementally(day2, path)
+    assert resumed
+    _assert_same_series(metrics, compute_finite_window_flow_metrics(to_arrival_departure_process(day2)))
+
+
+def test_changed_params_recompute(day1, day2, tmp_path):
+    path = tmp_path / "cp.json"
+    compute_flow_metrics_incrementally(day1, path, params={"classes": "bug"})
+    _, resumed = compute_flow_metrics_incrementally(day2, path, params={"classes": "story"})
+    assert not resumed
+
+
+def test_non_append_only_input_recomputes(day1, day2, tmp_path):
+    path = tmp_path / "cp.json"
+    compute_flow_metrics_incrementally(day1, path)
+    day2.loc[1, "end_ts"] = _t("2024-01-01 03:00")
+    metrics, resumed = compute_flow_metrics_incrementally(day2, path)
+    assert not resumed
+    _assert_same_series(metrics, compute_finite_window_flow_metrics(to_arrival_departure_process(day2)))
+
+
+def test_checkpoint_carries_duration_sketch(day1, day2, tmp_path):
+    path = tmp_path / "ckpt.json"
+    compute_flow_metrics_incrementally(day1, path)
+    assert load_checkpoint(path).duration_sketch.count == 1  # only a has completed
+
+    _, resumed = compute_flow_metrics_incrementally(day2, path)
+    assert resumed
+    sketch = load_checkpoint(path).duration_sketch
+    # a (4h) from the first run, then b (24h) and d (5h) completed since the checkpoint
+    assert sketch.count == 3
+    np.testing.assert_allclose(sketch.percentiles([0, 50, 100]), [4.0, 5.0, 24.0])
+
+
+def test_backfilled_input_recomputes(day1, day2, tmp_path):
+    path = tmp_path / "cp.json"
+    compute_flow_metrics_incrementally(day1, path)
+    backfill = pd.DataFrame({"id": ["x"], "start_ts": [_t("2024-01-01 03:00")], "end_ts": [pd.NaT]})
+    day2 = pd.concat([day2, backfill], ignore_index=True)
+    metrics, resumed = compute_flow_metrics_incrementally(day2, path)
+    assert not resumed
+    _assert_same_series(metrics, compute_finite_window_flow_metrics(to_arrival_departure_process(day2)))
+    assert load_checkpoint(path).seen_items == len(day2)
+
+
+def test_replaced_item_recomputes(day1, day2, tmp_path):
+    path = tmp_path / "cp.json"
+    compute_flow_metrics_incrementally(day1, path)
+    day2.loc[0, ["id", "start_ts"]] = ["x", _t("2024-01-01 01:00")]
+    metrics, resumed = compute_flow_metrics_incrementally(day2, path)
+    assert not resumed
+    _assert_same_series(metrics, compute_finite_window_flow_metrics(to_arrival_departure_process(day2)))
+
+
+def test_analysis_does_not_resume_under_other_parse_options(tmp_path, monkeypatch, capsys):
+    monkeypatch.syspath_prepend(str(REPO_ROOT / "spath"))
+    import cli
+    import sample_path_analysis as spa
+
+    csv = tmp_path / "events.csv"
+    csv.write_text("id,start_ts,end_ts\n1,03/01/2024,04/01/2024\n2,05/01/2024,\n")
+    checkpoint = str(tmp_path / "cp.json")
+
+    def run(*options):
+        _, args = cli.parse_args([str(csv), "--checkpoint", checkpoint, "--no-cache", *options])
+        spa.analyze_dataframe(spa.load_input(str(csv), args), args)
+        return capsys.readouterr().out
+
+    assert "Recomputed" in run("--dayfirst")
+    assert "Resumed" in run("--dayfirst")
+    assert "Recomputed" in run()
+    assert load_checkpoint(checkpoint).params["dayfirst"] is False
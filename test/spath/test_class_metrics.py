@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_class_metrics.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.class_metrics import compute_class_metrics, class_metrics_table, class_summary_table
+from spath.filter import FilterSpec, run_filters
+from spath.metrics import compute_finite_window_flow_metrics
+from spath.plots.classes import plot_class_charts
+from spath.point_process import to_arrival_departure_process
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def df_classes():
+    df = pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "start_ts": [_t("2024-01-01 00:00"), _t("2024-01-01 01:00"), _t("2024-01-01 02:00"),
+                     _t("2024-01-01 03:00"), _t("2024-01-01 04:00")],
+        "end_ts": [_t("2024-01-01 02:00"), _t("2024-01-01 05:00"), pd.NaT,
+                   _t("2024-01-01 06:00"), _t("2024-01-01 08:00")],
+        "class": pd.Categorical(["bug", "story", "bug", "story", "bug"]),
+    })
+    df["duration_hr"] = (df["end_ts"] - df["start_ts"]).dt.total_seconds() / 3600.0
+    return df
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# compute_class_metrics
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_one_result_per_class_in_name_order(df_classes):
+    results = compute_class_metrics(df_classes)
+    assert list(results) == ["bug", "story"]
+    assert results["bug"].count == 3
+    assert results["story"].count == 2
+
+
+def test_class_metrics_match_a_filtered_run(df_classes):
+    results = compute_class_metrics(df_classes, common_window=False)
+    for name, r in results.items():
+        sub = df_classes[df_classes["class"] == name]
+        expected = compute_finite_window_flow_metrics(to_arrival_departure_process(sub))
+        assert r.metrics.times.equals(expected.times)
+        assert np.allclose(r.metrics.L, expected.L, equal_nan=True)
+        assert np.allclose(r.metrics.Lambda, expected.Lambda, equal_nan=True)
+        assert np.allclose(r.metrics.w, expected.w, equal_nan=True)
+
+
+def test_classes_are_grouped_as_the_class_filter_matches_them(df_classes):
+    df = df_classes.assign(**{"class": ["Bug", "story", "bug", "STORY", None]})
+    results = compute_class_metrics(df, common_window=False)
+    assert list(results) == ["bug", "nan", "story"]
+    for name, r in results.items():
+        filtered = run_filters(df, FilterSpec(classes=name)).df
+        assert r.count == len(filtered)
+        expected = compute_finite_window_flow_metrics(to_arrival_departure_process(filtered))
+        assert np.allclose(r.metrics.L, expected.L, equal_nan=True)
+
+
+def test_common_window_is_shared_by_all_classes(df_classes):
+    results = compute_class_metrics(df_classes)
+    for r in results.values():
+        assert r.metrics.t0 == _t("2024-01-01 00:00")
+        assert r.metrics.tn == _t("2024-01-01 08:00")
+
+
+def test_class_metrics_sum_to_total_wip(df_classes):
+    results = compute_class_metrics(df_classes, freq="h")
+    total = compute_finite_window_flow_metrics(to_arrival_departure_process(df_classes), freq="h")
+    per_class_A = sum(r.metrics.A for r in results.values())
+    assert np.allclose(per_class_A, total.A, equal_nan=True)
+
+
+def test_unused_categories_are_omitted(df_classes):
+    df = df_classes.copy()
+    df["class"] = df["class"].cat.add_categories(["epic"])
+    assert "epic" not in compute_class_metrics(df)
+
+
+def test_parallel_matches_sequential(df_classes):
+    sequential = compute_class_metrics(df_classes)
+    parallel = compute_class_metrics(df_classes, jobs=2)
+    assert list(parallel) == list(sequential)
+    for name in sequential:
+        assert np.allclose(parallel[name].metrics.L, sequential[name].metrics.L, equal_nan=True)
+
+
+def test_missing_class_column_raises(df_classes):
+    with pytest.raises(ValueError):
+        compute_class_metrics(df_classes.drop(columns=["class"]))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Tables and charts
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_class_metrics_table_is_tidy(df_classes):
+    results = compute_class_metrics(df_classes)
+    table = class_metrics_table(results)
+    assert list(table.columns[:2]) == ["class", "time"]
+    assert {"L", "Lambda", "w", "W_star", "lam_star"} <= set(table.columns)
+    assert len(table) == sum(len(r.metrics.times) for r in results.values())
+
+
+def test_class_summary_table_has_one_row_per_class(df_classes):
+    summary = class_summary_table(compute_class_metrics(df_classes))
+    assert list(summary["class"]) == ["bug", "story"]
+    assert list(summary["items"]) == [3, 2]
+
+
+def test_empty_tables():
+    assert class_metrics_table({}).empty
+    assert class_summary_table({}).empty
+
+
+def test_plot_class_charts_writes_tables_and_facets(df_classes, tmp_path):
+    results = compute_class_metrics(df_classes)
+    written = plot_class_charts(results, None, None, str(tmp_path))
+    assert len(written) == 6
+    assert all(os.path.exists(p) for p in written)
+    assert os.path.dirname(written[0]) == os.path.join(str(tmp_path), "classes")
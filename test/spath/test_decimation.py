@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_decimation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.plots.helpers import (
+    decimate,
+    get_max_plot_points,
+    lttb_indices,
+    minmax_indices,
+    set_max_plot_points,
+)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(3)
+    times = pd.date_range("2024-01-01", periods=50_000, freq="min", tz="UTC")
+    values = np.cumsum(rng.normal(size=len(times)))
+    values[12_345] += 500.0  # a single spike that must survive decimation
+    return times, values
+
+
+@pytest.fixture
+def default_budget():
+    saved = get_max_plot_points()
+    yield
+    set_max_plot_points(saved)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# LTTB
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_lttb_keeps_endpoints_and_spike(series):
+    times, values = series
+    x = np.arange(len(values), dtype=float)
+    idx = lttb_indices(x, values, 1000)
+    assert len(idx) <= 1000
+    assert idx[0] == 0 and idx[-1] == len(values) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 12_345 in idx
+
+
+def test_lttb_short_series_unchanged():
+    x = np.arange(10, dtype=float)
+    np.testing.assert_array_equal(lttb_indices(x, x ** 2, 100), np.arange(10))
+
+
+def test_lttb_skips_nan_points():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[0:5] = np.nan
+    idx = lttb_indices(x, y, 100)
+    assert not np.isnan(y[idx[1:]]).any()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Min/max
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_minmax_keeps_extremes_of_every_column(series):
+    _, values = series
+    x = np.arange(len(values), dtype=float)
+    idx = minmax_indices(x, values, 500)
+    assert len(idx) <= 4 * 500
+    kept = set(idx.tolist())
+    columns = np.minimum((x / x[-1] * 500).astype(int), 499)
+    for c in range(0, 500, 37):
+        members = np.flatnonzero(columns == c)
+        assert members[np.argmin(values[members])] in kept
+        assert members[np.argmax(values[members])] in kept
+
+
+def test_minmax_unsorted_scatter_keeps_outlier():
+    rng = np.random.default_rng(5)
+    x = rng.uniform(0, 100, size=20_000)
+    y = rng.exponential(10, size=20_000)
+    y[777] = 10_000.0
+    idx = minmax_indices(x, y, 200)
+    assert 777 in idx
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# decimate
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_decimate_preserves_sequence_types(series):
+    times, values = series
+    t, v = decimate(times, values, 2000)
+    assert isinstance(t, pd.DatetimeIndex) and t.tz is not None
+    assert len(t) == len(v) <= 2000
+
+    t_list, v_list = decimate(list(times), list(values), 2000, method="minmax")
+    assert isinstance(t_list, list) and isinstance(v_list, list)
+    assert values.max() in v_list
+
+    s = pd.Series(list(times), index=np.arange(len(times)) + 100)
+    t_series, _ = decimate(s, values, 2000, method="minmax")
+    assert isinstance(t_series, pd.Series)
+
+
+def test_decimate_uses_and_honours_default_budget(series, default_budget):
+    times, values = series
+    set_max_plot_points(1000)
+    t, v = decimate(times, values)
+    assert len(v) <= 1000
+
+    set_max_plot_points(0)
+    t, v = decimate(times, values)
+    assert v is values
+
+
+def test_decimate_rejects_unknown_method(series):
+    times, values = series
+    with pytest.raises(ValueError):
+        decimate(times, values, 100, method="every-other")
@@ -8,7 +8,7 @@ import pytest
 import argparse
 
 from spath.filter import (
-    _parse_classes,
+    parse_classes,
     _completed_base_label,
     _require_cols,
     _f_completed_only,
@@ -49,11 +49,11 @@ def df_basic():
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 def test_parse_classes_none_returns_none():
-    assert _parse_classes(None) is None
+    assert parse_classes(None) is None
 
 
 def test_parse_classes_normalizes_and_deduplicates():
-    assert _parse_classes(" A, b ,A ") == ["a", "b"]
+    assert parse_classes(" A, b ,A ") == ["a", "b"]
 
 
 def test_completed_base_label_completed():
@@ -76,7 +76,7 @@ def test_require_cols_raises_on_missing(df_basic):
 
 def test_f_completed_only_keeps_only_completed(df_basic):
     spec = FilterSpec(completed_only=True)
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped = [], {}
     new_mask = _f_completed_only(df_basic, mask, spec, applied, dropped)
     assert new_mask.sum() == 2
@@ -84,7 +84,7 @@ def test_f_completed_only_keeps_only_completed(df_basic):
 
 def test_f_incomplete_only_keeps_only_incomplete(df_basic):
     spec = FilterSpec(incomplete_only=True)
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped = [], {}
     new_mask = _f_incomplete_only(df_basic, mask, spec, applied, dropped)
     assert new_mask.sum() == 1
@@ -92,7 +92,7 @@ def test_f_incomplete_only_keeps_only_incomplete(df_basic):
 
 def test_f_classes_selects_subset(df_basic):
     spec = FilterSpec(classes="alpha,gamma")
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped = [], {}
     new_mask, label_add = _f_classes(df_basic, mask, spec, applied, dropped)
     kept = set(df_basic.loc[new_mask, "class"])
@@ -101,7 +101,7 @@ def test_f_classes_selects_subset(df_basic):
 
 def test_f_outlier_hours_keeps_shorter_and_incomplete(df_basic):
     spec = FilterSpec(outlier_hours=4)
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped, outlier_tags = [], {}, []
     new_mask = _f_outlier_hours(df_basic, mask, spec, applied, dropped, outlier_tags)
     kept = df_basic.loc[new_mask]
@@ -110,7 +110,7 @@ def test_f_outlier_hours_keeps_shorter_and_incomplete(df_basic):
 
 def test_f_outlier_pctl_invalid_threshold_raises(df_basic):
     spec = FilterSpec(outlier_pctl=0)
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped, thresholds, outlier_tags = [], {}, {}, []
     with pytest.raises(ValueError):
         _f_outlier_pctl(df_basic, mask, spec, applied, dropped, thresholds, outlier_tags)
@@ -118,7 +118,7 @@ def test_f_outlier_pctl_invalid_threshold_raises(df_basic):
 
 def test_f_outlier_pctl_applies_to_completed_only(df_basic):
     spec = FilterSpec(outlier_pctl=90)
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped, thresholds, outlier_tags = [], {}, {}, []
     new_mask = _f_outlier_pctl(df_basic, mask, spec, applied, dropped, thresholds, outlier_tags)
     completed = df_basic.loc[df_basic["end_ts"].notna() & new_mask]
@@ -127,10 +127,10 @@ def test_f_outlier_pctl_applies_to_completed_only(df_basic):
 
 def test_f_outlier_iqr_returns_original_mask_for_small_sample(df_basic):
     spec = FilterSpec(outlier_iqr=1.5)
-    mask = pd.Series(True, index=df_basic.index)
+    mask = np.ones(len(df_basic), dtype=bool)
     applied, dropped, thresholds, outlier_tags = [], {}, {}, []
     new_mask = _f_outlier_iqr(df_basic, mask, spec, applied, dropped, thresholds, outlier_tags)
-    assert new_mask.equals(mask)
+    assert np.array_equal(new_mask, mask)
 
 
 def test_f_outlier_iqr_two_sided_with_large_sample():
@@ -141,7 +141,7 @@ def test_f_outlier_iqr_two_sided_with_large_sample():
         }
     )
     spec = FilterSpec(outlier_iqr=1.5, outlier_iqr_two_sided=True)
-    mask = pd.Series(True, index=df.index)
+    mask = np.ones(len(df), dtype=bool)
     applied, dropped, thresholds, outlier_tags = [], {}, {}, []
     new_mask = _f_outlier_iqr(df, mask, spec, applied, dropped, thresholds, outlier_tags)
     kept = df.loc[new_mask, "duration_hr"]
@@ -201,3 +201,24 @@ def test_apply_filters_maps_namespace(df_basic):
     )
     res = apply_filters(df_basic, args)
     assert isinstance(res, FilterResult)
+
+
+def test_f_classes_matches_category_levels_case_insensitively(df_basic):
+    df = df_basic.assign(**{"class": pd.Categorical(["Alpha", "BETA", None])})
+    spec = FilterSpec(classes="alpha,beta")
+    mask = np.ones(len(df), dtype=bool)
+    new_mask, _ = _f_classes(df, mask, spec, [], {})
+    assert isinstance(new_mask, np.ndarray)
+    assert new_mask.tolist() == [True, True, False]
+    # missing classes read as "nan", as they did when rows were compared as strings
+    nan_mask, _ = _f_classes(df, mask, FilterSpec(classes="nan"), [], {})
+    assert nan_mask.tolist() == [False, False, True]
+
+
+def test_run_filters_category_and_object_classes_agree(df_basic):
+    spec = FilterSpec(classes="gamma,ALPHA", outlier_hours=4)
+    as_object = run_filters(df_basic, spec)
+    as_category = run_filters(df_basic.astype({"class": "category"}), spec)
+    assert as_object.df.index.equals(as_category.df.index)
+    assert as_object.dropped_per_filter == as_category.dropped_per_filter == {"classes": 1, "outlier_hours": 0}
+    assert as_object.applied == ["Classes=gamma,alpha", "outlier_hours<=4h"]
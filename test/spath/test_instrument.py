@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_instrument.py
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from spath.instrument import TimingRegistry, current_registry, timed
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@timed
+def work(seconds=0.0):
+    time.sleep(seconds)
+    return "done"
+
+
+@timed("renamed")
+def allocate(n):
+    return np.ones(n)
+
+
+def test_timed_is_a_no_op_without_an_active_registry():
+    assert current_registry() is None
+    assert work() == "done"
+    with timed("anything"):
+        pass
+    assert work.__name__ == "work"
+
+
+def test_stages_nest_and_accumulate_calls():
+    timings = TimingRegistry()
+    with timings.activate():
+        assert current_registry() is timings
+        with timed("outer"):
+            work(0.01)
+            work(0.01)
+            with timed("inner"):
+                allocate(10)
+        work()
+    assert current_registry() is None
+
+    stages = timings.stages
+    assert list(timings.to_dict()["stages"][i]["path"] for i in range(4)) == \
+        ["outer", "outer/work", "outer/inner", "outer/inner/renamed"]
+    assert stages["outer/work"].calls == 2
+    assert stages["outer/work"].total_s >= 0.02
+    assert stages["outer/work"].max_s <= stages["outer/work"].total_s
+    assert stages["work"].calls == 1
+    assert stages["outer"].total_s >= stages["outer/work"].total_s + stages["outer/inner"].total_s
+    assert timings.self_time(stages["outer"]) == pytest.approx(
+        stages["outer"].total_s - stages["outer/work"].total_s - stages["outer/inner"].total_s)
+    assert stages["outer"].peak_bytes is None
+    assert timings.wall_s >= stages["outer"].total_s
+
+
+def test_stage_is_recorded_when_it_raises():
+    timings = TimingRegistry()
+    with timings.activate():
+        with pytest.raises(ValueError):
+            with timed("failing"):
+                raise ValueError("boom")
+    assert timings.stages["failing"].calls == 1
+
+
+def test_memory_peaks_are_per_stage():
+    timings = TimingRegistry(memory=True)
+    with timings.activate():
+        with timed("outer"):
+            small = allocate(1_000)
+            big = allocate(2_000_000)        # 16 MB
+            del big
+            with timed("after"):
+                small = allocate(1_000)
+    stages = timings.stages
+    assert stages["outer/renamed"].peak_bytes >= 16_000_000
+    assert stages["outer"].peak_bytes >= 16_000_000
+    assert stages["outer/after"].peak_bytes < 1_000_000
+    assert "peak mem" in timings.format_table()
+
+
+def test_report_is_written_as_json_and_text(tmp_path):
+    timings = TimingRegistry()
+    with timings.activate():
+        with timed("load"):
+            work()
+    json_path, txt_path = timings.write(str(tmp_path))
+    report = json.loads(Path(json_path).read_text())
+    assert [s["path"] for s in report["stages"]] == ["load", "load/work"]
+    assert report["stages"][1]["depth"] == 1 and report["stages"][1]["name"] == "work"
+    assert 0 <= report["stages"][0]["share"] <= 1
+    text = Path(txt_path).read_text()
+    assert "load" in text and "  work" in text and "wall time" in text
+
+
+def test_run_analysis_writes_stage_timings(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(REPO_ROOT / "spath"))
+    import cli
+    import sample_path_analysis as spa
+
+    csv = tmp_path / "events.csv"
+    csv.write_text(
+        "id,start_ts,end_ts,class\n"
+        "1,2024-01-01,2024-01-03,bug\n"
+        "2,2024-01-02,2024-01-05,story\n"
+        "3,2024-01-04,,bug\n"
+    )
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    (out_dir / "core").mkdir()
+    _, args = cli.parse_args([str(csv), "--metrics-only", "--no-cache", "--timings-memory"])
+    spa.run_analysis(str(csv), args, str(out_dir))
+
+    report = json.loads((out_dir / "timings.json").read_text())
+    paths = [s["path"] for s in report["stages"]]
+    assert paths == ["load", "filter", "events", "metrics", "total_active_age", "empirical_metrics",
+                     "metrics_tables"]
+    assert report["memory"] is True
+    assert all(s["peak_bytes"] is not None for s in report["stages"])
+    assert (out_dir / "timings.txt").exists()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_service.py
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.metrics import compute_finite_window_flow_metrics
+from spath.point_process import to_arrival_departure_process
+from spath.service import Dataset, FlowMetricsService, QueryError, make_server
+
+METRICS = ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures")
+
+
+@pytest.fixture(scope="module")
+def items():
+    rng = np.random.default_rng(21)
+    n = 2_000
+    base = pd.Timestamp("2024-01-01")
+    starts = base + pd.to_timedelta(rng.uniform(0, 24 * 90, size=n), unit="h").round("s")
+    ends = (starts + pd.to_timedelta(rng.exponential(50, size=n), unit="h").round("s")).where(rng.uniform(size=n) > 0.1)
+    df = pd.DataFrame({"id": np.arange(n).astype(str), "start_ts": starts, "end_ts": ends,
+                       "class": pd.Categorical(rng.choice(["Bug", "Story", "Chore"], size=n))})
+    return df.sort_values("start_ts").reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def service(items):
+    return FlowMetricsService([Dataset("team", items)], cache_size=8)
+
+
+def _query(service, route, **params):
+    return json.loads(service.query(route, params))
+
+
+def _assert_matches(result, expected, index=slice(None)):
+    for name in METRICS:
+        np.testing.assert_allclose(np.array(result[name], dtype=float), getattr(expected, name)[index],
+                                   rtol=1e-9, atol=1e-6, equal_nan=True, err_msg=name)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Queries
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_series_matches_calendar_mode_metrics(service, items):
+    result = _query(service, "/series", start="2024-01-10 05:00", end="2024-03-01", freq="day")
+    expected = compute_finite_window_flow_metrics(to_arrival_departure_process(items), freq="day",
+                                                  start=pd.Timestamp("2024-01-10 05:00"),
+                                                  end=pd.Timestamp("2024-03-01"))
+    assert pd.DatetimeIndex(result["times"]).equals(expected.times)
+    assert result["t0"] == "2024-01-10T00:00:00"
+    _assert_matches(result, expected)
+
+
+def test_window_for_classes_matches_filtered_metrics(service, items):
+    start, end = pd.Timestamp("2024-02-01"), pd.Timestamp("2024-02-20 13:30")
+    result = _query(service, "/window", start=str(start), end=str(end), classes="bug, CHORE")
+    subset = items[items["class"].isin(["Bug", "Chore"])]
+    expected = compute_finite_window_flow_metrics(to_arrival_departure_process(subset), start=start, end=end)
+    assert result["classes"] == ["bug", "chore"]
+    _assert_matches(result, expected, index=-1)
+
+
+def test_explicit_times_and_defaults(service, items):
+    times = ["2024-01-20T00:00:00", "2024-02-03T12:00:00"]
+    result = _query(service, "/series", start="2024-01-05", times=",".join(times))
+    assert result["times"] == times
+    window = _query(service, "/window")  # the whole dataset
+    assert window["Arrivals"] == len(items)
+    assert window["Departures"] == items["end_ts"].notna().sum()
+
+
+@pytest.mark.parametrize("route, params", [
+    ("/window", {"start": "2024-02-01", "end": "2024-01-01"}),
+    ("/window", {"classes": "epic"}),
+    ("/window", {"start": "not a time"}),
+    ("/series", {}),
+    ("/series", {"freq": "fortnight"}),
+])
+def test_bad_queries_raise(service, route, params):
+    with pytest.raises(QueryError):
+        service.query(route, params)
+
+
+def test_results_are_cached(items):
+    service = FlowMetricsService([Dataset("team", items)], cache_size=2)
+    for _ in range(3):
+        service.query("/window", {"end": "2024-02-01", "classes": "story"})
+    stats = _query(service, "/stats")
+    assert stats["cache"]["hits"] == 2 and stats["cache"]["misses"] == 1
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# HTTP
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def base_url(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_get_and_post(base_url):
+    with urllib.request.urlopen(f"{base_url}/datasets") as resp:
+        assert json.load(resp)["datasets"][0]["classes"] == ["bug", "chore", "story"]
+
+    with urllib.request.urlopen(f"{base_url}/window?end=2024-02-01&classes=bug") as resp:
+        by_get = json.load(resp)
+    body = json.dumps({"end": "2024-02-01", "classes": ["bug"]}).encode()
+    request = urllib.request.Request(f"{base_url}/window", data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as resp:
+        assert json.load(resp) == by_get
+
+
+def test_http_errors(base_url):
+    with pytest.raises(urllib.error.HTTPError) as bad:
+        urllib.request.urlopen(f"{base_url}/window?classes=epic")
+    assert bad.value.code == 400 and "epic" in json.load(bad.value)["error"]
+    with pytest.raises(urllib.error.HTTPError) as missing:
+        urllib.request.urlopen(f"{base_url}/nothing")
+    assert missing.value.code == 404
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_sharded.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import spath.sharded as sharded
+from spath.metrics import compute_sample_path_metrics
+from spath.sharded import compute_sample_path_metrics_sharded, events_to_arrays
+
+
+def _t(s: str) -> pd.Timestamp:
+    return pd.Timestamp(s)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Fixtures
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def random_events():
+    # Microsecond timestamps, the resolution of the sequential sweep; some events precede t0
+    rng = np.random.default_rng(5)
+    base = _t("2024-01-01")
+    events = []
+    for s, d in zip(rng.uniform(-20, 600, size=800), rng.exponential(25, size=800)):
+        events.append(((base + pd.Timedelta(hours=float(s))).round("us"), +1, 1))
+        if rng.random() < 0.85:
+            events.append(((base + pd.Timedelta(hours=float(s + d))).round("us"), -1, 0))
+    return events
+
+
+@pytest.fixture
+def sample_times():
+    return list(pd.date_range(_t("2024-01-01"), periods=120, freq="6h"))
+
+
+def _assert_same(a, b):
+    assert a[0] == b[0]
+    for x, y in zip(a[1:], b[1:]):
+        assert np.allclose(x, y, rtol=1e-12, atol=0, equal_nan=True)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Behavior
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.mark.parametrize("shards", [1, 2, 7, 120, 500])
+def test_matches_sequential_sweep(random_events, sample_times, shards):
+    expected = compute_sample_path_metrics(random_events, sample_times)
+    actual = compute_sample_path_metrics_sharded(random_events, sample_times, processes=1, shards=shards)
+    _assert_same(actual, expected)
+
+
+def test_counts_are_exact(random_events, sample_times):
+    expected = compute_sample_path_metrics(random_events, sample_times)
+    actual = compute_sample_path_metrics_sharded(random_events, sample_times, processes=1, shards=9)
+    for i in (4, 6, 7):  # N, Arrivals, Departures
+        assert np.array_equal(actual[i], expected[i])
+
+
+def test_event_times_as_observations(random_events):
+    times = sorted(t for (t, _, _) in random_events)[40:]
+    _assert_same(
+        compute_sample_path_metrics_sharded(random_events, times, processes=1, shards=13),
+        compute_sample_path_metrics(random_events, times),
+    )
+
+
+def test_accepts_event_arrays(random_events, sample_times):
+    _assert_same(
+        compute_sample_path_metrics_sharded(events_to_arrays(random_events), sample_times, processes=1),
+        compute_sample_path_metrics(random_events, sample_times),
+    )
+
+
+def test_process_pool(random_events, sample_times, monkeypatch):
+    monkeypatch.setattr(sharded, "_MIN_EVENTS_FOR_POOL", 0)
+    _assert_same(
+        compute_sample_path_metrics_sharded(random_events, sample_times, processes=2),
+        compute_sample_path_metrics(random_events, sample_times),
+    )
+
+
+def test_empty_events(sample_times):
+    T, L, *_ = compute_sample_path_metrics_sharded([], sample_times)
+    assert T == sample_times and L.size == 0
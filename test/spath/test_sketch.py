@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_sketch.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.filter import FilterSpec, completed_duration_sketch, run_filters
+from spath.sketch import QuantileSketch
+
+
+def _rank_error(values: np.ndarray, estimate: float, q: float) -> float:
+    # Distance from q to the nearest normalized rank that `estimate` occupies in `values`
+    s = np.sort(values)
+    lo = np.searchsorted(s, estimate, side="left") / len(s)
+    hi = np.searchsorted(s, estimate, side="right") / len(s)
+    return 0.0 if lo <= q <= hi else min(abs(q - lo), abs(q - hi))
+
+
+@pytest.fixture
+def durations():
+    return np.random.default_rng(4).lognormal(mean=2.0, sigma=1.2, size=200_000)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# QuantileSketch
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def test_small_sketch_is_exact():
+    values = np.random.default_rng(1).exponential(10, size=150)
+    sketch = QuantileSketch.from_values(values)
+    assert sketch.is_exact and sketch.rank_error == 0.0
+    np.testing.assert_allclose(sketch.percentiles([25, 75, 95]), np.percentile(values, [25, 75, 95]))
+
+
+def test_rank_error_within_bound_and_size_bounded(durations):
+    sketch = QuantileSketch.with_rank_error(0.01)
+    for chunk in np.array_split(durations, 37):
+        sketch.update(chunk)
+    assert sketch.count == len(durations)
+    assert sketch.retained <= 4 * sketch.k
+    for q in (0.01, 0.25, 0.5, 0.75, 0.95, 0.99):
+        assert _rank_error(durations, sketch.quantile(q), q) <= sketch.rank_error
+    assert sketch.quantile(0.0) == durations.min() and sketch.quantile(1.0) == durations.max()
+
+
+def test_merged_sketches_summarize_the_union(durations):
+    parts = np.array_split(durations, 5)
+    merged = QuantileSketch(k=200)
+    for part in parts:
+        merged.merge(QuantileSketch.from_values(part, k=200))
+    assert merged.count == len(durations)
+    for q in (0.25, 0.5, 0.9):
+        assert _rank_error(durations, merged.quantile(q), q) <= merged.rank_error
+
+
+def test_nan_and_empty_inputs():
+    sketch = QuantileSketch()
+    assert np.isnan(sketch.quantile(0.5))
+    sketch.update([np.nan, 1.0, np.inf, 3.0])
+    assert sketch.count == 2 and sketch.quantile(0.5) == 2.0
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError):
+        QuantileSketch(k=2)
+
+
+def test_dict_roundtrip_continues_identically(durations):
+    a = QuantileSketch.from_values(durations[:50_000], k=64)
+    b = QuantileSketch.from_dict(json.loads(json.dumps(a.to_dict())))
+    assert b.count == a.count and b.rank_error == a.rank_error
+    a.update(durations[50_000:])
+    b.update(durations[50_000:])
+    np.testing.assert_array_equal(a.quantiles([0.1, 0.5, 0.9]), b.quantiles([0.1, 0.5, 0.9]))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Outlier filters from a sketch
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.fixture
+def items(durations):
+    n = 20_000
+    start = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(np.arange(n), unit="h")
+    end = (start + pd.to_timedelta(durations[:n], unit="h")).where(np.arange(n) % 10 != 0)
+    duration_hr = (end - start).total_seconds() / 3600.0
+    return pd.DataFrame({"id": np.arange(n).astype(str), "start_ts": start, "end_ts": end,
+                         "duration_hr": duration_hr})
+
+
+def test_filters_read_thresholds_from_sketch(items):
+    chunks = np.array_split(items, 4)
+    sketch = None
+    for chunk in chunks:
+        sketch = completed_duration_sketch(chunk, sketch, k=400)
+
+    exact = run_filters(items, FilterSpec(outlier_pctl=95, outlier_iqr=1.5))
+    sketched = run_filters(items, FilterSpec(outlier_pctl=95, outlier_iqr=1.5, duration_sketch=sketch))
+    assert set(sketched.thresholds) == set(exact.thresholds)
+    assert sketched.thresholds["pctl95_hr"] == pytest.approx(sketch.percentile(95))
+    completed = items["duration_hr"].dropna().to_numpy()
+    assert _rank_error(completed, sketched.thresholds["pctl95_hr"], 0.95) <= sketch.rank_error
+    # Open items are never dropped by the outlier filters
+    assert sketched.df["end_ts"].isna().sum() == items["end_ts"].isna().sum()
+
+
+def test_exact_sketch_matches_percentile_filter(items):
+    small = items.iloc[:120]
+    sketch = completed_duration_sketch(small)
+    exact = run_filters(small, FilterSpec(outlier_pctl=90))
+    sketched = run_filters(small, FilterSpec(outlier_pctl=90, duration_sketch=sketch))
+    assert sketched.thresholds == exact.thresholds
+    assert sketched.df.equals(exact.df)
+
+
+def test_sketch_iqr_after_percentile_filter_matches_in_memory(items):
+    sketch = completed_duration_sketch(items, k=400)
+    exact = run_filters(items, FilterSpec(outlier_pctl=90, outlier_iqr=1.5))
+    sketched = run_filters(items, FilterSpec(outlier_pctl=90, outlier_iqr=1.5, duration_sketch=sketch))
+    # The quartiles are those of the durations kept by the percentile filter, not of all of them
+    assert sketched.thresholds["iqr_q3_hr"] == pytest.approx(exact.thresholds["iqr_q3_hr"], rel=0.02)
+    assert sketched.thresholds["iqr_q3_hr"] < sketch.percentile(75)
+
+
+@pytest.mark.parametrize("narrowing", [{"classes": "bug"}, {"incomplete_only": True}, {"outlier_hours": 10.0}])
+def test_sketch_cannot_follow_filters_that_narrow_the_durations(items, narrowing):
+    items = items.assign(**{"class": "bug"})
+    sketch = completed_duration_sketch(items)
+    with pytest.raises(ValueError, match="duration_sketch"):
+        run_filters(items, FilterSpec(outlier_pctl=90, duration_sketch=sketch, **narrowing))
+    # The sketch alone, or with completed_only (which keeps every completed duration), is fine
+    run_filters(items, FilterSpec(completed_only=True, outlier_pctl=90, duration_sketch=sketch))
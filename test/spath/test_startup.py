@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_startup.py
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SPATH_DIR = REPO_ROOT / "spath"
+
+
+def _imported_modules(*args, cwd=SPATH_DIR) -> set:
+    # Run a fresh interpreter with -X importtime and collect the top-level packages it imported.
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd, env=env,
+                          capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    return modules
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Startup
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@pytest.mark.slow
+def test_help_does_not_import_heavy_dependencies():
+    modules = _imported_modules("sample_path_analysis.py", "--help")
+    assert "argparse" in modules
+    assert not {"pandas", "numpy", "matplotlib"} & modules
+
+
+@pytest.mark.slow
+def test_metrics_only_run_does_not_import_matplotlib(tmp_path):
+    csv = tmp_path / "events.csv"
+    csv.write_text(
+        "id,start_ts,end_ts,class\n"
+        "1,2024-01-01,2024-01-03,bug\n"
+        "2,2024-01-02,2024-01-05,story\n"
+        "3,2024-01-04,,bug\n"
+    )
+    out = tmp_path / "out"
+    modules = _imported_modules("sample_path_analysis.py", str(csv), "--output-dir", str(out),
+                                "--metrics-only", "--by-class", "--no-cache")
+    assert "pandas" in modules
+    assert "matplotlib" not in modules
+    assert (out / "events" / "latest" / "core" / "flow_metrics.csv").exists()
+    assert (out / "events" / "latest" / "classes" / "class_summary.csv").exists()
+
+
+@pytest.mark.slow
+def test_pd_utils_imports_without_optional_dependencies():
+    modules = _imported_modules("-c", "import pcalc.pd_utils", cwd=REPO_ROOT)
+    assert not {"polars", "matplotlib", "IPython"} & modules
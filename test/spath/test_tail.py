@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: MIT
+# test/spath/test_tail.py
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spath.csv_loader import CSVLoader
+from spath.metrics import compute_finite_window_flow_metrics
+from spath.point_process import to_arrival_departure_process
+from spath.tail import LogFollower, follow
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def _rows(n=200, seed=2):
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp("2024-03-01")
+    starts = base + pd.to_timedelta(np.sort(rng.uniform(0, 24 * 30, size=n)), unit="h").round("s")
+    ends = starts + pd.to_timedelta(rng.exponential(40, size=n), unit="h").round("s")
+    return pd.DataFrame({"id": [f"W-{i}" for i in range(n)], "start_ts": starts, "end_ts": ends,
+                         "class": rng.choice(["bug", "story"], size=n)})
+
+
+def _append_log(items: pd.DataFrame):
+    # The log as it is written: a row when an item starts, and again when it ends
+    opened = items.assign(end_ts=pd.NaT, t=items["start_ts"])
+    closed = items.assign(t=items["end_ts"])
+    log = pd.concat([opened, closed]).sort_values("t", kind="stable").drop(columns="t")
+    return log, items["end_ts"].sort_values().to_numpy()
+
+
+def _write_csv_rows(path, rows: pd.DataFrame, header: bool):
+    text = rows.to_csv(index=False, header=header, date_format="%Y-%m-%d %H:%M:%S")
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def _expected(log: pd.DataFrame, freq=None):
+    # What sample_path_analysis.py computes from the whole log: the latest row per item
+    items = CSVLoader().prepare(log.astype({"start_ts": str, "end_ts": str}).replace("NaT", ""))
+    items = items.drop_duplicates(["id", "start_ts"], keep="last").sort_values("start_ts")
+    return compute_finite_window_flow_metrics(to_arrival_departure_process(items), freq=freq)
+
+
+def _assert_same(a, b):
+    assert a.times.equals(b.times)
+    for name in ("L", "Lambda", "w", "N", "A", "Arrivals", "Departures"):
+        np.testing.assert_allclose(getattr(a, name), getattr(b, name), rtol=1e-9, equal_nan=True, err_msg=name)
+
+
+@pytest.mark.parametrize("freq", [None, "day"])
+def test_followed_metrics_match_full_recompute(tmp_path, freq):
+    log, _ = _append_log(_rows())
+    path = tmp_path / "events.csv"
+    follower = LogFollower(str(path), freq=freq)
+    for i, chunk in enumerate(np.array_split(log, 7)):
+        _write_csv_rows(path, chunk, header=(i == 0))
+        follower.poll()
+        follower.flush()
+    assert follower.held_back > 0  # the latest events wait for a later one
+    follower.flush(final=True)
+    _assert_same(follower.metrics, _expected(log, freq))
+    assert follower.open_items == 0 and follower.late_rows == 0
+
+
+def test_partial_lines_wait_for_their_newline(tmp_path):
+    log, _ = _append_log(_rows(20))
+    text = log.to_csv(index=False, date_format="%Y-%m-%d %H:%M:%S")
+    path = tmp_path / "events.csv"
+    follower = LogFollower(str(path))
+    cut = len(text) // 2 + 7
+    path.write_text(text[:cut])
+    first = follower.poll()
+    with open(path, "a") as f:
+        f.write(text[cut:])
+    assert first + follower.poll() == len(log)
+    follower.flush(final=True)
+    _assert_same(follower.metrics, _expected(log))
+
+
+def test_ndjson_log_and_late_rows(tmp_path):
+    items = _rows(30)
+    log, _ = _append_log(items)
+    path = tmp_path / "events.ndjson"
+    with open(path, "w") as f:
+        for rec in log.to_dict("records"):
+            f.write(json.dumps({k: (None if pd.isna(v) else str(v)) for k, v in rec.items()}) + "\n")
+    follower = LogFollower(str(path))
+    follower.poll()
+    follower.flush(final=True)
+    _assert_same(follower.metrics, _expected(log))
+
+    # An item that starts before the processed events cannot be added to the sample path
+    with open(path, "a") as f:
+        f.write(json.dumps({"id": "late", "start_ts": "2024-03-02 00:00:00", "end_ts": None}) + "\n")
+    follower.poll()
+    assert follower.late_rows == 1 and follower.flush(final=True) == 0
+
+
+def test_truncated_log_starts_again(tmp_path):
+    log, _ = _append_log(_rows(40))
+    path = tmp_path / "events.csv"
+    _write_csv_rows(path, log, header=True)
+    follower = LogFollower(str(path))
+    follower.poll()
+    follower.flush(final=True)
+
+    path.unlink()
+    _write_csv_rows(path, log.iloc[:10], header=True)
+    with pytest.warns(RuntimeWarning, match="truncated"):
+        follower.poll()
+    follower.flush(final=True)
+    _assert_same(follower.metrics, _expected(log.iloc[:10]))
+
+
+def test_follow_once_writes_outputs(tmp_path):
+    log, _ = _append_log(_rows(60))
+    path = tmp_path / "events.csv"
+    _write_csv_rows(path, log, header=True)
+    out = tmp_path / "live"
+    metrics = asyncio.run(follow(LogFollower(str(path), freq="day"), str(out), write_every=0,
+                                 charts=False, once=True, quiet=True))
+    table = pd.read_csv(out / "flow_metrics.csv")
+    assert len(table) == len(metrics.times)
+    assert len(pd.read_csv(out / "flow_buckets.csv")) == len(metrics.times) - 1
+    assert not any(p.name.startswith("flow_metrics.tmp") for p in out.iterdir())
+
+
+def test_cli_once_renders_chart(tmp_path):
+    log, _ = _append_log(_rows(50))
+    path = tmp_path / "events.csv"
+    _write_csv_rows(path, log, header=True)
+    out = tmp_path / "live"
+    env = dict(os.environ, PYTHONPATH=str(REPO), MPLBACKEND="Agg")
+    proc = subprocess.run([sys.executable, str(REPO / "spath" / "tail.py"), str(path), "--once",
+                           "--output-dir", str(out)], capture_output=True, text=True, env=env, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert (out / "sample_path_flow_metrics.png").stat().st_size > 0
+    assert "0 open items" in proc.stdout